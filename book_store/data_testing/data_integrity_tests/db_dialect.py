@@ -0,0 +1,333 @@
+"""
+SQL Server Dialect Helpers
+
+SQL Server specific queries: the adapter plugged into the shared capture
+engine (baseline_engine.py), also used by verify_migration.py. Server-side
+range hashes let the verifier compare tables without pulling every row
+over the network.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from catalog import CatalogSnapshot
+from row_hashing import bucket_bounds
+
+
+INTEGER_KEY_TYPES = ('tinyint', 'smallint', 'int', 'bigint')
+
+
+class SqlServerDialect:
+    """Query helpers for SQL Server (pyodbc)"""
+
+    name = 'sqlserver'
+
+    # Primary key types whose keys both servers order like Python integers
+    integer_key_types = INTEGER_KEY_TYPES
+
+    # Every connection gets its own snapshot (see begin_snapshot)
+    shares_snapshot = False
+
+    def server_version(self, conn) -> str:
+        """Version string of the server"""
+        cursor = conn.cursor()
+        cursor.execute("SELECT @@VERSION")
+        return cursor.fetchone()[0]
+
+    def user_tables(self, conn) -> List[Tuple[str, str]]:
+        """(schema, table) pairs of all user tables, system schemas excluded"""
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT 
+                TABLE_SCHEMA,
+                TABLE_NAME
+            FROM INFORMATION_SCHEMA.TABLES
+            WHERE TABLE_TYPE = 'BASE TABLE'
+                AND TABLE_SCHEMA NOT IN ('sys', 'INFORMATION_SCHEMA')
+            ORDER BY TABLE_SCHEMA, TABLE_NAME
+        """)
+        return [(row[0], row[1]) for row in cursor.fetchall()]
+
+    def table_cursor(self, conn, batch_size: int):
+        """Cursor for reading a whole table in fetchmany batches"""
+        return conn.cursor()
+
+    def quote_table(self, schema: str, table_name: str) -> str:
+        """Quote a schema-qualified table name"""
+        return f"[{schema}].[{table_name}]"
+
+    def quote_column(self, column: str) -> str:
+        """Quote a column name"""
+        return f"[{column}]"
+
+    def table_sample_clause(self, percent: float) -> str:
+        """TABLESAMPLE clause reading about percent of a table's pages (after the table alias)"""
+        return f"TABLESAMPLE SYSTEM ({float(percent)} PERCENT)"
+
+    def get_primary_key(self, conn, schema: str, table_name: str) -> List[Tuple[str, str]]:
+        """Get (column, data type) pairs of the primary key in key order"""
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT c.name, TYPE_NAME(c.user_type_id)
+            FROM sys.indexes AS i
+            INNER JOIN sys.index_columns AS ic
+                ON i.object_id = ic.object_id AND i.index_id = ic.index_id
+            INNER JOIN sys.columns AS c
+                ON ic.object_id = c.object_id AND ic.column_id = c.column_id
+            INNER JOIN sys.tables AS t ON i.object_id = t.object_id
+            INNER JOIN sys.schemas AS s ON t.schema_id = s.schema_id
+            WHERE i.is_primary_key = 1 AND s.name = ? AND t.name = ?
+            ORDER BY ic.key_ordinal
+        """, (schema, table_name))
+        return [(row[0], row[1]) for row in cursor.fetchall()]
+
+    def range_key(self, conn, schema: str, table_name: str,
+                  catalog: Optional[CatalogSnapshot] = None) -> Optional[str]:
+        """Return the column usable for key-range hashing, if any
+
+        Only single-column integer primary keys are split into ranges; other
+        tables are hashed as a single range. With a catalog snapshot the key
+        is looked up there instead of queried.
+        """
+        if catalog is not None:
+            primary_key = catalog.primary_key(schema, table_name)
+        else:
+            primary_key = self.get_primary_key(conn, schema, table_name)
+        if len(primary_key) == 1 and primary_key[0][1].lower() in INTEGER_KEY_TYPES:
+            return primary_key[0][0]
+        return None
+
+    def load_catalog(self, conn) -> CatalogSnapshot:
+        """Read columns, primary keys, foreign keys and indexes of all tables
+
+        One query per kind of object for the whole database, grouped by
+        (schema, table) in the returned snapshot.
+        """
+        catalog = CatalogSnapshot()
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            SELECT 
+                c.TABLE_SCHEMA,
+                c.TABLE_NAME,
+                c.COLUMN_NAME,
+                c.DATA_TYPE,
+                c.CHARACTER_MAXIMUM_LENGTH,
+                c.IS_NULLABLE,
+                c.COLUMN_DEFAULT
+            FROM INFORMATION_SCHEMA.COLUMNS AS c
+            INNER JOIN INFORMATION_SCHEMA.TABLES AS t
+                ON c.TABLE_SCHEMA = t.TABLE_SCHEMA AND c.TABLE_NAME = t.TABLE_NAME
+            WHERE t.TABLE_TYPE = 'BASE TABLE'
+            ORDER BY c.TABLE_SCHEMA, c.TABLE_NAME, c.ORDINAL_POSITION
+        """)
+        for row in cursor.fetchall():
+            catalog.add_column(row[0], row[1], {
+                'name': row[2],
+                'type': row[3],
+                'max_length': row[4],
+                'nullable': row[5],
+                'default': row[6]
+            })
+
+        cursor.execute("""
+            SELECT 
+                s.name AS Schema_Name,
+                t.name AS Table_Name,
+                i.name AS Index_Name,
+                i.type_desc AS Index_Type,
+                i.is_unique,
+                i.is_primary_key,
+                c.name AS Column_Name,
+                TYPE_NAME(c.user_type_id) AS Column_Type
+            FROM sys.indexes AS i
+            INNER JOIN sys.index_columns AS ic 
+                ON i.object_id = ic.object_id 
+                AND i.index_id = ic.index_id
+            INNER JOIN sys.columns AS c
+                ON ic.object_id = c.object_id AND ic.column_id = c.column_id
+            INNER JOIN sys.tables AS t 
+                ON i.object_id = t.object_id
+            INNER JOIN sys.schemas AS s 
+                ON t.schema_id = s.schema_id
+            WHERE i.name IS NOT NULL
+            ORDER BY s.name, t.name, i.name, ic.key_ordinal
+        """)
+        for row in cursor.fetchall():
+            catalog.add_index_column(row[0], row[1], {
+                'name': row[2],
+                'type': row[3],
+                'is_unique': bool(row[4]),
+                'is_primary_key': bool(row[5]),
+                'columns': []
+            }, row[6])
+            if row[5]:
+                catalog.add_primary_key_column(row[0], row[1], row[6], row[7])
+
+        cursor.execute("""
+            SELECT 
+                s.name AS Schema_Name,
+                fk.name AS FK_Name,
+                tp.name AS Parent_Table,
+                cp.name AS Parent_Column,
+                OBJECT_SCHEMA_NAME(fk.referenced_object_id) AS Referenced_Schema,
+                tr.name AS Referenced_Table,
+                cr.name AS Referenced_Column
+            FROM sys.foreign_keys AS fk
+            INNER JOIN sys.foreign_key_columns AS fkc 
+                ON fk.object_id = fkc.constraint_object_id
+            INNER JOIN sys.tables AS tp 
+                ON fk.parent_object_id = tp.object_id
+            INNER JOIN sys.columns AS cp 
+                ON fkc.parent_object_id = cp.object_id 
+                AND fkc.parent_column_id = cp.column_id
+            INNER JOIN sys.tables AS tr 
+                ON fk.referenced_object_id = tr.object_id
+            INNER JOIN sys.columns AS cr 
+                ON fkc.referenced_object_id = cr.object_id 
+                AND fkc.referenced_column_id = cr.column_id
+            INNER JOIN sys.schemas AS s 
+                ON tp.schema_id = s.schema_id
+            ORDER BY s.name, tp.name, fk.name, fkc.constraint_column_id
+        """)
+        for row in cursor.fetchall():
+            catalog.add_foreign_key(row[0], row[2], {
+                'name': row[1],
+                'parent_table': row[2],
+                'parent_column': row[3],
+                'referenced_schema': row[4],
+                'referenced_table': row[5],
+                'referenced_column': row[6]
+            })
+
+        return catalog
+
+    def begin_snapshot(self, conn) -> Optional[str]:
+        """Switch conn to SNAPSHOT isolation, if the database allows it
+
+        Returns 'SNAPSHOT' when row versioning is available, None when
+        ALLOW_SNAPSHOT_ISOLATION is off (reads then stay READ COMMITTED).
+        SQL Server cannot hand one transaction's snapshot to another
+        connection: every connection passed to attach_snapshot gets its own
+        snapshot, taken at its first read. Readers never block writers.
+        """
+        cursor = conn.cursor()
+        cursor.execute("SELECT snapshot_isolation_state FROM sys.databases WHERE name = DB_NAME()")
+        if cursor.fetchone()[0] != 1:
+            return None
+        conn.commit()
+        cursor.execute("SET TRANSACTION ISOLATION LEVEL SNAPSHOT")
+        return 'SNAPSHOT'
+
+    def attach_snapshot(self, conn, snapshot_id: Optional[str]):
+        """Use SNAPSHOT isolation on another connection when begin_snapshot did"""
+        if snapshot_id is None:
+            return
+        cursor = conn.cursor()
+        cursor.execute("SET TRANSACTION ISOLATION LEVEL SNAPSHOT")
+
+    def exact_row_count(self, conn, schema: str, table_name: str) -> int:
+        """Count the rows of a table with COUNT(*)"""
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT COUNT(*) FROM {self.quote_table(schema, table_name)}")
+        return cursor.fetchone()[0]
+
+    def estimated_row_counts(self, conn) -> Dict[Tuple[str, str], int]:
+        """Row counts of all tables from sys.partitions (heap or clustered index)"""
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT 
+                s.name,
+                t.name,
+                SUM(p.rows) AS RowCnt
+            FROM sys.tables t
+            INNER JOIN sys.schemas s ON t.schema_id = s.schema_id
+            INNER JOIN sys.partitions p ON t.object_id = p.object_id
+            WHERE p.index_id IN (0, 1)
+            GROUP BY s.name, t.name
+        """)
+        return {(row[0], row[1]): int(row[2]) for row in cursor.fetchall()}
+
+    def key_window_clause(self, key_column: str, low: int, high: int) -> Tuple[str, tuple]:
+        """WHERE clause and parameters selecting low <= key < high"""
+        column = self.quote_column(key_column)
+        return f"{column} >= ? AND {column} < ?", (low, high)
+    
+    def keyset_page_query(self, schema: str, table_name: str, key_columns: List[str], page_size: int,
+                          after: Optional[tuple] = None, where: Optional[str] = None,
+                          params: tuple = ()) -> Tuple[str, tuple]:
+        """SELECT for the next page of at most page_size rows in key order
+
+        after is the key of the last row of the previous page. SQL Server has
+        no row value comparison, so (a, b) > (x, y) is spelled out as
+        a > x OR (a = x AND b > y).
+        """
+        conditions, page_params = [], list(params)
+        if where:
+            conditions.append(f"({where})")
+        if after is not None:
+            alternatives = []
+            for position, column in enumerate(key_columns):
+                terms = [f"{self.quote_column(c)} = ?" for c in key_columns[:position]]
+                terms.append(f"{self.quote_column(column)} > ?")
+                alternatives.append("(" + " AND ".join(terms) + ")")
+                page_params.extend(after[:position + 1])
+            conditions.append("(" + " OR ".join(alternatives) + ")")
+        where_sql = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        order_by = ", ".join(self.quote_column(column) for column in key_columns)
+        return (f"SELECT TOP ({int(page_size)}) * FROM {self.quote_table(schema, table_name)}{where_sql} "
+                f"ORDER BY {order_by}", tuple(page_params))
+    
+    def key_range_clause(self, key_column: str, bucket: int, range_size: int) -> Tuple[str, tuple]:
+        """WHERE clause and parameters selecting the rows of one key range"""
+        low, high = bucket_bounds(bucket, range_size)
+        return self.key_window_clause(key_column, low, high)
+    
+    def key_bounds(self, conn, schema: str, table_name: str, key_column: str) -> Optional[Tuple[int, int]]:
+        """Smallest and largest key value, or None for an empty table"""
+        column = self.quote_column(key_column)
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT MIN({column}), MAX({column}) FROM {self.quote_table(schema, table_name)}")
+        low, high = cursor.fetchone()
+        if low is None:
+            return None
+        return int(low), int(high)
+
+    def range_hashes(self, conn, schema: str, table_name: str, key_column: Optional[str],
+                     range_size: int, low: Optional[int] = None,
+                     high: Optional[int] = None) -> Dict[int, Tuple[int, str]]:
+        """Compute per-key-range row counts and aggregate hashes on the server
+
+        Returns {bucket: (row_count, hash)} where bucket is key / range_size
+        (truncated toward zero). When low and high are given, only keys in
+        [low, high) are hashed and buckets are (key - low) / range_size.
+        Without a key column the whole table is one bucket. Only the aggregates travel over the network.
+        """
+        table = self.quote_table(schema, table_name)
+        where_sql, params = "", ()
+        if key_column and low is not None:
+            bucket_expr = f"({self.quote_column(key_column)} - {int(low)}) / {int(range_size)}"
+            where, params = self.key_window_clause(key_column, low, high)
+            where_sql = f" WHERE {where}"
+        elif key_column:
+            bucket_expr = f"{self.quote_column(key_column)} / {int(range_size)}"
+        else:
+            bucket_expr = "0"
+
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT
+                bucket,
+                COUNT_BIG(*),
+                CHECKSUM_AGG(row_hash),
+                SUM(CAST(row_hash AS BIGINT))
+            FROM (
+                SELECT {bucket_expr} AS bucket, BINARY_CHECKSUM(*) AS row_hash
+                FROM {table}{where_sql}
+            ) AS hashed
+            GROUP BY bucket
+        """, params)
+
+        return {
+            int(row[0]): (int(row[1]), f"{row[2]}:{row[3]}")
+            for row in cursor.fetchall()
+        }
@@ -17,6 +17,9 @@ import pyodbc
 from pathlib import Path
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / 'test_data'))
+from fast_reset import reset_tables, revert_snapshot
+
 # Optional imports for graphing
 try:
     import pandas as pd
@@ -177,33 +180,19 @@ def get_connection_from_config(env_name: str, config_file: Path):
 
 
 def cleanup_database(connection_string):
-    """Clean up database by deleting test records"""
+    """Clean up database by emptying the test tables in one transaction (see test_data/fast_reset.py)"""
     print("Cleaning up database...")
     
     try:
         conn = pyodbc.connect(connection_string)
-        cursor = conn.cursor()
-        
-        # Delete in correct order to respect FK constraints
-        delete_queries = [
-            ("Books", "DELETE FROM [dbo].[Books]"),
-            ("Authors", "DELETE FROM [dbo].[Authors]"),
-            ("Customers", "DELETE FROM [dbo].[Customers]"),
-        ]
         
-        for table_name, query in delete_queries:
-            try:
-                cursor.execute(query)
-                affected = cursor.rowcount
-                print(f"  ✓ Deleted {affected} records from {table_name}")
-            except Exception as e:
-                print(f"  Warning: Could not delete from {table_name}: {str(e)}")
+        # Emptied and identities reseeded in one batch, FK constraints respected
+        for schema, table_name, count, action in reset_tables(conn, ['Books', 'Authors', 'Customers']):
+            print(f"  ✓ {action.capitalize()} {count} records from {table_name}")
         
-        cursor.commit()
         print("  ✓ Database cleanup completed!")
         print()
         
-        cursor.close()
         conn.close()
         
     except Exception as e:
@@ -211,6 +200,24 @@ def cleanup_database(connection_string):
         print()
 
 
+def revert_database(connection_string, snapshot):
+    """Reset the database to a snapshot saved with populate_test_data.py --save-snapshot"""
+    print(f"Reverting database to snapshot {snapshot}...")
+    
+    try:
+        conn = pyodbc.connect(connection_string)
+        database = revert_snapshot(conn, snapshot)
+        conn.close()
+        print(f"  ✓ Reverted {database} to snapshot {snapshot}")
+        print()
+        return True
+        
+    except Exception as e:
+        print(f"  Error reverting to snapshot: {str(e)}")
+        print()
+        return False
+
+
 def seed_database(connection_string):
     """Seed database with test data"""
     print("Seeding database with test data...")
@@ -754,6 +761,9 @@ Examples:
   # Skip database seeding (reuse existing data)
   python run_and_monitor_db_test.py --env target --no-seed
   
+  # Reset from a database snapshot saved by test_data/populate_test_data.py --save-snapshot
+  python run_and_monitor_db_test.py --env target --revert-snapshot bookservice_sf10
+  
   # Cleanup only
   python run_and_monitor_db_test.py --env target --cleanup
         """)
@@ -768,6 +778,8 @@ Examples:
                        help='Skip system performance profiling')
     parser.add_argument('--no-seed', action='store_true',
                        help='Skip database seeding')
+    parser.add_argument('--revert-snapshot', type=str, default=None, metavar='NAME',
+                       help='Revert the database to snapshot NAME instead of cleaning and seeding it')
     parser.add_argument('--timeout', type=int, default=1800,
                        help='JMeter test timeout in seconds (default: 1800)')
     
@@ -806,13 +818,18 @@ Examples:
         sys.exit(1)
     print()
     
-    # Step 2: Cleanup
-    print_header("[Step 2/7] Cleaning Database")
-    cleanup_database(connection_string)
+    # Step 2: Cleanup, or revert to a snapshot that already holds the test data
+    if args.revert_snapshot:
+        print_header("[Step 2/7] Reverting Database to Snapshot")
+        if not revert_database(connection_string, args.revert_snapshot):
+            sys.exit(1)
+    else:
+        print_header("[Step 2/7] Cleaning Database")
+        cleanup_database(connection_string)
     print()
     
-    # Step 3: Seeding (unless skipped)
-    if not args.no_seed:
+    # Step 3: Seeding (unless skipped or reverted to a snapshot)
+    if not args.no_seed and not args.revert_snapshot:
         print_header("[Step 2.5/7] Seeding Database")
         seed_database(connection_string)
         print()
@@ -5,9 +5,14 @@ Enhanced version with foreign keys and primary keys display
 import pyodbc
 import json
 import argparse
+import sys
 from pathlib import Path
 import logging
 
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'data_integrity_tests'))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'shared'))
+from db_dialect import SqlServerDialect
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -37,43 +42,6 @@ def build_connection_string(env_config):
         f"TrustServerCertificate=yes"
     )
 
-def get_primary_keys(cursor, schema, table):
-    """Get primary key columns for a table"""
-    cursor.execute("""
-        SELECT COLUMN_NAME
-        FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE
-        WHERE OBJECTPROPERTY(OBJECT_ID(CONSTRAINT_SCHEMA + '.' + CONSTRAINT_NAME), 'IsPrimaryKey') = 1
-        AND TABLE_SCHEMA = ? AND TABLE_NAME = ?
-        ORDER BY ORDINAL_POSITION
-    """, (schema, table))
-    return [row[0] for row in cursor.fetchall()]
-
-def get_foreign_keys(cursor, schema, table):
-    """Get foreign key relationships for a table"""
-    cursor.execute("""
-        SELECT 
-            fk.name AS FK_Name,
-            cp.name AS Column_Name,
-            OBJECT_SCHEMA_NAME(fk.referenced_object_id) AS Referenced_Schema,
-            OBJECT_NAME(fk.referenced_object_id) AS Referenced_Table,
-            cr.name AS Referenced_Column
-        FROM sys.foreign_keys AS fk
-        INNER JOIN sys.foreign_key_columns AS fkc 
-            ON fk.object_id = fkc.constraint_object_id
-        INNER JOIN sys.tables AS tp 
-            ON fk.parent_object_id = tp.object_id
-        INNER JOIN sys.columns AS cp 
-            ON fkc.parent_object_id = cp.object_id 
-            AND fkc.parent_column_id = cp.column_id
-        INNER JOIN sys.columns AS cr 
-            ON fkc.referenced_object_id = cr.object_id 
-            AND fkc.referenced_column_id = cr.column_id
-        INNER JOIN sys.schemas AS s 
-            ON tp.schema_id = s.schema_id
-        WHERE s.name = ? AND tp.name = ?
-    """, (schema, table))
-    return cursor.fetchall()
-
 def query_tables(env_name="target", config_path="db_config.json"):
     """Query all tables from the database"""
     try:
@@ -123,40 +91,27 @@ def query_tables(env_name="target", config_path="db_config.json"):
         print("Getting detailed column information for each table...")
         print("="*70 + "\n")
         
+        # Columns, primary keys and foreign keys of all tables in three queries
+        catalog = SqlServerDialect().load_catalog(conn)
+        
         for row in tables:
             schema = row.TABLE_SCHEMA
             table = row.TABLE_NAME
             
-            # Get columns for this table
-            cursor.execute(f"""
-                SELECT 
-                    COLUMN_NAME,
-                    DATA_TYPE,
-                    CHARACTER_MAXIMUM_LENGTH,
-                    IS_NULLABLE,
-                    COLUMN_DEFAULT
-                FROM INFORMATION_SCHEMA.COLUMNS
-                WHERE TABLE_SCHEMA = '{schema}' AND TABLE_NAME = '{table}'
-                ORDER BY ORDINAL_POSITION
-            """)
-            
-            columns = cursor.fetchall()
-            
-            # Get primary keys for this table
-            pk_columns = get_primary_keys(cursor, schema, table)
-            
-            # Get foreign keys for this table
-            fk_info = get_foreign_keys(cursor, schema, table)
-            fk_columns = {fk[1] for fk in fk_info}
+            # Columns and keys come from the catalog snapshot
+            columns = catalog.columns(schema, table)
+            pk_columns = [column for column, _ in catalog.primary_key(schema, table)]
+            fk_info = catalog.foreign_keys(schema, table, include_schema=True)
+            fk_columns = {fk['parent_column'] for fk in fk_info}
             
             print(f"\n{schema}.{table}")
             print("-" * 70)
             for col in columns:
-                col_name = col.COLUMN_NAME
-                data_type = col.DATA_TYPE
-                max_len = f"({col.CHARACTER_MAXIMUM_LENGTH})" if col.CHARACTER_MAXIMUM_LENGTH else ""
-                nullable = "NULL" if col.IS_NULLABLE == "YES" else "NOT NULL"
-                default = f" DEFAULT {col.COLUMN_DEFAULT}" if col.COLUMN_DEFAULT else ""
+                col_name = col['name']
+                data_type = col['type']
+                max_len = f"({col['max_length']})" if col['max_length'] else ""
+                nullable = "NULL" if col['nullable'] == "YES" else "NOT NULL"
+                default = f" DEFAULT {col['default']}" if col['default'] else ""
                 
                 # Add markers for PK and FK
                 markers = ""
@@ -171,7 +126,8 @@ def query_tables(env_name="target", config_path="db_config.json"):
             if fk_info:
                 print(f"\n  Foreign Keys:")
                 for fk in fk_info:
-                    print(f"    {fk[1]} -> {fk[2]}.{fk[3]}.{fk[4]}")
+                    print(f"    {fk['parent_column']} -> {fk['referenced_schema']}."
+                          f"{fk['referenced_table']}.{fk['referenced_column']}")
             
             # Display primary key
             if pk_columns:
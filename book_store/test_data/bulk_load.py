@@ -0,0 +1,98 @@
+"""
+Bulk Loading for SQL Server
+
+Inserts generated rows in batches with pyodbc's fast_executemany, which
+sends a whole batch of parameter rows to the server as one ODBC parameter
+array instead of one INSERT round trip per row.
+
+IDs are recovered per batch rather than per row:
+
+  explicit IDs  with IDENTITY_INSERT the caller chooses the IDs and rows go
+                straight into the table (insert)
+  identity IDs  rows go into a #temp staging table first, then into the
+                table with one INSERT ... SELECT ... ORDER BY whose OUTPUT
+                clause returns the generated IDs (insert_returning_ids);
+                SQL Server assigns identity values in ORDER BY order, so the
+                sorted IDs line up with the rows as given
+
+Table-valued parameters would save the staging table but need a table type
+created on the server for every table; a #temp table needs no DDL rights.
+"""
+
+from itertools import islice
+from typing import Callable, Iterable, List, Optional, Sequence
+
+DEFAULT_BATCH_SIZE = 10000
+
+
+def batches(rows: Iterable[Sequence], batch_size: int) -> Iterable[List[Sequence]]:
+    """Split rows into lists of at most batch_size rows"""
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+class BulkLoader:
+    """Loads rows into SQL Server tables a batch at a time on one connection"""
+
+    def __init__(self, conn, batch_size: int = DEFAULT_BATCH_SIZE,
+                 progress: Optional[Callable[[int], None]] = None):
+        self.conn = conn
+        self.batch_size = max(1, batch_size)
+        self.progress = progress
+
+    def _cursor(self):
+        cursor = self.conn.cursor()
+        cursor.fast_executemany = True
+        return cursor
+
+    def insert(self, table: str, columns: List[str], rows: Iterable[Sequence]) -> int:
+        """Insert rows (values in column order), returning the number of rows loaded"""
+        cursor = self._cursor()
+        column_list = ', '.join(f"[{column}]" for column in columns)
+        placeholders = ', '.join('?' * len(columns))
+        sql = f"INSERT INTO {table} ({column_list}) VALUES ({placeholders})"
+        loaded = 0
+        for batch in batches(rows, self.batch_size):
+            cursor.executemany(sql, batch)
+            loaded += len(batch)
+            if self.progress:
+                self.progress(loaded)
+        return loaded
+
+    def insert_returning_ids(self, table: str, columns: List[str], rows: Iterable[Sequence],
+                             id_column: str = 'Id') -> List[int]:
+        """Insert rows into a table with an identity column, returning the new IDs in row order"""
+        cursor = self._cursor()
+        column_list = ', '.join(f"[{column}]" for column in columns)
+        placeholders = ', '.join('?' * (len(columns) + 1))
+        # A stage table left behind by a failed call on this connection
+        cursor.execute("IF OBJECT_ID('tempdb..#bulk_stage') IS NOT NULL DROP TABLE #bulk_stage")
+        # Same column types as the target, plus the position of each row
+        cursor.execute(f"SELECT TOP 0 CAST(0 AS INT) AS [bulk_seq], {column_list} INTO #bulk_stage FROM {table}")
+        ids = []
+        try:
+            for batch in batches(rows, self.batch_size):
+                cursor.executemany(f"INSERT INTO #bulk_stage ([bulk_seq], {column_list}) VALUES ({placeholders})",
+                                   [(seq, *row) for seq, row in enumerate(batch)])
+                cursor.execute(f"""
+                    INSERT INTO {table} ({column_list})
+                    OUTPUT INSERTED.[{id_column}]
+                    SELECT {column_list} FROM #bulk_stage ORDER BY [bulk_seq]
+                """)
+                ids.extend(sorted(int(row[0]) for row in cursor.fetchall()))
+                cursor.execute("TRUNCATE TABLE #bulk_stage")
+                if self.progress:
+                    self.progress(len(ids))
+        except Exception:
+            try:
+                cursor.execute("DROP TABLE #bulk_stage")
+            except Exception:
+                # Keep the original error; the next call drops the stage table instead
+                pass
+            raise
+        cursor.execute("DROP TABLE #bulk_stage")
+        return ids
@@ -4,8 +4,13 @@ Check database schema structure
 import pyodbc
 import json
 import argparse
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'data_testing' / 'data_integrity_tests'))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'shared'))
+from db_dialect import SqlServerDialect
+
 def load_config(config_path="../db_config.json", env_name="target"):
     """Load database configuration from JSON file"""
     with open(config_path, 'r') as f:
@@ -44,28 +49,24 @@ def check_schema(env_name="target", config_path="../db_config.json"):
         print(f"{'='*70}\n")
         
         conn = pyodbc.connect(connection_string)
-        cursor = conn.cursor()
+
+        # Columns of all tables in one pass over the catalog
+        catalog = SqlServerDialect().load_catalog(conn)
 
         tables = ['Authors', 'Books', 'Genres', 'Customers', 'Rentals', 'Stocks']
 
         for table_name in tables:
             print(f"\n=== {table_name} Table Structure ===")
-            cursor.execute(f"""
-                SELECT COLUMN_NAME, DATA_TYPE, IS_NULLABLE, CHARACTER_MAXIMUM_LENGTH
-                FROM INFORMATION_SCHEMA.COLUMNS
-                WHERE TABLE_NAME = '{table_name}'
-                ORDER BY ORDINAL_POSITION
-            """)
-            
-            rows = cursor.fetchall()
+            table = catalog.find_table(table_name)
+            rows = catalog.columns(*table) if table else []
             if rows:
                 print(f"  {'Column Name':<30} {'Data Type':<15} {'Nullable':<10} {'Max Length'}")
                 print(f"  {'-'*30} {'-'*15} {'-'*10} {'-'*10}")
                 for row in rows:
-                    col_name = row[0]
-                    data_type = row[1]
-                    nullable = row[2]
-                    max_len = row[3] if row[3] else "N/A"
+                    col_name = row['name']
+                    data_type = row['type']
+                    nullable = row['nullable']
+                    max_len = row['max_length'] if row['max_length'] else "N/A"
                     print(f"  {col_name:<30} {data_type:<15} {nullable:<10} {max_len}")
             else:
                 print(f"  ⚠ Table '{table_name}' not found or has no columns")
@@ -0,0 +1,154 @@
+"""
+Fast Reset for SQL Server
+
+Empties the user tables in one batch and one transaction: constraints are
+disabled, every non-empty table is truncated, or deleted from if another
+table references it (TRUNCATE refuses those even with the constraints
+disabled), identities are reseeded, and the constraints are re-enabled
+WITH CHECK. The catalog is read once up front, so the reset costs two round
+trips however many tables there are. Empty tables are cleared too, as the
+catalog's row counts are only approximate.
+
+For resets between test runs that take seconds regardless of data size, a
+database snapshot of the populated database can be reverted to instead
+(create_snapshot / revert_snapshot). Snapshots need an edition that supports
+them (Enterprise, Developer, or Standard from 2016 SP1) and rights to create
+databases; reverting disconnects every other session of the database.
+"""
+
+from typing import Iterable, List, Optional, Tuple
+
+_TABLES_QUERY = """
+    SELECT
+        s.name AS TableSchema,
+        t.name AS TableName,
+        (SELECT COALESCE(SUM(p.rows), 0) FROM sys.partitions p
+         WHERE p.object_id = t.object_id AND p.index_id IN (0, 1)) AS RowCnt,
+        CASE WHEN EXISTS (SELECT 1 FROM sys.foreign_keys fk WHERE fk.referenced_object_id = t.object_id)
+             THEN 1 ELSE 0 END AS IsReferenced,
+        (SELECT CAST(ic.seed_value AS BIGINT) - CAST(ic.increment_value AS BIGINT) FROM sys.identity_columns ic
+         WHERE ic.object_id = t.object_id AND ic.last_value IS NOT NULL) AS Reseed,
+        CASE WHEN EXISTS (SELECT 1 FROM sys.foreign_keys fk WHERE fk.parent_object_id = t.object_id)
+             THEN 1 ELSE 0 END AS HasForeignKeys
+    FROM sys.tables t
+    INNER JOIN sys.schemas s ON t.schema_id = s.schema_id
+    WHERE s.name NOT IN ('sys', 'INFORMATION_SCHEMA')
+        AND t.name NOT IN ('__MigrationHistory')
+    ORDER BY HasForeignKeys DESC, TableName
+"""
+
+
+def _drain(cursor):
+    """Consume every result of a batch, so that errors in later statements are raised"""
+    while cursor.nextset():
+        pass
+
+
+def reset_tables(conn, tables: Optional[Iterable[str]] = None) -> List[Tuple[str, str, int, str]]:
+    """Empty the user tables (or only those named) and reseed their identities in one transaction
+
+    Returns (schema, table, rows before, action) for every table, the
+    action being 'truncated' or 'deleted'. The row counts come from the
+    catalog, as in the populator's summary. Nothing is changed if any
+    statement fails.
+    """
+    cursor = conn.cursor()
+    cursor.execute(_TABLES_QUERY)
+    catalog = cursor.fetchall()
+    if tables is not None:
+        names = set(tables)
+        catalog = [row for row in catalog if row[1] in names]
+
+    statements = ["SET NOCOUNT ON", "SET XACT_ABORT ON"]
+    statements += [f"ALTER TABLE [{schema}].[{table}] NOCHECK CONSTRAINT ALL" for schema, table, *_ in catalog]
+    result = []
+    for schema, table, rows, referenced, reseed, _ in catalog:
+        full_table = f"[{schema}].[{table}]"
+        if referenced:
+            statements.append(f"DELETE FROM {full_table}")
+            if reseed is not None:
+                # Identity used since the table was created or truncated: next value is the seed again
+                statements.append(f"DBCC CHECKIDENT ('{full_table}', RESEED, {reseed}) WITH NO_INFOMSGS")
+            action = 'deleted'
+        else:
+            # Also resets the identity to its seed
+            statements.append(f"TRUNCATE TABLE {full_table}")
+            action = 'truncated'
+        result.append((schema, table, int(rows), action))
+    statements += [f"ALTER TABLE [{schema}].[{table}] WITH CHECK CHECK CONSTRAINT ALL"
+                   for schema, table, *_ in catalog]
+
+    try:
+        cursor.execute(";\n".join(statements))
+        _drain(cursor)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return result
+
+
+def _snapshot_of(cursor, database: str, snapshot: str) -> bool:
+    """Whether snapshot exists as a database snapshot of database (any other database raises)"""
+    cursor.execute("SELECT DB_NAME(source_database_id) FROM sys.databases WHERE name = ?", snapshot)
+    row = cursor.fetchone()
+    if row is None:
+        return False
+    if row[0] != database:
+        raise ValueError(f"Database '{snapshot}' exists and is not a snapshot of '{database}'")
+    return True
+
+
+def _current_database(cursor) -> str:
+    """Name of the cursor's current database"""
+    cursor.execute("SELECT DB_NAME()")
+    return cursor.fetchone()[0]
+
+
+def create_snapshot(conn, snapshot: str) -> str:
+    """Create (or replace) a snapshot of the connection's database, returning the database name
+
+    The snapshot's sparse files go next to the database's data files.
+    """
+    autocommit = conn.autocommit
+    conn.autocommit = True
+    try:
+        cursor = conn.cursor()
+        database = _current_database(cursor)
+        if _snapshot_of(cursor, database, snapshot):
+            cursor.execute(f"DROP DATABASE [{snapshot}]")
+        cursor.execute("SELECT name, physical_name FROM sys.master_files WHERE database_id = DB_ID(?) AND type = 0",
+                       database)
+        files = ", ".join(f"(NAME = [{name}], FILENAME = '{path.rsplit('.', 1)[0]}_{snapshot}.ss')"
+                          for name, path in cursor.fetchall())
+        cursor.execute(f"CREATE DATABASE [{snapshot}] ON {files} AS SNAPSHOT OF [{database}]")
+        _drain(cursor)
+    finally:
+        conn.autocommit = autocommit
+    return database
+
+
+def revert_snapshot(conn, snapshot: str) -> str:
+    """Revert the connection's database to a snapshot, returning the database name
+
+    Other sessions of the database are disconnected, and the connection is
+    left in master. SQL Server only reverts a database that has no other
+    snapshot.
+    """
+    autocommit = conn.autocommit
+    conn.autocommit = True
+    try:
+        cursor = conn.cursor()
+        database = _current_database(cursor)
+        cursor.execute("USE master")
+        if not _snapshot_of(cursor, database, snapshot):
+            raise ValueError(f"No snapshot '{snapshot}' of database '{database}'")
+        cursor.execute(f"ALTER DATABASE [{database}] SET SINGLE_USER WITH ROLLBACK IMMEDIATE")
+        try:
+            cursor.execute(f"RESTORE DATABASE [{database}] FROM DATABASE_SNAPSHOT = '{snapshot}'")
+            _drain(cursor)
+        finally:
+            cursor.execute(f"ALTER DATABASE [{database}] SET MULTI_USER")
+    finally:
+        conn.autocommit = autocommit
+    return database
@@ -14,6 +14,15 @@ import logging
 import random
 import argparse
 import json
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'shared'))
+from bulk_load import DEFAULT_BATCH_SIZE, BulkLoader
+from fast_reset import create_snapshot, reset_tables, revert_snapshot
+from parallel_load import PartitionScheduler, partitions
+from scale_factor import SCALE_FACTOR_ROWS
+from scaling import DEFAULT_SKEW, ZipfChooser, scaled_rows
+from vector_columns import NUMPY_AVAILABLE, ColumnGenerator, VectorZipf, join, to_rows
 
 # Configure logging
 logging.basicConfig(
@@ -75,13 +84,52 @@ def get_connection_from_config(env_name: str, config_path: str = "../db_config.j
     return conn_str
 
 
+# Populator and connection of a worker process (see populate_parallel)
+_worker = {}
+
+
+def _init_worker(populator):
+    """Open the connection of a worker process and reseed its random generators"""
+    random.seed()
+    if populator.columns:
+        populator.columns = ColumnGenerator()
+    _worker['populator'] = populator
+    _worker['conn'] = populator.get_connection()
+
+
+def _load_authors(first_row: int, count: int):
+    return _worker['populator'].populate_authors(_worker['conn'], count, first_row)
+
+
+def _load_books(first_row: int, count: int, author_ids: list):
+    return _worker['populator'].populate_books(_worker['conn'], author_ids, count, first_row)
+
+
+def _load_customers(first_row: int, count: int):
+    return _worker['populator'].populate_customers(_worker['conn'], count, first_row)
+
+
 class TestDataPopulator:
     """Manages test data population for BookService database"""
     
-    def __init__(self, connection_string: str, record_count: int, env_name: str = "target"):
+    def __init__(self, connection_string: str, record_count: int, env_name: str = "target",
+                 batch_size: int = DEFAULT_BATCH_SIZE, scale_factor: float = None, skew: float = 0.0,
+                 vectorized: bool = NUMPY_AVAILABLE, workers: int = 1):
         self.connection_string = connection_string
         self.record_count = record_count
         self.env_name = env_name
+        self.batch_size = batch_size
+        self.scale_factor = scale_factor
+        self.skew = skew
+        self.workers = workers
+        if scale_factor:
+            # Sized from the scale factor (see scale_factor.py)
+            self.table_counts = scaled_rows(SCALE_FACTOR_ROWS, scale_factor)
+        else:
+            # Create more books than authors (realistic scenario)
+            self.table_counts = {'Authors': record_count, 'Books': record_count * 2, 'Customers': record_count}
+        # Whole columns per batch with NumPy, otherwise one row at a time
+        self.columns = ColumnGenerator() if vectorized else None
         self.timestamp = datetime.now()
         
     def get_connection(self):
@@ -133,123 +181,66 @@ class TestDataPopulator:
             })
         return tables
     
-    def get_foreign_key_order(self, conn):
-        """Get tables in order for deletion (child tables first)"""
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT DISTINCT
-                s.name AS TableSchema,
-                t.name AS TableName,
-                CASE 
-                    WHEN EXISTS (
-                        SELECT 1 FROM sys.foreign_keys fk 
-                        WHERE fk.parent_object_id = t.object_id
-                    ) THEN 1
-                    ELSE 0
-                END AS HasForeignKeys
-            FROM sys.tables t
-            INNER JOIN sys.schemas s ON t.schema_id = s.schema_id
-            WHERE s.name NOT IN ('sys', 'INFORMATION_SCHEMA')
-                AND t.name NOT IN ('__MigrationHistory')
-            ORDER BY HasForeignKeys DESC, TableName
-        """)
-        
-        return [(row[0], row[1]) for row in cursor.fetchall()]
+    def bulk_loader(self, conn, label: str, count: int) -> BulkLoader:
+        """Bulk loader for conn that logs progress after each batch (see bulk_load.py)"""
+        def progress(loaded: int):
+            logger.info(f"   Created {loaded}/{count} {label}...")
+        return BulkLoader(conn, self.batch_size, progress)
+    
+    def vector_batches(self, count: int):
+        """(offset, size) of each batch of count rows generated as columns (see vector_columns.py)"""
+        for offset in range(0, count, self.batch_size):
+            yield offset, min(self.batch_size, count - offset)
     
     def delete_all_records(self):
-        """Delete all records from all user tables"""
+        """Delete all records from all user tables and reset identities, in one transaction (see fast_reset.py)"""
         logger.info("\n" + "="*70)
         logger.info("DELETING ALL RECORDS FROM DATABASE")
         logger.info("="*70)
         
         conn = self.get_connection()
-        cursor = conn.cursor()
         
         try:
-            # Get tables in proper order (respecting foreign keys)
-            tables = self.get_foreign_key_order(conn)
-            
-            logger.info(f"Found {len(tables)} tables to clear\n")
-            
-            # Disable foreign key constraints for specific tables only
-            logger.info("⚙  Disabling foreign key constraints...")
-            for schema, table_name in tables:
-                try:
-                    cursor.execute(f"ALTER TABLE [{schema}].[{table_name}] NOCHECK CONSTRAINT ALL")
-                except Exception as e:
-                    logger.warning(f"  Could not disable constraints on {schema}.{table_name}: {e}")
-            conn.commit()
-            
-            # Delete from each table
-            for schema, table_name in tables:
-                full_table = f"[{schema}].[{table_name}]"
-                try:
-                    # Get current row count
-                    cursor.execute(f"SELECT COUNT(*) FROM {full_table}")
-                    count = cursor.fetchone()[0]
-                    
-                    if count > 0:
-                        # Try TRUNCATE first (resets identity automatically)
-                        try:
-                            cursor.execute(f"TRUNCATE TABLE {full_table}")
-                            conn.commit()
-                            logger.info(f"  Truncated {count:>5} rows from {schema}.{table_name} (identity reset)")
-                        except Exception as truncate_err:
-                            # If TRUNCATE fails (due to FK), fall back to DELETE
-                            cursor.execute(f"DELETE FROM {full_table}")
-                            conn.commit()
-                            logger.info(f"  Deleted {count:>5} rows from {schema}.{table_name}")
-                    else:
-                        logger.info(f"  Skipped {schema}.{table_name} (already empty)")
-                        
-                except Exception as e:
-                    logger.warning(f"  Could not delete from {schema}.{table_name}: {e}")
-            
-            # Re-enable foreign key constraints for specific tables only
-            logger.info("\n⚙  Re-enabling foreign key constraints...")
-            for schema, table_name in tables:
-                try:
-                    cursor.execute(f"ALTER TABLE [{schema}].[{table_name}] WITH CHECK CHECK CONSTRAINT ALL")
-                except Exception as e:
-                    logger.warning(f"  Could not re-enable constraints on {schema}.{table_name}: {e}")
-            conn.commit()
-            
-            # Reset identity seeds to 1 for all tables with identity columns
-            logger.info("\n⚙  Resetting identity columns to start from 1...")
-            for schema, table_name in tables:
-                try:
-                    # Check if table has identity column
-                    cursor.execute(f"""
-                        SELECT COUNT(*) 
-                        FROM sys.identity_columns ic
-                        INNER JOIN sys.tables t ON ic.object_id = t.object_id
-                        INNER JOIN sys.schemas s ON t.schema_id = s.schema_id
-                        WHERE s.name = ? AND t.name = ?
-                    """, schema, table_name)
-                    
-                    has_identity = cursor.fetchone()[0] > 0
-                    
-                    if has_identity:
-                        # Reset identity to 1
-                        cursor.execute(f"DBCC CHECKIDENT ('[{schema}].[{table_name}]', RESEED, 0)")
-                        logger.info(f"  Reset identity for {schema}.{table_name} to 1")
-                except Exception as e:
-                    logger.warning(f"  Could not reset identity for {schema}.{table_name}: {e}")
-            conn.commit()
+            tables = reset_tables(conn)
+            logger.info(f"Cleared {len(tables)} tables in one transaction\n")
+            for schema, table_name, count, action in tables:
+                if not count:
+                    logger.info(f"  Cleared {schema}.{table_name} (already empty)")
+                elif action == 'truncated':
+                    logger.info(f"  Truncated {count:>5} rows from {schema}.{table_name} (identity reset)")
+                else:
+                    logger.info(f"  Deleted {count:>5} rows from {schema}.{table_name} (identity reset)")
             
             logger.info("="*70)
             logger.info(" All records deleted and identity columns reset successfully")
             logger.info("="*70)
             
         except Exception as e:
-            logger.error(f"Error during deletion: {e}")
-            conn.rollback()
+            logger.error(f"Error during deletion (no records deleted): {e}")
             raise
         finally:
             conn.close()
     
-    def populate_authors(self, conn, count: int):
-        """Populate Authors table with test data"""
+    def save_snapshot(self, snapshot: str):
+        """Create (or replace) a database snapshot of the populated database"""
+        conn = self.get_connection()
+        try:
+            database = create_snapshot(conn, snapshot)
+            logger.info(f"✓ Saved database snapshot {snapshot} of {database}")
+        finally:
+            conn.close()
+    
+    def revert_to_snapshot(self, snapshot: str):
+        """Revert the database to a snapshot saved by save_snapshot"""
+        conn = self.get_connection()
+        try:
+            database = revert_snapshot(conn, snapshot)
+            logger.info(f"✓ Reverted {database} to database snapshot {snapshot}")
+        finally:
+            conn.close()
+    
+    def populate_authors(self, conn, count: int, first_row: int = 0):
+        """Populate Authors table with test data (rows first_row onwards when loading a partition)"""
         cursor = conn.cursor()
         
         logger.info(f"\n Populating Authors table with {count} records...")
@@ -275,8 +266,6 @@ class TestDataPopulator:
         nationalities = ['American', 'British', 'Canadian', 'Australian', 'Irish', 'German', 'French', 'Spanish',
                         'Italian', 'Japanese', 'Indian', 'Brazilian']
         
-        author_ids = []
-        
         # Try to use IDENTITY_INSERT to control IDs
         try:
             cursor.execute("SET IDENTITY_INSERT Authors ON")
@@ -286,45 +275,38 @@ class TestDataPopulator:
             use_identity_insert = False
             logger.info(f"   Using auto-increment IDs (no IDENTITY_INSERT permission)")
         
-        for i in range(count):
-            # Create unique timestamp-based identifier
-            timestamp_str = (self.timestamp + timedelta(seconds=i)).strftime('%Y%m%d%H%M%S')
-            microseconds = (self.timestamp + timedelta(microseconds=i*1000)).microsecond
-            
-            first_name = random.choice(first_names)
-            last_name = random.choice(last_names)
-            unique_suffix = f"[{timestamp_str}.{microseconds:06d}]"
-            
-            # Generate author name (single Name field)
-            author_name = f"{first_name} {last_name} {unique_suffix}"
-            
-            try:
-                if use_identity_insert:
-                    # Insert with explicit ID starting from 1
-                    author_id = i + 1
-                    cursor.execute("""
-                        INSERT INTO Authors (Id, Name)
-                        VALUES (?, ?)
-                    """, author_id, author_name)
-                    author_ids.append(author_id)
-                else:
-                    # Let SQL Server assign ID
-                    cursor.execute("""
-                        INSERT INTO Authors (Name)
-                        VALUES (?)
-                    """, author_name)
-                    
-                    # Get the inserted ID
-                    cursor.execute("SELECT @@IDENTITY")
-                    author_id = int(cursor.fetchone()[0])
-                    author_ids.append(author_id)
+        def author_names():
+            for i in range(first_row, first_row + count):
+                # Create unique timestamp-based identifier
+                timestamp_str = (self.timestamp + timedelta(seconds=i)).strftime('%Y%m%d%H%M%S')
+                microseconds = (self.timestamp + timedelta(microseconds=i*1000)).microsecond
                 
-                if (i + 1) % 10 == 0 or i == count - 1:
-                    logger.info(f"   Created {i + 1}/{count} authors...")
-                    
-            except Exception as e:
-                logger.error(f"   Error creating author {i+1}: {e}")
-                raise
+                first_name = random.choice(first_names)
+                last_name = random.choice(last_names)
+                unique_suffix = f"[{timestamp_str}.{microseconds:06d}]"
+                
+                # Generate author name (single Name field)
+                yield f"{first_name} {last_name} {unique_suffix}"
+        
+        def vector_author_names():
+            for offset, size in self.vector_batches(count):
+                suffixes = self.columns.timestamp_suffixes(self.timestamp, first_row + offset, size)
+                yield from join(self.columns.choice(first_names, size), ' ', self.columns.choice(last_names, size),
+                                ' [', suffixes, ']').tolist()
+        
+        names = vector_author_names() if self.columns else author_names()
+        loader = self.bulk_loader(conn, 'authors', count)
+        try:
+            if use_identity_insert:
+                # Insert with explicit IDs starting from 1
+                author_ids = list(range(first_row + 1, first_row + count + 1))
+                loader.insert('Authors', ['Id', 'Name'], zip(author_ids, names))
+            else:
+                # Let SQL Server assign IDs, returned per batch
+                author_ids = loader.insert_returning_ids('Authors', ['Name'], ((name,) for name in names))
+        except Exception as e:
+            logger.error(f"   Error creating authors: {e}")
+            raise
         
         if use_identity_insert:
             try:
@@ -339,8 +321,8 @@ class TestDataPopulator:
         
         return author_ids
     
-    def populate_books(self, conn, author_ids: list, count: int):
-        """Populate Books table with test data"""
+    def populate_books(self, conn, author_ids: list, count: int, first_row: int = 0):
+        """Populate Books table with test data (rows first_row onwards when loading a partition)"""
         cursor = conn.cursor()
         
         logger.info(f"\n Populating Books table with {count} records...")
@@ -376,8 +358,6 @@ class TestDataPopulator:
                  'Web Development', 'Mobile Apps', 'Security', 'DevOps', 'Testing',
                  'Architecture', 'Design Patterns', 'Algorithms', 'Networks', 'APIs']
         
-        book_ids = []
-        
         # Try to use IDENTITY_INSERT to control IDs
         try:
             cursor.execute("SET IDENTITY_INSERT Books ON")
@@ -387,48 +367,54 @@ class TestDataPopulator:
             use_identity_insert = False
             logger.info(f"   Using auto-increment IDs (no IDENTITY_INSERT permission)")
         
-        for i in range(count):
-            # Create unique timestamp-based identifier
-            timestamp_str = (self.timestamp + timedelta(seconds=i)).strftime('%Y%m%d%H%M%S')
-            microseconds = (self.timestamp + timedelta(microseconds=i*1000)).microsecond
-            
-            template = random.choice(title_templates)
-            topic = random.choice(topics)
-            title = template.format(topic) + f" [TS:{timestamp_str}.{microseconds:06d}]"
-            
-            # Assign to random author
-            author_id = random.choice(author_ids)
-            year = random.randint(2000, 2026)
-            price = round(random.uniform(9.99, 99.99), 2)
-            genre = random.choice(['Fiction', 'Non-Fiction', 'Science', 'Technology', 'History', 'Biography', 'Mystery', 'Thriller'])
-            
-            try:
-                if use_identity_insert:
-                    # Insert with explicit ID starting from 1
-                    book_id = i + 1
-                    cursor.execute("""
-                        INSERT INTO Books (Id, Title, Year, Price, Genre, AuthorId)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    """, book_id, title, year, price, genre, author_id)
-                    book_ids.append(book_id)
-                else:
-                    # Let SQL Server assign ID
-                    cursor.execute("""
-                        INSERT INTO Books (Title, Year, Price, Genre, AuthorId)
-                        VALUES (?, ?, ?, ?, ?)
-                    """, title, year, price, genre, author_id)
-                    
-                    # Get the inserted ID
-                    cursor.execute("SELECT @@IDENTITY")
-                    book_id = int(cursor.fetchone()[0])
-                    book_ids.append(book_id)
+        genres = ['Fiction', 'Non-Fiction', 'Science', 'Technology', 'History', 'Biography', 'Mystery', 'Thriller']
+        
+        def books():
+            # Books per author follow a Zipf skew (uniform with skew 0)
+            choose_author = ZipfChooser(author_ids, self.skew).choose
+            for i in range(first_row, first_row + count):
+                # Create unique timestamp-based identifier
+                timestamp_str = (self.timestamp + timedelta(seconds=i)).strftime('%Y%m%d%H%M%S')
+                microseconds = (self.timestamp + timedelta(microseconds=i*1000)).microsecond
                 
-                if (i + 1) % 10 == 0 or i == count - 1:
-                    logger.info(f"   Created {i + 1}/{count} books...")
-                    
-            except Exception as e:
-                logger.error(f"   Error creating book {i+1}: {e}")
-                raise
+                template = random.choice(title_templates)
+                topic = random.choice(topics)
+                title = template.format(topic) + f" [TS:{timestamp_str}.{microseconds:06d}]"
+                
+                # Assign to an author, popular ones more often
+                author_id = choose_author()
+                year = random.randint(2000, 2026)
+                price = round(random.uniform(9.99, 99.99), 2)
+                genre = random.choice(genres)
+                yield title, year, price, genre, author_id
+        
+        def vector_books():
+            # Every template and topic pair, picked uniformly
+            titles = [template.format(topic) for template in title_templates for topic in topics]
+            authors = VectorZipf(self.columns, author_ids, self.skew)
+            for offset, size in self.vector_batches(count):
+                suffixes = self.columns.timestamp_suffixes(self.timestamp, first_row + offset, size)
+                yield from to_rows(join(self.columns.choice(titles, size), ' [TS:', suffixes, ']'),
+                                   self.columns.integers(2000, 2026, size),
+                                   self.columns.prices(9.99, 99.99, size),
+                                   self.columns.choice(genres, size),
+                                   authors.choose(size))
+        
+        rows = vector_books() if self.columns else books()
+        book_columns = ['Title', 'Year', 'Price', 'Genre', 'AuthorId']
+        loader = self.bulk_loader(conn, 'books', count)
+        try:
+            if use_identity_insert:
+                # Insert with explicit IDs starting from 1
+                book_ids = list(range(first_row + 1, first_row + count + 1))
+                loader.insert('Books', ['Id'] + book_columns,
+                              ((book_id, *book) for book_id, book in zip(book_ids, rows)))
+            else:
+                # Let SQL Server assign IDs, returned per batch
+                book_ids = loader.insert_returning_ids('Books', book_columns, rows)
+        except Exception as e:
+            logger.error(f"   Error creating books: {e}")
+            raise
         
         if use_identity_insert:
             try:
@@ -443,10 +429,8 @@ class TestDataPopulator:
         
         return book_ids
     
-    def populate_customers(self, conn, count: int):
-        """Populate Customers table with test data"""
-        cursor = conn.cursor()
-        
+    def populate_customers(self, conn, count: int, first_row: int = 0):
+        """Populate Customers table with test data (rows first_row onwards when loading a partition)"""
         logger.info(f"\n Populating Customers table with {count} records...")
         
         first_names = ['Alice', 'Bob', 'Carol', 'David', 'Eve', 'Frank', 'Grace', 'Henry', 
@@ -456,36 +440,38 @@ class TestDataPopulator:
                      'Harris', 'Irving', 'Jackson', 'King', 'Lewis', 'Moore', 'Nelson', 'Owen',
                      'Parker', 'Quinn', 'Reed', 'Scott', 'Turner', 'Underwood', 'Vincent']
         
-        customer_ids = []
+        countries = ['USA', 'UK', 'Canada', 'Australia', 'Germany', 'France', 'India', 'Japan']
         
-        for i in range(count):
-            timestamp_str = (self.timestamp + timedelta(seconds=i)).strftime('%Y%m%d%H%M%S')
-            microseconds = (self.timestamp + timedelta(microseconds=i*1000)).microsecond
-            
-            first_name = random.choice(first_names)
-            last_name = random.choice(last_names)
-            unique_suffix = f"[{timestamp_str}.{microseconds:06d}]"
-            
-            email = f"{first_name.lower()}.{last_name.lower()}.{i}@customer.com"
-            country = random.choice(['USA', 'UK', 'Canada', 'Australia', 'Germany', 'France', 'India', 'Japan'])
-            
-            try:
-                cursor.execute("""
-                    INSERT INTO Customers (FirstName, LastName, Email, Country)
-                    VALUES (?, ?, ?, ?)
-                """, first_name + " " + unique_suffix, last_name, email, country)
+        def customers():
+            for i in range(first_row, first_row + count):
+                timestamp_str = (self.timestamp + timedelta(seconds=i)).strftime('%Y%m%d%H%M%S')
+                microseconds = (self.timestamp + timedelta(microseconds=i*1000)).microsecond
                 
-                # Get the inserted ID
-                cursor.execute("SELECT @@IDENTITY")
-                customer_id = int(cursor.fetchone()[0])
-                customer_ids.append(customer_id)
+                first_name = random.choice(first_names)
+                last_name = random.choice(last_names)
+                unique_suffix = f"[{timestamp_str}.{microseconds:06d}]"
                 
-                if (i + 1) % 10 == 0 or i == count - 1:
-                    logger.info(f"   Created {i + 1}/{count} customers...")
-                    
-            except Exception as e:
-                logger.error(f"   Error creating customer {i+1}: {e}")
-                raise
+                email = f"{first_name.lower()}.{last_name.lower()}.{i}@customer.com"
+                country = random.choice(countries)
+                yield first_name + " " + unique_suffix, last_name, email, country
+        
+        def vector_customers():
+            for offset, size in self.vector_batches(count):
+                first, first_lower = self.columns.choices(size, first_names, [name.lower() for name in first_names])
+                last, last_lower = self.columns.choices(size, last_names, [name.lower() for name in last_names])
+                suffixes = self.columns.timestamp_suffixes(self.timestamp, first_row + offset, size)
+                email = join(first_lower, '.', last_lower, '.', self.columns.numbers(first_row + offset, size),
+                             '@customer.com')
+                yield from to_rows(join(first, ' [', suffixes, ']'), last, email, self.columns.choice(countries, size))
+        
+        try:
+            # IDs assigned by SQL Server, returned per batch
+            customer_ids = self.bulk_loader(conn, 'customers', count).insert_returning_ids(
+                'Customers', ['FirstName', 'LastName', 'Email', 'Country'],
+                vector_customers() if self.columns else customers())
+        except Exception as e:
+            logger.error(f"   Error creating customers: {e}")
+            raise
         
         conn.commit()
         logger.info(f"✓ Created {len(customer_ids)} customers successfully")
@@ -577,7 +563,12 @@ class TestDataPopulator:
         logger.info("\n" + "="*70)
         logger.info("POPULATING DATABASE WITH TEST DATA")
         logger.info("="*70)
-        logger.info(f"Records to create per table: {self.record_count}")
+        if self.scale_factor:
+            logger.info(f"Scale factor: {self.scale_factor} (skew {self.skew})")
+        logger.info(f"Row generation: {'NumPy columns' if self.columns else 'Python, one row at a time'}")
+        if self.workers > 1:
+            logger.info(f"Workers: {self.workers} processes, one connection each")
+        logger.info(f"Records to create: {', '.join(f'{table} {count}' for table, count in self.table_counts.items())}")
         logger.info(f"Timestamp: {self.timestamp.strftime('%Y-%m-%d %H:%M:%S.%f')}")
         logger.info("="*70)
         
@@ -590,23 +581,26 @@ class TestDataPopulator:
             for table in tables:
                 logger.info(f"  • {table['schema']}.{table['name']} ({table['columns']} columns)")
             
-            # Populate Authors first (parent table)
-            author_ids = self.populate_authors(conn, self.record_count)
-            
-            # Populate Books (child table with FK to Authors)
-            # Create more books than authors (realistic scenario)
-            books_count = self.record_count * 2
-            book_ids = self.populate_books(conn, author_ids, books_count)
-            
-            # Populate Customers (independent table)
-            customer_ids = self.populate_customers(conn, self.record_count)
+            if self.workers > 1:
+                # Partitions of every table loaded by worker processes
+                created = self.populate_parallel()
+            else:
+                # Populate Authors first (parent table)
+                author_ids = self.populate_authors(conn, self.table_counts['Authors'])
+                
+                # Populate Books (child table with FK to Authors)
+                book_ids = self.populate_books(conn, author_ids, self.table_counts['Books'])
+                
+                # Populate Customers (independent table)
+                customer_ids = self.populate_customers(conn, self.table_counts['Customers'])
+                created = {'Authors': len(author_ids), 'Books': len(book_ids), 'Customers': len(customer_ids)}
             
             logger.info("\n" + "="*70)
             logger.info("✓ DATABASE POPULATED SUCCESSFULLY")
             logger.info("="*70)
-            logger.info(f"  Authors created:   {len(author_ids)}")
-            logger.info(f"  Books created:     {len(book_ids)}")
-            logger.info(f"  Customers created: {len(customer_ids)}")
+            logger.info(f"  Authors created:   {created['Authors']}")
+            logger.info(f"  Books created:     {created['Books']}")
+            logger.info(f"  Customers created: {created['Customers']}")
             logger.info("="*70)
             
         except Exception as e:
@@ -616,6 +610,37 @@ class TestDataPopulator:
         finally:
             conn.close()
     
+    def populate_parallel(self) -> dict:
+        """Load every table in partitions on worker processes, returning the rows created per table
+        
+        Books partition i only references the authors of Authors partition i
+        and starts as soon as they are committed; Customers loads alongside.
+        The skew of books per author applies within each partition. With
+        IDENTITY_INSERT the partitions get disjoint explicit ID ranges,
+        otherwise SQL Server assigns the IDs (see parallel_load.py).
+        """
+        parts = max(1, min(self.workers, self.table_counts['Authors']))
+        logger.info(f"\n Loading {parts} partitions per table on {self.workers} worker processes...")
+        
+        scheduler = PartitionScheduler(self.workers, _init_worker, (self,))
+        author_parts = partitions(self.table_counts['Authors'], parts)
+        book_parts = partitions(self.table_counts['Books'], parts)
+        for index, ((first_author, authors), (first_book, books)) in enumerate(zip(author_parts, book_parts)):
+            scheduler.add(('Authors', index), _load_authors, first_author, authors)
+            if books:
+                scheduler.add(('Books', index), _load_books, first_book, books, parent=('Authors', index))
+        for index, (first_customer, customers) in enumerate(partitions(self.table_counts['Customers'], parts)):
+            if customers:
+                scheduler.add(('Customers', index), _load_customers, first_customer, customers)
+        
+        def committed(key, ids):
+            table, index = key
+            logger.info(f"✓ {table} partition {index + 1}/{parts} committed ({len(ids)} rows)")
+        
+        results = scheduler.run(committed)
+        return {table: sum(len(ids) for (name, _), ids in results.items() if name == table)
+                for table in self.table_counts}
+    
     def print_summary(self):
         """Print summary of current database state"""
         logger.info("\n" + "="*70)
@@ -680,6 +705,16 @@ Examples:
   
   # Delete all records without populating:
   python populate_test_data.py --count 0
+  
+  # Scale factor 10 (100,000 authors, 1,000,000 books, 500,000 customers):
+  python populate_test_data.py --scale-factor 10 --env local
+  
+  # Same, loaded by 4 worker processes:
+  python populate_test_data.py --scale-factor 10 --env local --workers 4
+  
+  # Populate once and save a database snapshot, then reset from it between test runs:
+  python populate_test_data.py --scale-factor 10 --env local --save-snapshot bookservice_sf10
+  python populate_test_data.py --env local --revert-snapshot bookservice_sf10
         """
     )
     
@@ -690,6 +725,23 @@ Examples:
                        help='Environment to populate (default: target)')
     parser.add_argument('--config', type=str, default='../db_config.json',
                        help='Path to config file (default: ../db_config.json)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                       help=f'Rows sent to the server per bulk insert (default: {DEFAULT_BATCH_SIZE})')
+    parser.add_argument('--scale-factor', type=float, default=None,
+                       help='Size every table from a scale factor instead of --count '
+                            '(1 = 10,000 authors, 100,000 books, 50,000 customers)')
+    parser.add_argument('--no-numpy', action='store_true',
+                       help='Generate rows one at a time even if NumPy is installed')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Worker processes loading partitions of each table, each with its own connection '
+                            '(default: 1)')
+    parser.add_argument('--save-snapshot', type=str, default=None, metavar='NAME',
+                       help='After populating, save a database snapshot NAME to revert to later')
+    parser.add_argument('--revert-snapshot', type=str, default=None, metavar='NAME',
+                       help='Revert the database to snapshot NAME instead of deleting and populating')
+    parser.add_argument('--skew', type=float, default=None,
+                       help=f'Zipf exponent of books per author; 0 is uniform '
+                            f'(default: {DEFAULT_SKEW} with --scale-factor, otherwise 0)')
     
     args = parser.parse_args()
     
@@ -699,6 +751,13 @@ Examples:
         print(f"✗ Error: Invalid record count '{record_count}'")
         print("  Record count must be 0 or a positive integer (use 0 to delete all records only)")
         sys.exit(1)
+    if args.scale_factor is not None and args.scale_factor <= 0:
+        print(f"✗ Error: Invalid scale factor '{args.scale_factor}'")
+        sys.exit(1)
+    if args.workers < 1:
+        print(f"✗ Error: Invalid worker count '{args.workers}'")
+        sys.exit(1)
+    skew = args.skew if args.skew is not None else (DEFAULT_SKEW if args.scale_factor else 0.0)
     
     # Load configuration
     try:
@@ -712,14 +771,20 @@ Examples:
         sys.exit(1)
     
     # Create populator instance
-    populator = TestDataPopulator(connection_string, record_count, args.env)
+    populator = TestDataPopulator(connection_string, record_count, args.env, args.batch_size,
+                                  args.scale_factor, skew, NUMPY_AVAILABLE and not args.no_numpy, args.workers)
+    counts = populator.table_counts
+    populate = bool(args.scale_factor) or record_count > 0
     
     # Print environment info
     print("="*70)
     print(f"Environment: {args.env.upper()}")
     print(f"Database: {env_config['database']}")
     print(f"Server: {env_config.get('server', 'N/A')}")
-    print(f"Records per table: {record_count}")
+    if args.scale_factor:
+        print(f"Scale factor: {args.scale_factor} (skew {skew})")
+    else:
+        print(f"Records per table: {record_count}")
     print("="*70)
     
     # Test connection
@@ -727,6 +792,16 @@ Examples:
         print("\n✗ Cannot connect to database. Please check configuration.")
         sys.exit(1)
     
+    # Revert to a saved snapshot instead of deleting and populating
+    if args.revert_snapshot:
+        try:
+            populator.revert_to_snapshot(args.revert_snapshot)
+            populator.print_summary()
+        except Exception as e:
+            logger.error(f"\n✗ Error reverting to snapshot: {e}")
+            sys.exit(1)
+        sys.exit(0)
+    
     # Show summary before deletion
     print("\n" + "="*70)
     print("CURRENT DATABASE STATE (BEFORE DELETION)")
@@ -735,15 +810,15 @@ Examples:
     
     # Info about what will happen
     print("\n" + "="*70)
-    if record_count == 0:
+    if not populate:
         print("⚠ WARNING: This will DELETE ALL records (NO new data will be populated)")
     else:
         print("⚠ WARNING: This will DELETE ALL records and populate with new data")
     print("="*70)
-    if record_count > 0:
-        print(f"Will populate with {record_count} new test records per table")
+    if populate:
+        print("Will populate with new test records")
         print("(Authors: {}, Books: {}, Customers: {})".format(
-            record_count, record_count * 2, record_count))
+            counts['Authors'], counts['Books'], counts['Customers']))
     else:
         print("All records will be DELETED. No new data will be created.")
     print("="*70 + "\n")
@@ -752,9 +827,11 @@ Examples:
         # Delete all records
         populator.delete_all_records()
         
-        if record_count > 0:
+        if populate:
             # Populate with new data
             populator.populate_database()
+            if args.save_snapshot:
+                populator.save_snapshot(args.save_snapshot)
             
             # Show final summary
             populator.print_summary()
@@ -765,10 +842,12 @@ Examples:
             print(f"\n  Summary:")
             print(f"    • Environment: {args.env.upper()}")
             print(f"    • Deleted all existing records")
-            print(f"    • Created {record_count} authors")
-            print(f"    • Created {record_count * 2} books")
-            print(f"    • Created {record_count} customers")
+            print(f"    • Created {counts['Authors']} authors")
+            print(f"    • Created {counts['Books']} books")
+            print(f"    • Created {counts['Customers']} customers")
             print(f"    • All records have unique timestamp-based identifiers")
+            if args.save_snapshot:
+                print(f"    • Saved database snapshot {args.save_snapshot}")
             print("="*70)
         else:
             # Show final summary after deletion only
@@ -0,0 +1,14 @@
+"""
+Scale-Factor Row Counts
+
+Row count of every table at scale factor 1. The populator scales them with
+shared/scaling.py (scaled_rows), which also draws the foreign keys with a
+Zipf skew: a few authors write many books and most write one or two.
+"""
+
+# Row counts at scale factor 1
+SCALE_FACTOR_ROWS = {
+    'Authors': 10000,
+    'Books': 100000,
+    'Customers': 50000,
+}
@@ -0,0 +1,339 @@
+"""
+PostgreSQL Dialect Helpers
+
+PostgreSQL specific queries: the adapter plugged into the shared capture
+engine (baseline_engine.py, used by create_baseline.py and
+test_data/create_snapshot.py), also used by verify_migration.py.
+Server-side range hashes let the verifier compare tables without pulling
+every row over the network.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from catalog import CatalogSnapshot
+from row_hashing import bucket_bounds
+
+
+INTEGER_KEY_TYPES = ('smallint', 'integer', 'bigint')
+
+
+class PostgresDialect:
+    """Query helpers for PostgreSQL (psycopg2)"""
+
+    name = 'postgresql'
+
+    # Primary key types whose keys both servers order like Python integers
+    integer_key_types = INTEGER_KEY_TYPES
+
+    # Worker connections see the exported snapshot of begin_snapshot
+    shares_snapshot = True
+
+    def server_version(self, conn) -> str:
+        """Version string of the server"""
+        cursor = conn.cursor()
+        cursor.execute("SELECT version()")
+        return cursor.fetchone()[0]
+
+    def user_tables(self, conn) -> List[Tuple[str, str]]:
+        """(schema, table) pairs of all user tables, system schemas excluded"""
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT 
+                table_schema,
+                table_name
+            FROM information_schema.tables
+            WHERE table_type = 'BASE TABLE'
+                AND table_schema NOT IN ('pg_catalog', 'information_schema')
+            ORDER BY table_schema, table_name
+        """)
+        return [(row[0], row[1]) for row in cursor.fetchall()]
+
+    def table_cursor(self, conn, batch_size: int):
+        """Cursor for reading a whole table in fetchmany batches
+
+        A named cursor keeps the result set on the server; only one batch at
+        a time is transferred to the client.
+        """
+        cursor = conn.cursor(name='baseline_table_data')
+        cursor.itersize = batch_size
+        return cursor
+
+    def quote_table(self, schema: str, table_name: str) -> str:
+        """Quote a schema-qualified table name"""
+        return f'"{schema}"."{table_name}"'
+
+    def quote_column(self, column: str) -> str:
+        """Quote a column name"""
+        return f'"{column}"'
+
+    def table_sample_clause(self, percent: float) -> str:
+        """TABLESAMPLE clause reading about percent of a table's pages (after the table alias)"""
+        return f"TABLESAMPLE SYSTEM ({float(percent)})"
+
+    def get_primary_key(self, conn, schema: str, table_name: str) -> List[Tuple[str, str]]:
+        """Get (column, data type) pairs of the primary key in key order"""
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT kcu.column_name, c.data_type
+            FROM information_schema.table_constraints AS tc
+            JOIN information_schema.key_column_usage AS kcu
+                ON tc.constraint_name = kcu.constraint_name
+                AND tc.table_schema = kcu.table_schema
+                AND tc.table_name = kcu.table_name
+            JOIN information_schema.columns AS c
+                ON c.table_schema = kcu.table_schema
+                AND c.table_name = kcu.table_name
+                AND c.column_name = kcu.column_name
+            WHERE tc.constraint_type = 'PRIMARY KEY'
+                AND tc.table_schema = %s
+                AND tc.table_name = %s
+            ORDER BY kcu.ordinal_position
+        """, (schema, table_name))
+        return [(row[0], row[1]) for row in cursor.fetchall()]
+
+    def range_key(self, conn, schema: str, table_name: str,
+                  catalog: Optional[CatalogSnapshot] = None) -> Optional[str]:
+        """Return the column usable for key-range hashing, if any
+
+        Only single-column integer primary keys are split into ranges; other
+        tables are hashed as a single range. With a catalog snapshot the key
+        is looked up there instead of queried.
+        """
+        if catalog is not None:
+            primary_key = catalog.primary_key(schema, table_name)
+        else:
+            primary_key = self.get_primary_key(conn, schema, table_name)
+        if len(primary_key) == 1 and primary_key[0][1].lower() in INTEGER_KEY_TYPES:
+            return primary_key[0][0]
+        return None
+
+    def load_catalog(self, conn) -> CatalogSnapshot:
+        """Read columns, primary keys, foreign keys and indexes of all tables
+
+        One query per kind of object for the whole database, grouped by
+        (schema, table) in the returned snapshot.
+        """
+        catalog = CatalogSnapshot()
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            SELECT 
+                c.table_schema,
+                c.table_name,
+                c.column_name,
+                c.data_type,
+                c.character_maximum_length,
+                c.is_nullable,
+                c.column_default
+            FROM information_schema.columns AS c
+            JOIN information_schema.tables AS t
+                ON c.table_schema = t.table_schema AND c.table_name = t.table_name
+            WHERE t.table_type = 'BASE TABLE'
+                AND c.table_schema NOT IN ('pg_catalog', 'information_schema')
+            ORDER BY c.table_schema, c.table_name, c.ordinal_position
+        """)
+        for row in cursor.fetchall():
+            catalog.add_column(row[0], row[1], {
+                'name': row[2],
+                'type': row[3],
+                'max_length': row[4],
+                'nullable': row[5],
+                'default': row[6]
+            })
+
+        cursor.execute("""
+            SELECT kcu.table_schema, kcu.table_name, kcu.column_name, c.data_type
+            FROM information_schema.table_constraints AS tc
+            JOIN information_schema.key_column_usage AS kcu
+                ON tc.constraint_name = kcu.constraint_name
+                AND tc.table_schema = kcu.table_schema
+                AND tc.table_name = kcu.table_name
+            JOIN information_schema.columns AS c
+                ON c.table_schema = kcu.table_schema
+                AND c.table_name = kcu.table_name
+                AND c.column_name = kcu.column_name
+            WHERE tc.constraint_type = 'PRIMARY KEY'
+            ORDER BY kcu.table_schema, kcu.table_name, kcu.ordinal_position
+        """)
+        for row in cursor.fetchall():
+            catalog.add_primary_key_column(row[0], row[1], row[2], row[3])
+
+        cursor.execute("""
+            SELECT 
+                tc.table_schema,
+                tc.constraint_name,
+                kcu.table_name AS parent_table,
+                kcu.column_name AS parent_column,
+                ccu.table_schema AS referenced_schema,
+                ccu.table_name AS referenced_table,
+                ccu.column_name AS referenced_column
+            FROM information_schema.table_constraints AS tc
+            JOIN information_schema.key_column_usage AS kcu
+                ON tc.constraint_name = kcu.constraint_name
+                AND tc.table_schema = kcu.table_schema
+            JOIN information_schema.constraint_column_usage AS ccu
+                ON ccu.constraint_name = tc.constraint_name
+                AND ccu.table_schema = tc.table_schema
+            WHERE tc.constraint_type = 'FOREIGN KEY'
+            ORDER BY tc.table_schema, tc.table_name, tc.constraint_name, kcu.ordinal_position
+        """)
+        for row in cursor.fetchall():
+            catalog.add_foreign_key(row[0], row[2], {
+                'name': row[1],
+                'parent_table': row[2],
+                'parent_column': row[3],
+                'referenced_schema': row[4],
+                'referenced_table': row[5],
+                'referenced_column': row[6]
+            })
+
+        cursor.execute("""
+            SELECT schemaname, tablename, indexname, indexdef
+            FROM pg_indexes
+            WHERE schemaname NOT IN ('pg_catalog', 'information_schema')
+            ORDER BY schemaname, tablename, indexname
+        """)
+        for row in cursor.fetchall():
+            catalog.add_index_column(row[0], row[1], {
+                'name': row[2],
+                'definition': row[3],
+                'is_unique': 'UNIQUE' in row[3].upper(),
+                'is_primary_key': 'PRIMARY KEY' in row[3].upper()
+            })
+
+        return catalog
+
+    def begin_snapshot(self, conn) -> Optional[str]:
+        """Start a REPEATABLE READ, read-only transaction and export its snapshot
+
+        Every later query on conn sees the database as of this point, and
+        connections passed to attach_snapshot with the returned snapshot id
+        see exactly the same data. conn must stay in this transaction (no
+        commit) for as long as other connections need to attach.
+        """
+        conn.rollback()
+        conn.set_session(isolation_level='REPEATABLE READ', readonly=True)
+        cursor = conn.cursor()
+        cursor.execute("SELECT pg_export_snapshot()")
+        return cursor.fetchone()[0]
+
+    def attach_snapshot(self, conn, snapshot_id: Optional[str]):
+        """Make conn read from a snapshot exported by begin_snapshot"""
+        if snapshot_id is None:
+            return
+        conn.rollback()
+        conn.set_session(isolation_level='REPEATABLE READ', readonly=True)
+        cursor = conn.cursor()
+        cursor.execute("SET TRANSACTION SNAPSHOT %s", (snapshot_id,))
+
+    def exact_row_count(self, conn, schema: str, table_name: str) -> int:
+        """Count the rows of a table with COUNT(*)"""
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT COUNT(*) FROM {self.quote_table(schema, table_name)}")
+        return cursor.fetchone()[0]
+
+    def estimated_row_counts(self, conn) -> Dict[Tuple[str, str], int]:
+        """Row counts of all tables from planner statistics
+
+        Uses pg_class.reltuples, which VACUUM and ANALYZE maintain, and
+        falls back to pg_stat_user_tables.n_live_tup for tables that were
+        never analyzed (reltuples is -1 there).
+        """
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT n.nspname, c.relname, c.reltuples, s.n_live_tup
+            FROM pg_class AS c
+            JOIN pg_namespace AS n ON n.oid = c.relnamespace
+            LEFT JOIN pg_stat_user_tables AS s ON s.relid = c.oid
+            WHERE c.relkind IN ('r', 'p')
+                AND n.nspname NOT IN ('pg_catalog', 'information_schema')
+        """)
+        counts = {}
+        for schema, table_name, reltuples, live_tuples in cursor.fetchall():
+            if reltuples is not None and reltuples >= 0:
+                counts[(schema, table_name)] = int(round(reltuples))
+            elif live_tuples is not None:
+                counts[(schema, table_name)] = int(live_tuples)
+        return counts
+
+    def key_window_clause(self, key_column: str, low: int, high: int) -> Tuple[str, tuple]:
+        """WHERE clause and parameters selecting low <= key < high"""
+        column = self.quote_column(key_column)
+        return f"{column} >= %s AND {column} < %s", (low, high)
+    
+    def keyset_page_query(self, schema: str, table_name: str, key_columns: List[str], page_size: int,
+                          after: Optional[tuple] = None, where: Optional[str] = None,
+                          params: tuple = ()) -> Tuple[str, tuple]:
+        """SELECT for the next page of at most page_size rows in key order
+
+        after is the key of the last row of the previous page, compared as a
+        row value so composite keys use the primary key index.
+        """
+        conditions, page_params = [], list(params)
+        if where:
+            conditions.append(f"({where})")
+        key_list = ", ".join(self.quote_column(column) for column in key_columns)
+        if after is not None:
+            placeholders = ", ".join("%s" for _ in key_columns)
+            conditions.append(f"({key_list}) > ({placeholders})")
+            page_params.extend(after)
+        where_sql = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return (f"SELECT * FROM {self.quote_table(schema, table_name)}{where_sql} "
+                f"ORDER BY {key_list} LIMIT {int(page_size)}", tuple(page_params))
+    
+    def key_range_clause(self, key_column: str, bucket: int, range_size: int) -> Tuple[str, tuple]:
+        """WHERE clause and parameters selecting the rows of one key range"""
+        low, high = bucket_bounds(bucket, range_size)
+        return self.key_window_clause(key_column, low, high)
+    
+    def key_bounds(self, conn, schema: str, table_name: str, key_column: str) -> Optional[Tuple[int, int]]:
+        """Smallest and largest key value, or None for an empty table"""
+        column = self.quote_column(key_column)
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT MIN({column}), MAX({column}) FROM {self.quote_table(schema, table_name)}")
+        low, high = cursor.fetchone()
+        if low is None:
+            return None
+        return int(low), int(high)
+
+    def range_hashes(self, conn, schema: str, table_name: str, key_column: Optional[str],
+                     range_size: int, low: Optional[int] = None,
+                     high: Optional[int] = None) -> Dict[int, Tuple[int, str]]:
+        """Compute per-key-range row counts and aggregate hashes on the server
+
+        Returns {bucket: (row_count, hash)} where bucket is key / range_size
+        (truncated toward zero). When low and high are given, only keys in
+        [low, high) are hashed and buckets are (key - low) / range_size.
+        Without a key column the whole table is one bucket. Each row is hashed with md5 of its text form and two 60-bit
+        slices of the digests are summed, so the aggregate needs no sort and
+        no per-group buffer on the server.
+        """
+        table = self.quote_table(schema, table_name)
+        where_sql, params = "", ()
+        if key_column and low is not None:
+            bucket_expr = f"(t.{self.quote_column(key_column)} - {int(low)}) / {int(range_size)}"
+            where, params = self.key_window_clause(key_column, low, high)
+            where_sql = f" WHERE {where}"
+        elif key_column:
+            bucket_expr = f"t.{self.quote_column(key_column)} / {int(range_size)}"
+        else:
+            bucket_expr = "0"
+
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT
+                bucket,
+                count(*),
+                sum(('x' || substr(row_hash, 1, 15))::bit(60)::bigint),
+                sum(('x' || substr(row_hash, 16, 15))::bit(60)::bigint)
+            FROM (
+                SELECT {bucket_expr} AS bucket, md5(t::text) AS row_hash
+                FROM {table} AS t{where_sql}
+            ) AS hashed
+            GROUP BY bucket
+        """, params)
+
+        return {
+            int(row[0]): (int(row[1]), f"{int(row[2])}:{int(row[3])}")
+            for row in cursor.fetchall()
+        }
@@ -17,6 +17,13 @@ from random import choice, randint, random, sample
 import psycopg2
 from psycopg2 import sql
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / 'test_data'))
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / 'shared'))
+from bulk_load import BulkLoader
+from fast_reset import restore_template, truncate_tables
+from scale_factor import SCALE_FACTOR_ROWS
+from scaling import DEFAULT_SKEW, ZipfChooser, scaled_rows
+
 # Optional imports for graphing
 try:
     import matplotlib.pyplot as plt
@@ -138,42 +145,42 @@ def get_connection(conn_params):
         return None
 
 def cleanup_database(conn_params):
-    """Clean all records from PetClinic tables"""
+    """Clean all records from PetClinic tables with one TRUNCATE (see test_data/fast_reset.py)"""
     conn = get_connection(conn_params)
     if not conn:
         return False
     
     try:
-        cursor = conn.cursor()
-        
-        # Delete in proper order (respecting foreign keys)
-        tables_order = [
-            'visits',
-            'vet_specialties',
-            'pets',
-            'owners',
-            'vets',
-            'specialties',
-            'types'
-        ]
-        
-        total_deleted = 0
-        for table in tables_order:
-            cursor.execute(f"DELETE FROM {table}")
-            deleted = cursor.rowcount
-            total_deleted += deleted
-            print(f"  Cleaned {table}: {deleted} records")
+        # One statement for all tables, sequences restarted
+        tables = ['visits', 'vet_specialties', 'pets', 'owners', 'vets', 'specialties', 'types']
+        truncate_tables(conn, tables, schema=None)
+        for table in tables:
+            print(f"  Cleaned {table}")
         
-        conn.commit()
-        print_color(f"\n  ✓ Cleanup complete: {total_deleted} total records removed", Colors.GREEN)
+        print_color(f"\n  ✓ Cleanup complete: {len(tables)} tables truncated", Colors.GREEN)
         return True
         
     except psycopg2.Error as e:
-        conn.rollback()
         print_color(f"  ✗ Cleanup error: {e}", Colors.RED)
         return False
     finally:
-        cursor.close()
+        conn.close()
+
+def restore_database(conn_params, template):
+    """Re-create the database from a template saved with populate_test_data.py --save-template"""
+    conn = get_connection(dict(conn_params, database='postgres'))
+    if not conn:
+        return False
+    
+    try:
+        restore_template(conn, conn_params['database'], template)
+        print_color(f"  ✓ Re-created {conn_params['database']} from template {template}", Colors.GREEN)
+        return True
+        
+    except (psycopg2.Error, ValueError) as e:
+        print_color(f"  ✗ Restore error: {e}", Colors.RED)
+        return False
+    finally:
         conn.close()
 
 # Sample data for seeding
@@ -273,28 +280,19 @@ def seed_owners(conn_params, count=1000):
     try:
         cursor = conn.cursor()
         
-        batch_size = 100
-        for i in range(0, count, batch_size):
-            batch = min(batch_size, count - i)
-            values = []
-            
-            for _ in range(batch):
+        def owners():
+            for _ in range(count):
                 first_name = choice(FIRST_NAMES)
                 last_name = choice(LAST_NAMES)
                 address = f"{randint(100, 9999)} {choice(STREET_NAMES)}"
                 city = choice(CITIES)
                 phone = f"{randint(100, 999)}{randint(100, 999)}{randint(1000, 9999)}"
-                
-                values.append((first_name, last_name, address, city, phone))
-            
-            cursor.executemany(
-                """INSERT INTO owners (first_name, last_name, address, city, telephone) 
-                   VALUES (%s, %s, %s, %s, %s)""",
-                values
-            )
-            
-            if (i + batch) % 100 == 0:
-                print(f"  Inserted {i + batch}/{count} owners...")
+                yield (first_name, last_name, address, city, phone)
+        
+        # COPY in batches instead of one INSERT round trip per row
+        loader = BulkLoader(conn, schema=None,
+                            progress=lambda loaded: print(f"  Inserted {loaded}/{count} owners..."))
+        loader.copy('owners', ['first_name', 'last_name', 'address', 'city', 'telephone'], owners())
         
         conn.commit()
         print_color(f"  ✓ Seeded {count} owners", Colors.GREEN)
@@ -308,8 +306,8 @@ def seed_owners(conn_params, count=1000):
         cursor.close()
         conn.close()
 
-def seed_pets(conn_params, count=2000):
-    """Seed pets (linked to owners)"""
+def seed_pets(conn_params, count=2000, skew=0.0):
+    """Seed pets (linked to owners, Zipf-skewed pets per owner)"""
     conn = get_connection(conn_params)
     if not conn:
         return False
@@ -328,27 +326,17 @@ def seed_pets(conn_params, count=2000):
             print_color("  ✗ No owners or types found. Please seed owners and types first.", Colors.RED)
             return False
         
-        batch_size = 100
-        for i in range(0, count, batch_size):
-            batch = min(batch_size, count - i)
-            values = []
-            
-            for _ in range(batch):
+        choose_owner = ZipfChooser(owner_ids, skew).choose
+        
+        def pets():
+            for _ in range(count):
                 name = choice(PET_NAMES)
                 birth_date = f"20{randint(10, 23):02d}-{randint(1, 12):02d}-{randint(1, 28):02d}"
-                type_id = choice(type_ids)
-                owner_id = choice(owner_ids)
-                
-                values.append((name, birth_date, type_id, owner_id))
-            
-            cursor.executemany(
-                """INSERT INTO pets (name, birth_date, type_id, owner_id) 
-                   VALUES (%s, %s, %s, %s)""",
-                values
-            )
-            
-            if (i + batch) % 200 == 0:
-                print(f"  Inserted {i + batch}/{count} pets...")
+                yield (name, birth_date, choice(type_ids), choose_owner())
+        
+        loader = BulkLoader(conn, schema=None,
+                            progress=lambda loaded: print(f"  Inserted {loaded}/{count} pets..."))
+        loader.copy('pets', ['name', 'birth_date', 'type_id', 'owner_id'], pets())
         
         conn.commit()
         print_color(f"  ✓ Seeded {count} pets", Colors.GREEN)
@@ -440,8 +428,8 @@ def seed_vet_specialties(conn_params):
         cursor.close()
         conn.close()
 
-def seed_visits(conn_params, count=5000):
-    """Seed pet visits"""
+def seed_visits(conn_params, count=5000, skew=0.0):
+    """Seed pet visits (Zipf-skewed visits per pet)"""
     conn = get_connection(conn_params)
     if not conn:
         return False
@@ -463,26 +451,16 @@ def seed_visits(conn_params, count=5000):
             'Follow-up examination', 'Routine care'
         ]
         
-        batch_size = 200
-        for i in range(0, count, batch_size):
-            batch = min(batch_size, count - i)
-            values = []
-            
-            for _ in range(batch):
-                pet_id = choice(pet_ids)
+        choose_pet = ZipfChooser(pet_ids, skew).choose
+        
+        def visits():
+            for _ in range(count):
                 visit_date = f"20{randint(20, 24):02d}-{randint(1, 12):02d}-{randint(1, 28):02d}"
-                description = choice(descriptions)
-                
-                values.append((pet_id, visit_date, description))
-            
-            cursor.executemany(
-                """INSERT INTO visits (pet_id, visit_date, description) 
-                   VALUES (%s, %s, %s)""",
-                values
-            )
-            
-            if (i + batch) % 500 == 0:
-                print(f"  Inserted {i + batch}/{count} visits...")
+                yield (choose_pet(), visit_date, choice(descriptions))
+        
+        loader = BulkLoader(conn, schema=None,
+                            progress=lambda loaded: print(f"  Inserted {loaded}/{count} visits..."))
+        loader.copy('visits', ['pet_id', 'visit_date', 'description'], visits())
         
         conn.commit()
         print_color(f"  ✓ Seeded {count} visits", Colors.GREEN)
@@ -496,19 +474,29 @@ def seed_visits(conn_params, count=5000):
         cursor.close()
         conn.close()
 
-def seed_all_tables(conn_params):
-    """Seed all PetClinic tables with test data"""
+def seed_all_tables(conn_params, scale_factor=None, skew=0.0):
+    """Seed all PetClinic tables with test data
+    
+    With a scale factor the tables are sized from it (see
+    test_data/scale_factor.py and shared/scaling.py); otherwise the fixed default sizes are used.
+    """
     print_header("Seeding Database with Test Data")
     
+    if scale_factor:
+        counts = scaled_rows(SCALE_FACTOR_ROWS, scale_factor)
+        print(f"Scale factor: {scale_factor} (skew {skew})")
+    else:
+        counts = {'owners': 1000, 'pets': 2000, 'vets': 50, 'visits': 5000}
+    
     # Seed in correct order (respecting foreign keys)
     steps = [
         ("Types", lambda: seed_types(conn_params, 6)),
         ("Specialties", lambda: seed_specialties(conn_params, 6)),
-        ("Owners", lambda: seed_owners(conn_params, 1000)),
-        ("Pets", lambda: seed_pets(conn_params, 2000)),
-        ("Vets", lambda: seed_vets(conn_params, 50)),
+        ("Owners", lambda: seed_owners(conn_params, counts['owners'])),
+        ("Pets", lambda: seed_pets(conn_params, counts['pets'], skew)),
+        ("Vets", lambda: seed_vets(conn_params, counts['vets'])),
         ("Vet Specialties", lambda: seed_vet_specialties(conn_params)),
-        ("Visits", lambda: seed_visits(conn_params, 5000))
+        ("Visits", lambda: seed_visits(conn_params, counts['visits'], skew))
     ]
     
     for name, func in steps:
@@ -808,6 +796,12 @@ Examples:
   # Skip database seeding (reuse existing data)
   python run_and_monitor_db_test.py --env target --no-seed
   
+  # Seed at scale factor 5 with Zipf-skewed pets per owner and visits per pet
+  python run_and_monitor_db_test.py --env target --scale-factor 5
+  
+  # Reset from a template saved by test_data/populate_test_data.py --save-template
+  python run_and_monitor_db_test.py --env target --from-template petclinic_sf10
+  
   # Cleanup only
   python run_and_monitor_db_test.py --env target --cleanup
         """)
@@ -822,10 +816,21 @@ Examples:
                        help='Skip system performance profiling')
     parser.add_argument('--no-seed', action='store_true',
                        help='Skip database seeding')
+    parser.add_argument('--from-template', type=str, default=None, metavar='NAME',
+                       help='Re-create the database from template database NAME instead of cleaning and seeding it')
+    parser.add_argument('--scale-factor', type=float, default=None,
+                       help='Seed tables sized from a scale factor (1 = 10,000 owners, 20,000 pets, '
+                            '500 vets, 50,000 visits) instead of the fixed sizes')
+    parser.add_argument('--skew', type=float, default=None,
+                       help=f'Zipf exponent of pets per owner and visits per pet; 0 is uniform '
+                            f'(default: {DEFAULT_SKEW} with --scale-factor, otherwise 0)')
     parser.add_argument('--timeout', type=int, default=1800,
                        help='JMeter test timeout in seconds (default: 1800)')
     
     args = parser.parse_args()
+    if args.scale_factor is not None and args.scale_factor <= 0:
+        parser.error("--scale-factor must be positive")
+    skew = args.skew if args.skew is not None else (DEFAULT_SKEW if args.scale_factor else 0.0)
     
     # Load from configuration file
     conn_params, database_name = get_connection_from_config(
@@ -861,9 +866,14 @@ Examples:
         sys.exit(1)
     print()
     
-    # Step 2: Cleanup
-    print_header("[Step 2/7] Cleaning Database")
-    cleanup_database(conn_params)
+    # Step 2: Cleanup, or re-create from a template that already holds the test data
+    if args.from_template:
+        print_header("[Step 2/7] Re-creating Database from Template")
+        if not restore_database(conn_params, args.from_template):
+            sys.exit(1)
+    else:
+        print_header("[Step 2/7] Cleaning Database")
+        cleanup_database(conn_params)
     print()
     
     # Step 2.5: Validate Database Constraints
@@ -889,10 +899,10 @@ Examples:
         print_color(f"⚠️  Could not run database validation: {e}", Colors.YELLOW)
     print()
     
-    # Step 3: Seeding (unless skipped)
-    if not args.no_seed:
+    # Step 3: Seeding (unless skipped or re-created from a template)
+    if not args.no_seed and not args.from_template:
         print_header("[Step 3/7] Seeding Database")        
-        if not seed_all_tables(conn_params):
+        if not seed_all_tables(conn_params, args.scale_factor, skew):
             print_color("\nDatabase seeding failed. Exiting.", Colors.RED)
             sys.exit(1)
     
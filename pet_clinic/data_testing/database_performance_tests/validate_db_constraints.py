@@ -12,6 +12,11 @@ from pathlib import Path
 import psycopg2
 from psycopg2 import sql
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'data_integrity_tests'))
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / 'shared'))
+from db_dialect import PostgresDialect
+from referential_integrity import ReferentialIntegrityChecker, foreign_key_checks
+
 # Load database configuration
 def load_db_config():
     """Load database configuration from db_config.json"""
@@ -25,46 +30,22 @@ def load_db_config():
         return json.load(f)
 
 def check_foreign_key_constraints(conn):
-    """Check and report foreign key constraint violations"""
+    """Check and report foreign key constraint violations
+    
+    Every foreign key declared in the catalog is checked for orphaned rows
+    in a single UNION ALL statement (see referential_integrity.py).
+    """
     issues = []
+    dialect = PostgresDialect()
+    checks = foreign_key_checks(dialect.load_catalog(conn))
+    checker = ReferentialIntegrityChecker(dialect, None, mode='batch')
     
-    with conn.cursor() as cur:
-        # Check for pets with non-existent owners
-        cur.execute("""
-            SELECT COUNT(*) as orphaned_pets 
-            FROM pets p 
-            LEFT JOIN owners o ON p.owner_id = o.id 
-            WHERE o.id IS NULL
-        """)
-        orphaned_pets = cur.fetchone()[0]
-        
-        if orphaned_pets > 0:
-            issues.append(f"🔴 Found {orphaned_pets} pets with non-existent owners")
-        
-        # Check for visits with non-existent pets
-        cur.execute("""
-            SELECT COUNT(*) as orphaned_visits 
-            FROM visits v 
-            LEFT JOIN pets p ON v.pet_id = p.id 
-            WHERE p.id IS NULL
-        """)
-        orphaned_visits = cur.fetchone()[0]
-        
-        if orphaned_visits > 0:
-            issues.append(f"🔴 Found {orphaned_visits} visits with non-existent pets")
-        
-        # Check for pets with non-existent types
-        cur.execute("""
-            SELECT COUNT(*) as pets_invalid_types 
-            FROM pets p 
-            LEFT JOIN types t ON p.type_id = t.id 
-            WHERE t.id IS NULL
-        """)
-        pets_invalid_types = cur.fetchone()[0]
-        
-        if pets_invalid_types > 0:
-            issues.append(f"🔴 Found {pets_invalid_types} pets with non-existent types")
+    for result in checker.run(checks, conn):
+        if not result.is_clean:
+            issues.append(f"🔴 Found {result.orphans} {result.check.table_name} rows with non-existent "
+                          f"{result.check.referenced_table} ({', '.join(result.check.columns)})")
     
+    print(f"🔍 Checked {len(checks)} foreign keys for orphaned rows in {checker.seconds:.2f}s")
     return issues
 
 def cleanup_test_data(conn):
@@ -4,8 +4,13 @@ Query database tables from PetClinic PostgreSQL database
 import psycopg2
 import json
 import argparse
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'data_integrity_tests'))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'shared'))
+from db_dialect import PostgresDialect
+
 def load_config(config_path="db_config.json", env_name="target"):
     """Load database configuration from JSON file"""
     with open(config_path, 'r') as f:
@@ -66,33 +71,24 @@ def query_tables(env_name="target", config_path="db_config.json"):
         print("Getting detailed column information for each table...")
         print("="*70 + "\n")
         
+        # Columns of all tables in one pass over the catalog
+        catalog = PostgresDialect().load_catalog(conn)
+        
         for row in tables:
             schema = row[0]
             table = row[1]
             
-            # Get columns for this table (PostgreSQL version)
-            cursor.execute("""
-                SELECT 
-                    column_name,
-                    data_type,
-                    character_maximum_length,
-                    is_nullable,
-                    column_default
-                FROM information_schema.columns
-                WHERE table_schema = %s AND table_name = %s
-                ORDER BY ordinal_position
-            """, (schema, table))
-            
-            columns = cursor.fetchall()
+            # Columns come from the catalog snapshot
+            columns = catalog.columns(schema, table)
             
             print(f"\n{schema}.{table}")
             print("-" * 70)
             for col in columns:
-                col_name = col[0]
-                data_type = col[1]
-                max_len = f"({col[2]})" if col[2] else ""
-                nullable = "NULL" if col[3] == "YES" else "NOT NULL"
-                default = f" DEFAULT {col[4]}" if col[4] else ""
+                col_name = col['name']
+                data_type = col['type']
+                max_len = f"({col['max_length']})" if col['max_length'] else ""
+                nullable = "NULL" if col['nullable'] == "YES" else "NOT NULL"
+                default = f" DEFAULT {col['default']}" if col['default'] else ""
                 print(f"  {col_name:<30} {data_type}{max_len:<15} {nullable}{default}")
         
         # Get row counts
@@ -4,8 +4,13 @@ Check database schema structure
 import psycopg2
 import json
 import argparse
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'data_testing' / 'data_integrity_tests'))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'shared'))
+from db_dialect import PostgresDialect
+
 def load_config(config_path="../db_config.json", env_name="target"):
     """Load database configuration from JSON file"""
     with open(config_path, 'r') as f:
@@ -35,28 +40,23 @@ def check_schema(env_name="target", config_path="../db_config.json"):
         print(f"{'='*70}\n")
         
         conn = get_connection(env_config)
-        cursor = conn.cursor()
+
+        # Columns of all tables in one pass over the catalog
+        catalog = PostgresDialect().load_catalog(conn)
 
         tables = ['types', 'specialties', 'owners', 'vets', 'vet_specialties', 'pets', 'visits']
 
         for table_name in tables:
             print(f"\n=== {table_name} Table Structure ===")
-            cursor.execute("""
-                SELECT column_name, data_type, is_nullable, character_maximum_length
-                FROM information_schema.columns
-                WHERE table_schema = 'petclinic' AND table_name = %s
-                ORDER BY ordinal_position
-            """, (table_name,))
-            
-            rows = cursor.fetchall()
+            rows = catalog.columns('petclinic', table_name)
             if rows:
                 print(f"  {'Column Name':<30} {'Data Type':<15} {'Nullable':<10} {'Max Length'}")
                 print(f"  {'-'*30} {'-'*15} {'-'*10} {'-'*10}")
                 for row in rows:
-                    col_name = row[0]
-                    data_type = row[1]
-                    nullable = row[2]
-                    max_len = row[3] if row[3] else "N/A"
+                    col_name = row['name']
+                    data_type = row['type']
+                    nullable = row['nullable']
+                    max_len = row['max_length'] if row['max_length'] else "N/A"
                     print(f"  {col_name:<30} {data_type:<15} {nullable:<10} {max_len}")
             else:
                 print(f"  ⚠ Table '{table_name}' not found or has no columns")
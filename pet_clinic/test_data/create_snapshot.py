@@ -1,13 +1,27 @@
 """
 Create snapshot of PetClinic PostgreSQL database
 Saves all data to a JSON file for backup and restoration
+
+The snapshot is a baseline in the format of create_baseline.py (see
+shared/baseline_engine.py at the repository root), limited to the
+petclinic tables in restore order, so verify_migration.py and
+populate_test_data.py read it like any other baseline.
 """
 import psycopg2
 import json
 import argparse
-from datetime import datetime, date
+import logging
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'data_testing' / 'data_integrity_tests'))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'shared'))
+from baseline_engine import BaselineEngine
+from db_dialect import PostgresDialect
+
+# Define table order for restoration (respecting foreign keys)
+TABLE_ORDER = ['types', 'specialties', 'owners', 'vets', 'vet_specialties', 'pets', 'visits']
+
 def load_config(config_path="../db_config.json", env_name="target"):
     """Load database configuration from JSON file"""
     with open(config_path, 'r') as f:
@@ -24,14 +38,35 @@ def get_connection(env_config):
         password=env_config['password']
     )
 
-def json_serial(obj):
-    """JSON serializer for objects not serializable by default json code"""
-    if isinstance(obj, (datetime, date)):
-        return obj.isoformat()
-    raise TypeError(f"Type {type(obj)} not serializable")
+class SnapshotCapture(BaselineEngine):
+    """Baseline engine reading the petclinic schema of one environment"""
+    
+    def __init__(self, env_config, env_name):
+        self.env_config = env_config
+        super().__init__(PostgresDialect(), {
+            'server': env_config['host'],
+            'port': env_config['port'],
+            'database': env_config['database'],
+            'driver': 'PostgreSQL (psycopg2)',
+            'auth_type': f"PostgreSQL Authentication (User: {env_config['username']})",
+            'environment': env_name
+        }, env_name)
+    
+    def connect(self):
+        """Open a psycopg2 connection"""
+        return get_connection(self.env_config)
 
-def create_snapshot(env_name="target", config_path="../../db_config.json", output_file=None):
-    """Create a complete snapshot of the database"""
+def create_snapshot(env_name="target", config_path="../../db_config.json", output_file=None, range_size=None,
+                    workers=1):
+    """Create a complete snapshot of the database
+    
+    When range_size is given, server-side key-range hashes are stored per table
+    for verify_migration.py --pushdown. All tables are read from one
+    REPEATABLE READ snapshot; with workers > 1 they are read concurrently on
+    connections attached to it with SET TRANSACTION SNAPSHOT, so the result
+    is the same point in time as a single-connection read. Row counts and
+    checksums are stored with the rows.
+    """
     try:
         # Load configuration
         env_config = load_config(config_path, env_name)
@@ -44,70 +79,24 @@ def create_snapshot(env_name="target", config_path="../../db_config.json", outpu
         print(f"Host: {env_config['host']}")
         print(f"{'='*70}\n")
         
-        conn = get_connection(env_config)
-        cursor = conn.cursor()
-        
-        snapshot = {
-            'metadata': {
-                'snapshot_date': datetime.now().isoformat(),
-                'database': env_config['database'],
-                'host': env_config['host'],
-                'environment': env_name
-            },
-            'tables': {}
-        }
-        
-        # Define table order for restoration (respecting foreign keys)
-        table_order = ['types', 'specialties', 'owners', 'vets', 'vet_specialties', 'pets', 'visits']
-        
-        for table_name in table_order:
-            print(f"Snapshotting table: {table_name}...")
-            
-            # Get column names
-            cursor.execute("""
-                SELECT column_name
-                FROM information_schema.columns
-                WHERE table_schema = 'petclinic' AND table_name = %s
-                ORDER BY ordinal_position
-            """, (table_name,))
-            
-            columns = [row[0] for row in cursor.fetchall()]
-            
-            # Get all data
-            cursor.execute(f'SELECT * FROM petclinic."{table_name}"')
-            rows = cursor.fetchall()
-            
-            # Convert rows to list of dictionaries
-            table_data = []
-            for row in rows:
-                row_dict = {}
-                for i, col_name in enumerate(columns):
-                    value = row[i]
-                    # Convert to JSON-serializable format
-                    if isinstance(value, (datetime, date)):
-                        row_dict[col_name] = value.isoformat()
-                    else:
-                        row_dict[col_name] = value
-                table_data.append(row_dict)
-            
-            snapshot['tables'][table_name] = {
-                'columns': columns,
-                'row_count': len(table_data),
-                'data': table_data
-            }
-            
-            print(f"  ✓ Captured {len(table_data)} rows from {table_name}")
+        capture = SnapshotCapture(env_config, env_name)
+        capture.create_baseline(tables=[('petclinic', table_name) for table_name in TABLE_ORDER],
+                                range_size=range_size, workers=workers)
+        snapshot = capture.baseline_data
         
-        conn.close()
+        for table_name in TABLE_ORDER:
+            full_table = f"petclinic.{table_name}"
+            print(f"  ✓ Captured {snapshot['row_counts'][full_table]} rows from {table_name}")
+            if full_table in snapshot['range_hashes']:
+                print(f"  ✓ Stored {len(snapshot['range_hashes'][full_table]['ranges'])} range hash(es) "
+                      f"for {table_name}")
         
         # Generate output filename if not provided
         if output_file is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_file = f"../petclinic_snapshot_{env_name}_{timestamp}.json"
+            output_file = f"../petclinic_snapshot_{env_name}_{capture.timestamp}.json"
         
         # Save to file
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(snapshot, f, indent=2, ensure_ascii=False, default=json_serial)
+        capture.save_baseline(output_file)
         
         print(f"\n{'='*70}")
         print(f"Snapshot saved successfully!")
@@ -115,7 +104,7 @@ def create_snapshot(env_name="target", config_path="../../db_config.json", outpu
         print(f"File: {output_file}")
         print(f"Size: {Path(output_file).stat().st_size:,} bytes")
         print(f"Total tables: {len(snapshot['tables'])}")
-        print(f"Total rows: {sum(t['row_count'] for t in snapshot['tables'].values())}")
+        print(f"Total rows: {sum(snapshot['row_counts'].values())}")
         print(f"{'='*70}\n")
         
         return output_file
@@ -135,6 +124,14 @@ if __name__ == "__main__":
                         help='Path to config file (default: ../db_config.json)')
     parser.add_argument('--output', type=str, default=None,
                         help='Output file name (default: auto-generated with timestamp)')
+    parser.add_argument('--pushdown', action='store_true',
+                        help='Also store server-side key-range hashes for verify_migration.py --pushdown')
+    parser.add_argument('--range-size', type=int, default=1000,
+                        help='Primary-key values per hashed range with --pushdown (default: 1000)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Read tables concurrently on this many connections sharing one snapshot (default: 1)')
     
     args = parser.parse_args()
-    create_snapshot(args.env, args.config, args.output)
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    create_snapshot(args.env, args.config, args.output,
+                    range_size=args.range_size if args.pushdown else None, workers=args.workers)
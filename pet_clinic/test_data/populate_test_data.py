@@ -16,6 +16,16 @@ import argparse
 import json
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'data_testing' / 'data_integrity_tests'))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'shared'))
+from baseline_store import load_baseline_file
+from bulk_load import DEFAULT_BATCH_SIZE, BulkLoader
+from fast_reset import restore_template, save_template, truncate_tables
+from parallel_load import PartitionScheduler, partitions
+from scale_factor import SCALE_FACTOR_ROWS
+from scaling import DEFAULT_SKEW, scaled_rows, zipf_fanout
+from vector_columns import NUMPY_AVAILABLE, ColumnGenerator, VectorZipf, join, to_rows
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -54,14 +64,53 @@ def get_connection(env_config: dict):
     )
 
 
+# Populator and connection of a worker process (see populate_parallel)
+_worker = {}
+
+
+def _init_worker(populator):
+    """Open the connection of a worker process and reseed its random generators"""
+    random.seed()
+    if populator.columns:
+        populator.columns = ColumnGenerator()
+    _worker['populator'] = populator
+    _worker['conn'] = populator.get_connection()
+
+
+def _load_owners(first_row: int, count: int):
+    return _worker['populator'].populate_owners(_worker['conn'], count, first_row)
+
+
+def _load_pets(type_ids: list, count: int, owner_ids: list):
+    return _worker['populator'].populate_pets(_worker['conn'], owner_ids, type_ids, count)
+
+
+def _load_visits(count: int, pet_ids: list):
+    return _worker['populator'].populate_visits(_worker['conn'], pet_ids, count)
+
+
+def _load_vets(count: int):
+    return _worker['populator'].populate_vets(_worker['conn'], count)
+
+
 class PetClinicDataPopulator:
     """Manages test data population for PetClinic database"""
     
-    def __init__(self, env_name: str, config_path: str, snapshot_file: str = None, additional_records: int = 0):
+    def __init__(self, env_name: str, config_path: str, snapshot_file: str = None, additional_records: int = 0,
+                 batch_size: int = DEFAULT_BATCH_SIZE, scale_factor: float = None, skew: float = 0.0,
+                 vectorized: bool = NUMPY_AVAILABLE, workers: int = 1):
         self.env_name = env_name
         self.config_path = config_path
         self.snapshot_file = snapshot_file
         self.additional_records = additional_records
+        self.batch_size = batch_size
+        self.scale_factor = scale_factor
+        self.skew = skew
+        self.workers = workers
+        # Sized from the scale factor (see scale_factor.py), otherwise from additional_records
+        self.table_counts = scaled_rows(SCALE_FACTOR_ROWS, scale_factor) if scale_factor else None
+        # Whole columns per batch with NumPy, otherwise one row at a time
+        self.columns = ColumnGenerator() if vectorized else None
         self.timestamp = datetime.now()
         
         # Load config
@@ -96,67 +145,79 @@ class PetClinicDataPopulator:
             logger.error(f"✗ Database connection failed: {e}")
             return False
     
+    def bulk_loader(self, conn, label: str, count: int = None) -> BulkLoader:
+        """Bulk loader for conn that logs progress after each batch (see bulk_load.py)"""
+        def progress(loaded: int):
+            logger.info(f"    Created {loaded}/{count} {label}..." if count else f"    Created {loaded} {label}...")
+        return BulkLoader(conn, 'petclinic', self.batch_size, progress)
+    
+    def vector_batches(self, count: int):
+        """(offset, size) of each batch of count rows generated as columns (see vector_columns.py)"""
+        for offset in range(0, count, self.batch_size):
+            yield offset, min(self.batch_size, count - offset)
+    
     def clear_database(self):
-        """Clear all records from all tables"""
+        """Clear all records from all tables and restart their sequences, in one statement (see fast_reset.py)"""
         logger.info("\n" + "="*70)
         logger.info("CLEARING ALL RECORDS FROM DATABASE")
         logger.info("="*70)
         
         conn = self.get_connection()
-        cursor = conn.cursor()
         
         try:
-            # Order: delete child tables first to respect foreign keys
-            tables_order = ['visits', 'pets', 'vet_specialties', 'vets', 'owners', 'specialties', 'types']
-            
-            logger.info(f"Found {len(tables_order)} tables to clear\n")
-            
-            for table_name in tables_order:
-                try:
-                    # Get current row count
-                    cursor.execute(f'SELECT COUNT(*) FROM petclinic."{table_name}"')
-                    count = cursor.fetchone()[0]
-                    
-                    if count > 0:
-                        # Delete all records
-                        cursor.execute(f'DELETE FROM petclinic."{table_name}"')
-                        conn.commit()
-                        logger.info(f"  ✓ Deleted {count:>5} rows from {table_name}")
-                    else:
-                        logger.info(f"  • Skipped {table_name} (already empty)")
-                        
-                except Exception as e:
-                    logger.warning(f"  ✗ Could not delete from {table_name}: {e}")
-                    conn.rollback()
+            # One TRUNCATE for all tables, so foreign key order does not matter
+            tables = ['visits', 'pets', 'vet_specialties', 'vets', 'owners', 'specialties', 'types']
+            truncate_tables(conn, tables)
+            logger.info(f"  ✓ Truncated {len(tables)} tables: {', '.join(tables)} (sequences restarted)")
             
             logger.info("="*70)
             logger.info("✓ All records cleared successfully")
             logger.info("="*70)
             
         except Exception as e:
-            logger.error(f"Error during deletion: {e}")
-            conn.rollback()
+            logger.error(f"Error during deletion (no records deleted): {e}")
             raise
         finally:
             conn.close()
     
+    def maintenance_connection(self, database: str = 'postgres'):
+        """Connection to another database of the server, for copying this one"""
+        return get_connection(dict(self.env_config, database=database))
+    
+    def save_as_template(self, template: str):
+        """Save the populated database as template database template"""
+        conn = self.maintenance_connection()
+        try:
+            save_template(conn, self.env_config['database'], template)
+            logger.info(f"✓ Saved {self.env_config['database']} as template database {template}")
+        finally:
+            conn.close()
+    
+    def restore_from_template(self, template: str):
+        """Re-create the database from a template saved by save_as_template"""
+        conn = self.maintenance_connection()
+        try:
+            restore_template(conn, self.env_config['database'], template)
+            logger.info(f"✓ Re-created {self.env_config['database']} from template database {template}")
+        finally:
+            conn.close()
+    
     def load_snapshot_data(self):
-        """Load data from snapshot JSON file"""
+        """Load data from a snapshot or baseline file (see baseline_store.py)"""
         logger.info("\n" + "="*70)
         logger.info("LOADING BASELINE DATA FROM SNAPSHOT")
         logger.info("="*70)
         
         # Load snapshot file
         try:
-            with open(self.snapshot_file, 'r', encoding='utf-8') as f:
-                snapshot = json.load(f)
+            snapshot = load_baseline_file(self.snapshot_file, snapshot_schema='petclinic')
             logger.info(f"Loaded snapshot from: {self.snapshot_file}")
-            logger.info(f"Snapshot date: {snapshot['metadata']['snapshot_date']}")
+            logger.info(f"Snapshot date: {snapshot['timestamp']}")
         except FileNotFoundError:
             logger.error(f"Snapshot file not found: {self.snapshot_file}")
             sys.exit(1)
-        except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON in snapshot file: {e}")
+        except (json.JSONDecodeError, ValueError) as e:
+            logger.error(f"Invalid snapshot file: {e}")
             sys.exit(1)
         
         conn = self.get_connection()
@@ -167,18 +228,18 @@ class PetClinicDataPopulator:
             table_order = ['types', 'specialties', 'owners', 'vets', 'vet_specialties', 'pets', 'visits']
             
             for table_name in table_order:
-                if table_name not in snapshot['tables']:
+                full_table = f"petclinic.{table_name}"
+                if full_table not in snapshot['tables']:
                     logger.warning(f"  ⚠ Table {table_name} not found in snapshot")
                     continue
                 
-                table_data = snapshot['tables'][table_name]
-                rows = table_data['data']
+                rows = snapshot['tables'][full_table]
                 
                 if not rows:
                     logger.info(f"  • Skipped {table_name} (no data in snapshot)")
                     continue
                 
-                columns = table_data['columns']
+                columns = [column['name'] for column in snapshot['schema_info'][full_table]]
                 placeholders = ', '.join(['%s'] * len(columns))
                 columns_str = ', '.join([f'"{col}"' for col in columns])
                 
@@ -230,34 +291,22 @@ class PetClinicDataPopulator:
     
     def create_additional_records(self):
         """Create additional test records"""
-        if self.additional_records == 0:
+        if self.additional_records == 0 and not self.table_counts:
             logger.info("\n• No additional records requested")
             return
         
         record_type = "ADDITIONAL" if self.snapshot_file else "NEW"
         logger.info("\n" + "="*70)
-        logger.info(f"CREATING {self.additional_records} {record_type} RECORDS")
+        if self.table_counts:
+            logger.info(f"CREATING {record_type} RECORDS AT SCALE FACTOR {self.scale_factor} (SKEW {self.skew})")
+        else:
+            logger.info(f"CREATING {self.additional_records} {record_type} RECORDS")
         logger.info("="*70)
         
         conn = self.get_connection()
         
         try:
-            # Get current max IDs
             cursor = conn.cursor()
-            cursor.execute('SELECT MAX(id) FROM petclinic.owners')
-            max_owner_id = cursor.fetchone()[0] or 0
-            
-            cursor.execute('SELECT MAX(id) FROM petclinic.types')
-            max_type_id = cursor.fetchone()[0] or 0
-            
-            cursor.execute('SELECT MAX(id) FROM petclinic.pets')
-            max_pet_id = cursor.fetchone()[0] or 0
-            
-            cursor.execute('SELECT MAX(id) FROM petclinic.vets')
-            max_vet_id = cursor.fetchone()[0] or 0
-            
-            cursor.execute('SELECT MAX(id) FROM petclinic.specialties')
-            max_specialty_id = cursor.fetchone()[0] or 0
             
             # Get existing type IDs for pet creation
             cursor.execute('SELECT id FROM petclinic.types')
@@ -274,20 +323,25 @@ class PetClinicDataPopulator:
                     logger.info(f"  ✓ Created pet type: {pet_type} (ID: {type_id})")
                 conn.commit()
             
-            # Create additional owners
-            owner_ids = self.populate_owners(conn, self.additional_records, max_owner_id)
-            
-            # Create additional pets (1-3 pets per owner)
-            self.populate_pets(conn, owner_ids, type_ids, max_pet_id)
-            
-            # Create additional vets
-            vet_ids = self.populate_vets(conn, max(3, self.additional_records // 3), max_vet_id)
+            counts = self.table_counts or {'owners': self.additional_records, 'pets': None,
+                                           'vets': max(3, self.additional_records // 3), 'visits': None}
             
-            # Create additional visits
-            cursor.execute('SELECT id FROM petclinic.pets WHERE id > %s', (max_pet_id,))
-            new_pet_ids = [row[0] for row in cursor.fetchall()]
-            if new_pet_ids:
-                self.populate_visits(conn, new_pet_ids)
+            if self.workers > 1:
+                # Partitions of every table loaded by worker processes
+                self.populate_parallel(counts, type_ids)
+            else:
+                # Create additional owners
+                owner_ids = self.populate_owners(conn, counts['owners'])
+                
+                # Create additional pets (1-3 pets per owner, or Zipf-skewed at a scale factor)
+                new_pet_ids = self.populate_pets(conn, owner_ids, type_ids, counts['pets'])
+                
+                # Create additional vets
+                vet_ids = self.populate_vets(conn, counts['vets'])
+                
+                # Create additional visits
+                if new_pet_ids:
+                    self.populate_visits(conn, new_pet_ids, counts['visits'])
             
             logger.info("="*70)
             logger.info("✓ Additional records created successfully")
@@ -302,10 +356,39 @@ class PetClinicDataPopulator:
         finally:
             conn.close()
     
-    def populate_owners(self, conn, count: int, start_id: int):
-        """Populate owners table with test data"""
-        cursor = conn.cursor()
-        
+    def populate_parallel(self, counts: dict, type_ids: list):
+        """Create owners, pets, vets and visits in partitions on worker processes
+        
+        Pets partition i only references the owners of owners partition i,
+        and visits partition i the pets of pets partition i; each starts as
+        soon as its parent partition is committed. IDs are reserved from the
+        table sequences per batch, so partitions never collide (see
+        bulk_load.py and parallel_load.py). The skew of pets per owner and
+        visits per pet applies within each partition.
+        """
+        parts = max(1, min(self.workers, counts['owners']))
+        logger.info(f"\n• Loading {parts} partitions per table on {self.workers} worker processes...")
+        
+        def child_parts(count):
+            # Without a count every parent gets a random number of children
+            return partitions(count, parts) if count is not None else [(0, None)] * parts
+        
+        scheduler = PartitionScheduler(self.workers, _init_worker, (self,))
+        for index, ((first_owner, owners), (_, pets), (_, visits)) in enumerate(
+                zip(partitions(counts['owners'], parts), child_parts(counts['pets']), child_parts(counts['visits']))):
+            scheduler.add(('owners', index), _load_owners, first_owner, owners)
+            scheduler.add(('pets', index), _load_pets, type_ids, pets, parent=('owners', index))
+            scheduler.add(('visits', index), _load_visits, visits, parent=('pets', index))
+        scheduler.add(('vets', 0), _load_vets, counts['vets'])
+        
+        def committed(key, result):
+            table, index = key
+            logger.info(f"  ✓ {table} partition {index + 1}/{1 if table == 'vets' else parts} committed")
+        
+        scheduler.run(committed)
+    
+    def populate_owners(self, conn, count: int, first_row: int = 0):
+        """Populate owners table with test data (rows first_row onwards when loading a partition)"""
         logger.info(f"\n• Populating owners table with {count} records...")
         
         first_names = ['John', 'Jane', 'Michael', 'Sarah', 'David', 'Emma', 'Robert', 'Lisa', 
@@ -325,85 +408,104 @@ class PetClinicDataPopulator:
         last_names = jmeter_test_names + additional_names
         cities = ['Madison', 'Sun Prairie', 'McFarland', 'Windsor', 'Monona', 'Waunakee', 
                  'Middleton', 'Verona', 'Fitchburg', 'Stoughton']
-        
-        
-        owner_ids = []
+        streets = ['Oak', 'Maple', 'Pine', 'Cedar', 'Elm']
+        street_suffixes = ['St.', 'Ave.', 'Blvd.', 'Rd.', 'Lane']
         
         # Ensure JMeter test names are created first when count is small
-        jmeter_names_to_use = min(count, len(jmeter_test_names))
+        jmeter_names_to_use = max(0, min(count, len(jmeter_test_names) - first_row))
         
-        for i in range(count):
-            first_name = random.choice(first_names)
-            
-            # For the first few owners, use JMeter test names to ensure they exist
-            if i < jmeter_names_to_use:
-                last_name = jmeter_test_names[i]
-                logger.info(f"    Creating owner with JMeter test name: {first_name} {last_name}")
-            else:
-                last_name = random.choice(last_names)
-                
-            address = f"{random.randint(100, 9999)} {random.choice(['Oak', 'Maple', 'Pine', 'Cedar', 'Elm'])} {random.choice(['St.', 'Ave.', 'Blvd.', 'Rd.', 'Lane'])}"
-            city = random.choice(cities)
-            telephone = f"608555{random.randint(1000, 9999)}"
-            
-            try:
-                cursor.execute("""
-                    INSERT INTO petclinic.owners (first_name, last_name, address, city, telephone)
-                    VALUES (%s, %s, %s, %s, %s)
-                    RETURNING id
-                """, (first_name, last_name, address, city, telephone))
+        def owners():
+            for i in range(count):
+                first_name = random.choice(first_names)
                 
-                owner_id = cursor.fetchone()[0]
-                owner_ids.append(owner_id)
-                
-                if (i + 1) % 10 == 0 or i == count - 1:
-                    logger.info(f"    Created {i + 1}/{count} owners...")
+                # For the first few owners, use JMeter test names to ensure they exist
+                if i < jmeter_names_to_use:
+                    last_name = jmeter_test_names[first_row + i]
+                    logger.info(f"    Creating owner with JMeter test name: {first_name} {last_name}")
+                else:
+                    last_name = random.choice(last_names)
                     
-            except Exception as e:
-                logger.error(f"    Error creating owner {i+1}: {e}")
-                raise
+                address = f"{random.randint(100, 9999)} {random.choice(streets)} {random.choice(street_suffixes)}"
+                city = random.choice(cities)
+                telephone = f"608555{random.randint(1000, 9999)}"
+                yield first_name, last_name, address, city, telephone
+        
+        def vector_owners():
+            for offset, size in self.vector_batches(count):
+                first = self.columns.choice(first_names, size)
+                last = self.columns.choice(last_names, size)
+                if offset == 0:
+                    last[:jmeter_names_to_use] = jmeter_test_names[first_row:first_row + jmeter_names_to_use]
+                    for first_name, last_name in zip(first[:jmeter_names_to_use], last[:jmeter_names_to_use]):
+                        logger.info(f"    Creating owner with JMeter test name: {first_name} {last_name}")
+                address = join(self.columns.integers(100, 9999, size).astype(str), ' ',
+                               self.columns.choice(streets, size), ' ', self.columns.choice(street_suffixes, size))
+                telephone = join('608555', self.columns.integers(1000, 9999, size).astype(str))
+                yield from to_rows(first, last, address, self.columns.choice(cities, size), telephone)
+        
+        try:
+            # IDs reserved from owners_id_seq per batch, rows loaded with COPY
+            owner_ids = self.bulk_loader(conn, 'owners', count).copy_returning_ids(
+                'owners', ['first_name', 'last_name', 'address', 'city', 'telephone'],
+                vector_owners() if self.columns else owners())
+        except Exception as e:
+            logger.error(f"    Error creating owners: {e}")
+            raise
         
         conn.commit()
         logger.info(f"  ✓ Created {len(owner_ids)} owners successfully")
         
         return owner_ids
     
-    def populate_pets(self, conn, owner_ids: list, type_ids: list, start_id: int):
-        """Populate pets table with test data"""
-        cursor = conn.cursor()
+    def populate_pets(self, conn, owner_ids: list, type_ids: list, count: int = None):
+        """Populate pets table with test data
         
-        # Create 1-3 pets per owner
-        total_pets = 0
+        Without count every owner gets 1-3 pets; with count, count pets are
+        spread over the owners with the populator's skew, at least one each.
+        """
         pet_names = ['Max', 'Bella', 'Charlie', 'Lucy', 'Cooper', 'Luna', 'Buddy', 'Daisy',
                     'Rocky', 'Molly', 'Duke', 'Sadie', 'Zeus', 'Maggie', 'Oliver', 'Sophie',
                     'Leo', 'Chloe', 'Milo', 'Zoe', 'Teddy', 'Lily', 'Bear', 'Stella']
         
         logger.info(f"\n• Populating pets table...")
         
-        for owner_id in owner_ids:
-            num_pets = random.randint(1, 3)
-            
-            for _ in range(num_pets):
-                name = random.choice(pet_names)
-                birth_date = date.today() - timedelta(days=random.randint(365, 5475))  # 1-15 years old
-                type_id = random.choice(type_ids)
-                
-                try:
-                    cursor.execute("""
-                        INSERT INTO petclinic.pets (name, birth_date, type_id, owner_id)
-                        VALUES (%s, %s, %s, %s)
-                    """, (name, birth_date, type_id, owner_id))
-                    
-                    total_pets += 1
-                    
-                except Exception as e:
-                    logger.error(f"    Error creating pet: {e}")
-                    raise
+        if count is None:
+            fanout = ((owner_id, random.randint(1, 3)) for owner_id in owner_ids)
+        else:
+            fanout = zipf_fanout(owner_ids, count, self.skew, minimum=1)
+        
+        def pets():
+            for owner_id, num_pets in fanout:
+                for _ in range(num_pets):
+                    name = random.choice(pet_names)
+                    birth_date = date.today() - timedelta(days=random.randint(365, 5475))  # 1-15 years old
+                    type_id = random.choice(type_ids)
+                    yield name, birth_date, type_id, owner_id
+        
+        def vector_pets():
+            if count is None:
+                pet_owners = self.columns.fanout(owner_ids, 1, 3)
+            else:
+                pet_owners = VectorZipf(self.columns, owner_ids, self.skew).fanout(count, minimum=1)
+            for offset, size in self.vector_batches(len(pet_owners)):
+                yield from to_rows(self.columns.choice(pet_names, size),
+                                   self.columns.days_before(date.today(), 365, 5475, size),  # 1-15 years old
+                                   self.columns.choice(type_ids, size),
+                                   pet_owners[offset:offset + size])
+        
+        try:
+            pet_ids = self.bulk_loader(conn, 'pets').copy_returning_ids(
+                'pets', ['name', 'birth_date', 'type_id', 'owner_id'], vector_pets() if self.columns else pets())
+        except Exception as e:
+            logger.error(f"    Error creating pets: {e}")
+            raise
         
         conn.commit()
-        logger.info(f"  ✓ Created {total_pets} pets successfully")
+        logger.info(f"  ✓ Created {len(pet_ids)} pets successfully")
+        
+        return pet_ids
     
-    def populate_vets(self, conn, count: int, start_id: int):
+    def populate_vets(self, conn, count: int):
         """Populate vets table with test data"""
         cursor = conn.cursor()
         
@@ -460,10 +562,12 @@ class PetClinicDataPopulator:
         
         return vet_ids
     
-    def populate_visits(self, conn, pet_ids: list):
-        """Populate visits table with test data"""
-        cursor = conn.cursor()
+    def populate_visits(self, conn, pet_ids: list, count: int = None):
+        """Populate visits table with test data
         
+        Without count every pet gets 0-2 visits; with count, count visits are
+        spread over the pets with the populator's skew.
+        """
         logger.info(f"\n• Populating visits table...")
         
         visit_descriptions = [
@@ -472,27 +576,36 @@ class PetClinicDataPopulator:
             'skin condition', 'ear infection', 'annual exam'
         ]
         
-        total_visits = 0
-        
-        for pet_id in pet_ids:
+        if count is None:
             # Each pet gets 0-2 visits
-            num_visits = random.randint(0, 2)
-            
-            for _ in range(num_visits):
-                visit_date = date.today() - timedelta(days=random.randint(1, 365))
-                description = random.choice(visit_descriptions)
-                
-                try:
-                    cursor.execute("""
-                        INSERT INTO petclinic.visits (pet_id, visit_date, description)
-                        VALUES (%s, %s, %s)
-                    """, (pet_id, visit_date, description))
-                    
-                    total_visits += 1
-                    
-                except Exception as e:
-                    logger.error(f"    Error creating visit: {e}")
-                    raise
+            fanout = ((pet_id, random.randint(0, 2)) for pet_id in pet_ids)
+        else:
+            fanout = zipf_fanout(pet_ids, count, self.skew)
+        
+        def visits():
+            for pet_id, num_visits in fanout:
+                for _ in range(num_visits):
+                    visit_date = date.today() - timedelta(days=random.randint(1, 365))
+                    description = random.choice(visit_descriptions)
+                    yield pet_id, visit_date, description
+        
+        def vector_visits():
+            if count is None:
+                visit_pets = self.columns.fanout(pet_ids, 0, 2)
+            else:
+                visit_pets = VectorZipf(self.columns, pet_ids, self.skew).fanout(count)
+            for offset, size in self.vector_batches(len(visit_pets)):
+                yield from to_rows(visit_pets[offset:offset + size],
+                                   self.columns.days_before(date.today(), 1, 365, size),
+                                   self.columns.choice(visit_descriptions, size))
+        
+        try:
+            # No IDs needed: visits keep their serial default
+            total_visits = self.bulk_loader(conn, 'visits').copy(
+                'visits', ['pet_id', 'visit_date', 'description'], vector_visits() if self.columns else visits())
+        except Exception as e:
+            logger.error(f"    Error creating visits: {e}")
+            raise
         
         conn.commit()
         logger.info(f"  ✓ Created {total_visits} visits successfully")
@@ -506,7 +619,13 @@ class PetClinicDataPopulator:
         logger.info(f"Database: {self.env_config['database']}")
         logger.info(f"Host: {self.env_config['host']}")
         logger.info(f"Snapshot file: {self.snapshot_file or 'None (creating fresh data)'}")
-        logger.info(f"Additional records: {self.additional_records}")
+        if self.scale_factor:
+            logger.info(f"Scale factor: {self.scale_factor} (skew {self.skew})")
+        else:
+            logger.info(f"Additional records: {self.additional_records}")
+        logger.info(f"Row generation: {'NumPy columns' if self.columns else 'Python, one row at a time'}")
+        if self.workers > 1:
+            logger.info(f"Workers: {self.workers} processes, one connection each")
         logger.info("="*70)
         
         # Test connection
@@ -550,6 +669,16 @@ Examples:
 
   # Use different environment
   python populate_test_data.py --env local --additional 20
+
+  # Scale factor 10 (100,000 owners, 200,000 pets, 5,000 vets, 500,000 visits)
+  python populate_test_data.py --env local --scale-factor 10
+
+  # Same, loaded by 4 worker processes
+  python populate_test_data.py --env local --scale-factor 10 --workers 4
+
+  # Populate once and save a template database, then reset from it between test runs
+  python populate_test_data.py --env local --scale-factor 10 --save-template petclinic_sf10
+  python populate_test_data.py --env local --from-template petclinic_sf10
         """
     )
     
@@ -562,9 +691,33 @@ Examples:
                         help='Snapshot JSON file to load baseline data from (optional, default: None)')
     parser.add_argument('--additional', type=int, default=0,
                         help='Number of additional owner records to create (with pets, vets, and visits) (default: 0)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f'Rows sent to the server per COPY (default: {DEFAULT_BATCH_SIZE})')
+    parser.add_argument('--scale-factor', type=float, default=None,
+                        help='Size every table from a scale factor instead of --additional '
+                             '(1 = 10,000 owners, 20,000 pets, 500 vets, 50,000 visits)')
+    parser.add_argument('--no-numpy', action='store_true',
+                        help='Generate rows one at a time even if NumPy is installed')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Worker processes loading partitions of each table, each with its own connection '
+                             '(default: 1)')
+    parser.add_argument('--save-template', type=str, default=None, metavar='NAME',
+                        help='After populating, copy the database to a new template database NAME')
+    parser.add_argument('--from-template', type=str, default=None, metavar='NAME',
+                        help='Re-create the database from template database NAME instead of clearing and populating')
+    parser.add_argument('--skew', type=float, default=None,
+                        help=f'Zipf exponent of pets per owner and visits per pet; 0 is uniform '
+                             f'(default: {DEFAULT_SKEW} with --scale-factor)')
     
     args = parser.parse_args()
     
+    if args.scale_factor is not None and args.scale_factor <= 0:
+        parser.error("--scale-factor must be positive")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.from_template and (args.snapshot or args.additional or args.scale_factor or args.save_template):
+        parser.error("--from-template cannot be combined with options that populate the database")
+    
     # Check if snapshot file exists (if provided)
     if args.snapshot and not Path(args.snapshot).exists():
         logger.error(f"Snapshot file not found: {args.snapshot}")
@@ -574,7 +727,17 @@ Examples:
         env_name=args.env,
         config_path=args.config,
         snapshot_file=args.snapshot,
-        additional_records=args.additional
+        additional_records=args.additional,
+        batch_size=args.batch_size,
+        scale_factor=args.scale_factor,
+        skew=args.skew if args.skew is not None else (DEFAULT_SKEW if args.scale_factor else 0.0),
+        vectorized=NUMPY_AVAILABLE and not args.no_numpy,
+        workers=args.workers
     )
     
-    populator.run()
+    if args.from_template:
+        populator.restore_from_template(args.from_template)
+    else:
+        populator.run()
+        if args.save_template:
+            populator.save_as_template(args.save_template)
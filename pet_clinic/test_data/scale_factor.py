@@ -0,0 +1,16 @@
+"""
+Scale-Factor Row Counts
+
+Row count of every table at scale factor 1. The populator and the
+performance test runner scale them with shared/scaling.py (scaled_rows),
+which also draws the foreign keys with a Zipf skew: a few owners have
+many pets and a few pets most of the visits.
+"""
+
+# Row counts at scale factor 1
+SCALE_FACTOR_ROWS = {
+    'owners': 10000,
+    'pets': 20000,
+    'vets': 500,
+    'visits': 50000,
+}
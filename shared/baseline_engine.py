@@ -0,0 +1,802 @@
+"""
+Baseline Capture Engine
+
+The database independent part of create_baseline.py, shared by the
+BookService (SQL Server) and PetClinic (PostgreSQL) tools. Everything that
+differs between the two servers goes through the dialect adapter of
+db_dialect.py (catalog, table list, keyset pages, snapshots, range hashes);
+an application only supplies its dialect, its connection and a description
+of the database (see BaselineEngine).
+
+Every capture writes the same baseline layout (see baseline_store.py for
+the format version): table rows plus row counts, checksums, catalog
+metadata and optional key-range hashes computed while the rows are read,
+so verify_migration.py never has to hash the baseline again.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from baseline_store import (BASELINE_FORMAT_VERSION, FORMAT_EXTENSIONS, HEADER_KEYS, BaselineWriter,
+                            CompactBaselineWriter, open_baseline_writer)
+from checkpoint import CheckpointJournal
+from connection_pool import ConnectionPool
+from keyset_reader import DEFAULT_PAGE_SIZE, iter_keyset_pages, iter_query_batches
+from row_counts import RowCounter
+from row_hashing import CHECKSUM_ALGORITHM, TableChecksum, TableScan, calculate_checksum, combine_range_hashes, ranges_to_list
+from value_normalizer import VALUE_FORMAT, RowNormalizer
+
+# Tables with more rows than this are read as several key ranges in --workers mode
+DEFAULT_SPLIT_ROWS = 250000
+
+logger = logging.getLogger(__name__)
+
+
+class BaselineEngine:
+    """Creates and manages database baseline snapshots
+
+    Subclasses implement connect() for their database driver and pass their
+    dialect adapter and db_info (server, database, driver, auth_type).
+    """
+
+    def __init__(self, dialect, db_info: Dict, env_name: str = "target"):
+        self.dialect = dialect
+        self.db_info = db_info
+        self.env_name = env_name
+        self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.catalog = None
+        self.row_counter = None
+        self.page_size = DEFAULT_PAGE_SIZE
+        self.checkpoint = None
+        self.snapshot_id = None
+
+        self.baseline_data = {
+            'format_version': BASELINE_FORMAT_VERSION,
+            'timestamp': self.timestamp,
+            'database_info': self.db_info,
+            'checksum_algorithm': CHECKSUM_ALGORITHM,
+            'value_format': VALUE_FORMAT,
+            'tables': {},
+            'row_counts': {},
+            'row_count_estimates': {},
+            'checksums': {},
+            'foreign_keys': {},
+            'indexes': {},
+            'schema_info': {},
+            'range_hashes': {}
+        }
+
+    def connect(self):
+        """Open a new connection to the database"""
+        raise NotImplementedError
+
+    def get_connection(self):
+        """Get database connection"""
+        try:
+            return self.connect()
+        except Exception as e:
+            logger.error(f"Failed to connect to database: {e}")
+            raise
+
+    def _get_snapshot_connection(self):
+        """Open a worker connection reading from the snapshot of the capture"""
+        conn = self.get_connection()
+        self.dialect.attach_snapshot(conn, self.snapshot_id)
+        return conn
+
+    def test_connection(self) -> bool:
+        """Test database connectivity"""
+        try:
+            conn = self.get_connection()
+            version = self.dialect.server_version(conn)
+            conn.close()
+            logger.info(f"  Connected to database successfully")
+            logger.info(f"  Database Version: {version[:100]}...")
+            return True
+        except Exception as e:
+            logger.error(f" Database connection failed: {e}")
+            return False
+
+    def _get_user_tables(self, conn) -> List[Tuple[str, str]]:
+        """Get list of user tables (excluding system tables)"""
+        return self.dialect.user_tables(conn)
+
+    def _get_row_count(self, conn, schema: str, table_name: str) -> int:
+        """Get row count for a table"""
+        return self.row_counter.count(conn, schema, table_name)
+
+    def _get_table_data(self, conn, schema: str, table_name: str) -> List[Dict]:
+        """Get all data from a table"""
+        rows = []
+        for batch in self._iter_table_data(conn, schema, table_name):
+            rows.extend(batch)
+        return rows
+
+    def _iter_table_data(self, conn, schema: str, table_name: str, batch_size: int = 5000,
+                         where: Optional[str] = None, params: tuple = (),
+                         after: Optional[tuple] = None, on_page=None):
+        """Yield table data in batches of row dicts
+
+        Tables with a primary key are read in keyset pages of page_size rows
+        (see keyset_reader.py); others with a single SELECT ... ORDER BY 1 on
+        the dialect's table cursor. after and on_page are the keyset resume
+        point and page callback, used by checkpointed captures. Values are
+        normalized by their catalog column types (see value_normalizer.py).
+        """
+        primary_key = self.catalog.primary_key(schema, table_name) if self.catalog else []
+        key_columns = [column for column, _ in primary_key]
+        if key_columns and self.page_size:
+            batches = iter_keyset_pages(conn, self.dialect, schema, table_name, key_columns,
+                                        self.page_size, batch_size, where, params, after, on_page)
+        else:
+            where_sql = f" WHERE {where}" if where else ""
+            sql = f"SELECT * FROM {self.dialect.quote_table(schema, table_name)}{where_sql} ORDER BY 1"
+            batches = iter_query_batches(self.dialect.table_cursor(conn, batch_size), sql, params, batch_size)
+
+        # Convert to canonical JSON-serializable values, one column at a time
+        normalizer = RowNormalizer(self.catalog.columns(schema, table_name) if self.catalog else None)
+        for columns, batch in batches:
+            yield normalizer.normalize_batch(columns, batch)
+
+    def _calculate_table_checksum(self, data: List[Dict]) -> str:
+        """Calculate checksum for table data"""
+        return calculate_checksum(data)
+
+    def _get_range_hashes(self, conn, schema: str, table_name: str, range_size: int) -> Dict:
+        """Get server-side row counts and hashes per primary-key range"""
+        key_column = self.dialect.range_key(conn, schema, table_name, self.catalog)
+        ranges = self.dialect.range_hashes(conn, schema, table_name, key_column, range_size)
+        logger.info(f"   Range hashes: {len(ranges)} range(s)"
+                    + (f" on {key_column}" if key_column else " (whole table)"))
+        return {
+            'key_column': key_column,
+            'range_size': range_size,
+            'table_hash': combine_range_hashes(ranges),
+            'ranges': ranges_to_list(ranges)
+        }
+
+    @staticmethod
+    def _checksum_ranges(range_spec: Optional[Dict]) -> Tuple[Optional[str], Optional[int]]:
+        """(key_column, range_size) to keep key-range checksums for, or (None, None)"""
+        if range_spec and range_spec['key_column']:
+            return range_spec['key_column'], range_spec['range_size']
+        return None, None
+
+    @staticmethod
+    def _store_range_checksums(range_spec: Optional[Dict], checksum: TableChecksum):
+        """Store the row checksum of every key range next to its server-side hash
+
+        verify_migration.py --pushdown trusts these instead of hashing the
+        baseline rows of ranges whose server-side hash differs.
+        """
+        if range_spec and range_spec['key_column']:
+            range_spec['row_checksums'] = checksum.range_checksums()
+
+    def _get_table_schema(self, schema: str, table_name: str) -> List[Dict]:
+        """Get schema information for a table from the catalog snapshot"""
+        return self.catalog.columns(schema, table_name)
+
+    def _get_foreign_keys(self, schema: str, table_name: str) -> List[Dict]:
+        """Get foreign key constraints for a table from the catalog snapshot"""
+        return self.catalog.foreign_keys(schema, table_name)
+
+    def _get_indexes(self, schema: str, table_name: str) -> List[Dict]:
+        """Get indexes for a table from the catalog snapshot"""
+        return self.catalog.indexes(schema, table_name)
+
+    def _capture_table_metadata(self, conn, schema: str, table_name: str, range_size: Optional[int] = None,
+                                split_rows: int = DEFAULT_SPLIT_ROWS) -> Dict:
+        """Collect catalog metadata and plan the key ranges for reading a table
+
+        The plan only needs a rough size, so catalog statistics are used when
+        available; the stored row count comes from reading the rows. A
+        checkpointed table keeps the key ranges recorded in the journal.
+        """
+        full_table = f"{schema}.{table_name}"
+        parts = self.checkpoint.plan(full_table) if self.checkpoint else None
+        if parts is None:
+            row_count = self.row_counter.estimate(schema, table_name)
+            if row_count is None:
+                row_count = self._get_row_count(conn, schema, table_name)
+            parts = self._plan_table_parts(conn, schema, table_name, row_count, split_rows)
+            if self.checkpoint:
+                self.checkpoint.record_plan(full_table, parts)
+
+        return {
+            'schema_info': self._get_table_schema(schema, table_name),
+            'foreign_keys': self._get_foreign_keys(schema, table_name),
+            'indexes': self._get_indexes(schema, table_name),
+            'range_hashes': self._get_range_hashes(conn, schema, table_name, range_size) if range_size else None,
+            'parts': parts
+        }
+
+    def _plan_table_parts(self, conn, schema: str, table_name: str, row_count: int,
+                          split_rows: int) -> List[Tuple[Optional[str], tuple]]:
+        """Split a large table into primary-key ranges of roughly split_rows rows
+
+        Returns (where, params) pairs; ranges are equal slices of the key
+        span, so they assume keys are spread fairly evenly. Tables without a
+        single integer primary key are read in one piece.
+        """
+        if split_rows <= 0 or row_count <= split_rows:
+            return [(None, ())]
+
+        key_column = self.dialect.range_key(conn, schema, table_name, self.catalog)
+        bounds = self.dialect.key_bounds(conn, schema, table_name, key_column) if key_column else None
+        if bounds is None:
+            return [(None, ())]
+
+        low, high = bounds[0], bounds[1] + 1
+        step = max(1, -(-(high - low) // -(-row_count // split_rows)))
+        return [
+            self.dialect.key_window_clause(key_column, start, min(start + step, high))
+            for start in range(low, high, step)
+        ]
+
+    def _capture_table_part(self, conn, schema: str, table_name: str, where: Optional[str], params: tuple,
+                            batch_size: int, spill_path: Optional[str] = None,
+                            range_spec: Optional[Dict] = None):
+        """Read one key range of a table
+
+        Returns (checksum, rows, spill_path). With spill_path the rows are
+        written to that file as JSON lines instead of being returned. With
+        range_spec the checksum also covers each of its key ranges.
+        """
+        key_column, range_size = self._checksum_ranges(range_spec)
+        spill = open(spill_path, 'w', encoding='utf-8') if spill_path else None
+        if spill:
+            scan = TableScan(sink=lambda batch: spill.writelines(json.dumps(row, default=str) + '\n'
+                                                                 for row in batch),
+                             key_column=key_column, range_size=range_size)
+        else:
+            scan = TableScan(keep_rows=True, key_column=key_column, range_size=range_size)
+
+        try:
+            scan.consume(self._iter_table_data(conn, schema, table_name, batch_size, where, params))
+        finally:
+            if spill:
+                spill.close()
+
+        return scan.checksum, scan.rows or [], spill_path
+
+    def _capture_checkpointed_part(self, conn, schema: str, table_name: str, part: int, where: Optional[str],
+                                   params: tuple, batch_size: int,
+                                   range_spec: Optional[Dict] = None) -> TableChecksum:
+        """Read one key range of a table into its checkpoint spill file
+
+        Every finished keyset page is committed to the journal, so after an
+        interruption only the rows past the last committed key are read
+        again. Returns the checksum of the whole key range.
+        """
+        full_table = f"{schema}.{table_name}"
+        key_column, range_size = self._checksum_ranges(range_spec)
+        if self.checkpoint.part_finished(full_table, part):
+            return TableScan(key_column=key_column, range_size=range_size).consume(
+                self.checkpoint.read_part(full_table, part, batch_size)).checksum
+
+        with self.checkpoint.open_part(full_table, part) as spill:
+            # Rows committed by an earlier run are kept and hashed from the spill file
+            checksum = TableScan(key_column=key_column, range_size=range_size).consume(
+                self.checkpoint.read_part(full_table, part, batch_size)).checksum
+            after = self.checkpoint.resume_key(full_table, part)
+            if after is not None:
+                logger.info(f" {full_table}: resuming part {part} after key {after}")
+
+            scan = TableScan(sink=lambda batch: spill.writelines(json.dumps(row, default=str) + '\n'
+                                                                 for row in batch),
+                             key_column=key_column, range_size=range_size)
+            scan.consume(self._iter_table_data(
+                conn, schema, table_name, batch_size, where, params, after,
+                on_page=lambda key: self.checkpoint.commit_page(full_table, part, spill, key)))
+            self.checkpoint.commit_part(full_table, part, spill)
+
+        checksum.merge(scan.checksum)
+        return checksum
+
+    def _restore_checkpointed_table(self, schema: str, table_name: str, writer: Optional[BaselineWriter],
+                                    batch_size: int):
+        """Add a table finished by an earlier run from the checkpoint journal"""
+        full_table = f"{schema}.{table_name}"
+        if writer:
+            writer.begin_table(full_table)
+        else:
+            self.baseline_data['tables'][full_table] = []
+        for part in range(len(self.checkpoint.plan(full_table))):
+            for batch in self.checkpoint.read_part(full_table, part, batch_size):
+                if writer:
+                    writer.write_rows(batch)
+                else:
+                    self.baseline_data['tables'][full_table].extend(batch)
+        if writer:
+            writer.end_table()
+
+        for key, value in self.checkpoint.finished_table(full_table).items():
+            self.baseline_data[key][full_table] = value
+        self.baseline_data['schema_info'][full_table] = self._get_table_schema(schema, table_name)
+        self.baseline_data['foreign_keys'][full_table] = self._get_foreign_keys(schema, table_name)
+        self.baseline_data['indexes'][full_table] = self._get_indexes(schema, table_name)
+        logger.info(f" {full_table}: {self.baseline_data['row_counts'][full_table]} rows (from checkpoint)")
+
+    def _copy_spilled_rows(self, spill_path: str, writer: BaselineWriter, batch_size: int):
+        """Append rows spilled by _capture_table_part to the baseline file"""
+        with open(spill_path, 'r', encoding='utf-8') as f:
+            batch = []
+            for line in f:
+                batch.append(json.loads(line))
+                if len(batch) >= batch_size:
+                    writer.write_rows(batch)
+                    batch = []
+            writer.write_rows(batch)
+        os.remove(spill_path)
+
+    def _capture_parallel(self, tables, writer: Optional[BaselineWriter], batch_size: int,
+                          workers: int, split_rows: int, range_size: Optional[int] = None):
+        """Capture tables concurrently on a bounded pool of connections
+
+        Key ranges are planned first, one task per table; catalog
+        metadata comes from the snapshot loaded in create_baseline. Table
+        data is then read by the same workers, with tables above split_rows
+        rows read as several key ranges. Results are assembled in table
+        order, so the baseline matches a sequential capture.
+
+        With a checkpoint journal, key ranges are spilled into the checkpoint
+        directory and every finished page, key range and table is journaled;
+        tables finished by an earlier run are restored without querying.
+        """
+        pool = ConnectionPool(self._get_snapshot_connection, workers)
+        spill_dir = None
+        if writer and not self.checkpoint:
+            spill_dir = tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(writer.filename)))
+
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                # Key ranges of every table not finished by an earlier run
+                metadata_futures = [
+                    None if self.checkpoint and self.checkpoint.finished_table(f"{schema}.{table_name}")
+                    else executor.submit(pool.run, self._capture_table_metadata, schema, table_name, range_size,
+                                         split_rows)
+                    for schema, table_name in tables
+                ]
+                metadata = [future.result() if future else None for future in metadata_futures]
+
+                # Table data, one task per key range
+                part_futures = []
+                for (schema, table_name), table_meta in zip(tables, metadata):
+                    futures = []
+                    for index, (where, params) in enumerate(table_meta['parts'] if table_meta else []):
+                        if self.checkpoint:
+                            futures.append(executor.submit(pool.run, self._capture_checkpointed_part, schema,
+                                                           table_name, index, where, params, batch_size,
+                                                           table_meta['range_hashes']))
+                            continue
+                        spill_path = None
+                        if spill_dir:
+                            spill_path = os.path.join(spill_dir.name, f"{schema}.{table_name}.{index}.jsonl")
+                        futures.append(executor.submit(pool.run, self._capture_table_part, schema, table_name,
+                                                       where, params, batch_size, spill_path,
+                                                       table_meta['range_hashes']))
+                    part_futures.append(futures)
+
+                for (schema, table_name), table_meta, futures in zip(tables, metadata, part_futures):
+                    full_table = f"{schema}.{table_name}"
+                    if table_meta is None:
+                        self._restore_checkpointed_table(schema, table_name, writer, batch_size)
+                        continue
+
+                    checksum_acc = TableChecksum(*self._checksum_ranges(table_meta['range_hashes']))
+                    if writer:
+                        writer.begin_table(full_table)
+                    else:
+                        self.baseline_data['tables'][full_table] = []
+
+                    for index, future in enumerate(futures):
+                        if self.checkpoint:
+                            checksum_acc.merge(future.result())
+                            for batch in self.checkpoint.read_part(full_table, index, batch_size):
+                                if writer:
+                                    writer.write_rows(batch)
+                                else:
+                                    self.baseline_data['tables'][full_table].extend(batch)
+                            continue
+                        part_checksum, rows, spill_path = future.result()
+                        checksum_acc.merge(part_checksum)
+                        if writer:
+                            self._copy_spilled_rows(spill_path, writer, batch_size)
+                        else:
+                            self.baseline_data['tables'][full_table].extend(rows)
+
+                    if writer:
+                        writer.end_table()
+
+                    checksum = checksum_acc.hexdigest()
+                    self._store_range_checksums(table_meta['range_hashes'], checksum_acc)
+                    self.baseline_data['row_counts'][full_table] = checksum_acc.row_count
+                    self.baseline_data['checksums'][full_table] = checksum
+                    self.baseline_data['schema_info'][full_table] = table_meta['schema_info']
+                    self.baseline_data['foreign_keys'][full_table] = table_meta['foreign_keys']
+                    self.baseline_data['indexes'][full_table] = table_meta['indexes']
+                    if table_meta['range_hashes']:
+                        self.baseline_data['range_hashes'][full_table] = table_meta['range_hashes']
+
+                    if self.checkpoint:
+                        results = {'row_counts': checksum_acc.row_count, 'checksums': checksum}
+                        if table_meta['range_hashes']:
+                            results['range_hashes'] = table_meta['range_hashes']
+                        self.checkpoint.commit_table(full_table, results)
+
+                    logger.info(f" {full_table}: {checksum_acc.row_count} rows in {len(futures)} part(s), "
+                                f"checksum {checksum[:16]}...")
+        finally:
+            pool.close_all()
+            if spill_dir:
+                spill_dir.cleanup()
+
+    def _log_snapshot(self, parallel: bool):
+        """Log the isolation the tables are read under (see db_dialect.py begin_snapshot)"""
+        if self.snapshot_id is None:
+            logger.warning("Snapshot isolation is not enabled for this database; tables are read under "
+                           "READ COMMITTED and may change while the baseline is captured")
+        elif self.dialect.shares_snapshot:
+            logger.info(f"Reading from snapshot {self.snapshot_id}")
+        elif parallel:
+            logger.info(f"Reading under {self.snapshot_id} isolation (one snapshot per connection)")
+        else:
+            logger.info(f"Reading under {self.snapshot_id} isolation")
+
+    def create_baseline(self, stream_to: Optional[str] = None, batch_size: int = 5000,
+                        file_format: str = 'json', tables: Optional[List[Tuple[str, str]]] = None,
+                        range_size: Optional[int] = None, workers: int = 1,
+                        split_rows: int = DEFAULT_SPLIT_ROWS,
+                        page_size: int = DEFAULT_PAGE_SIZE):
+        """Create complete baseline snapshot of database
+
+        When stream_to is given, table rows are written straight to that file
+        (in file_format, see baseline_store.py) in batches instead of being
+        kept in self.baseline_data, so memory use does not grow with table
+        size. tables limits the capture to the given (schema, table) pairs,
+        in that order; by default every user table is captured. When
+        range_size is given, server-side key-range hashes are stored as well
+        for verify_migration.py --pushdown, together with the row checksum of
+        each key range.
+        With workers > 1, tables are captured concurrently on that many
+        connections (see _capture_parallel). Each table is read once: the row
+        count and checksum are taken while the rows are copied. Catalog row
+        count statistics are stored for verify_migration.py --row-count hybrid.
+        Tables with a primary key are read in keyset pages of page_size rows.
+        With a checkpoint journal open (see open_checkpoint) tables always go
+        through _capture_parallel, on a single connection when workers is 1,
+        so that finished work is journaled; the checkpoint is removed once the
+        baseline file has been written.
+        All tables are read from the snapshot started by the dialect's
+        begin_snapshot.
+        """
+        self.page_size = page_size
+
+        logger.info("\n" + "="*70)
+        logger.info("CREATING DATABASE BASELINE SNAPSHOT")
+        logger.info("="*70)
+        logger.info(f"Timestamp: {self.timestamp}")
+        if stream_to:
+            logger.info(f"Streaming to: {stream_to} (batch size {batch_size})")
+        if workers > 1:
+            logger.info(f"Workers: {workers} (tables over {split_rows} rows split by key range)")
+        if self.checkpoint:
+            logger.info(f"Checkpoint: {self.checkpoint.directory}")
+        logger.info("="*70 + "\n")
+
+        writer = None
+        if stream_to:
+            writer = open_baseline_writer(stream_to, file_format)
+            writer.open({key: self.baseline_data[key] for key in HEADER_KEYS})
+
+        conn = self.get_connection()
+
+        try:
+            # Read every table from one snapshot so writers are never blocked
+            self.snapshot_id = self.dialect.begin_snapshot(conn)
+            self._log_snapshot(workers > 1 or self.checkpoint is not None)
+
+            # Get list of user tables
+            if tables is None:
+                tables = self._get_user_tables(conn)
+            logger.info(f"Found {len(tables)} user tables to baseline\n")
+
+            # Columns, keys and indexes of all tables in one pass over the catalog
+            self.catalog = self.dialect.load_catalog(conn)
+
+            # Catalog row count statistics of all tables in one query
+            self.row_counter = RowCounter(self.dialect, conn)
+            self.baseline_data['row_count_estimates'] = self.row_counter.estimates_by_name(tables)
+
+            if workers > 1 or self.checkpoint:
+                self._capture_parallel(tables, writer, batch_size, workers, split_rows, range_size)
+            else:
+                for schema, table_name in tables:
+                    full_table = f"{schema}.{table_name}"
+
+                    logger.info(f" Processing {full_table}...")
+
+                    # Server-side key-range hashes; the scan keeps a row checksum per range
+                    range_spec = self._get_range_hashes(conn, schema, table_name, range_size) if range_size else None
+                    key_column, checksum_range_size = self._checksum_ranges(range_spec)
+
+                    # Count, checksum and copy the rows in a single pass
+                    if writer:
+                        writer.begin_table(full_table)
+                        scan = TableScan(sink=writer.write_rows, key_column=key_column,
+                                         range_size=checksum_range_size)
+                    else:
+                        scan = TableScan(keep_rows=True, key_column=key_column, range_size=checksum_range_size)
+                    scan.consume(self._iter_table_data(conn, schema, table_name, batch_size))
+                    if writer:
+                        writer.end_table()
+                    else:
+                        self.baseline_data['tables'][full_table] = scan.rows
+
+                    checksum = scan.checksum.hexdigest()
+                    self.baseline_data['row_counts'][full_table] = scan.row_count
+                    self.baseline_data['checksums'][full_table] = checksum
+                    logger.info(f"   Rows: {scan.row_count}")
+                    logger.info(f"   Checksum: {checksum[:16]}...")
+
+                    if range_spec:
+                        self._store_range_checksums(range_spec, scan.checksum)
+                        self.baseline_data['range_hashes'][full_table] = range_spec
+
+                    # Get schema information
+                    schema_info = self._get_table_schema(schema, table_name)
+                    self.baseline_data['schema_info'][full_table] = schema_info
+                    logger.info(f"   Columns: {len(schema_info)}")
+
+                    # Get foreign keys
+                    foreign_keys = self._get_foreign_keys(schema, table_name)
+                    self.baseline_data['foreign_keys'][full_table] = foreign_keys
+                    if foreign_keys:
+                        logger.info(f"   Foreign Keys: {len(foreign_keys)}")
+
+                    # Get indexes
+                    indexes = self._get_indexes(schema, table_name)
+                    self.baseline_data['indexes'][full_table] = indexes
+                    if indexes:
+                        logger.info(f"   Indexes: {len(indexes)}")
+
+                    logger.info("")
+
+            if writer:
+                writer.close(self._trailer())
+                logger.info(f" Baseline streamed to: {stream_to}")
+                if self.checkpoint:
+                    self.checkpoint.discard()
+
+            logger.info("="*70)
+            logger.info(" Baseline snapshot created successfully")
+            logger.info("="*70)
+
+        except Exception:
+            if writer:
+                writer.abort()
+            if self.checkpoint:
+                self.checkpoint.close()
+                logger.info(f" Checkpoint kept in {self.checkpoint.directory}; rerun with --resume to continue")
+            raise
+        finally:
+            conn.close()
+
+    def _trailer(self) -> Dict:
+        """Baseline keys written after the table rows"""
+        return {
+            key: value for key, value in self.baseline_data.items()
+            if key not in HEADER_KEYS and key != 'tables'
+        }
+
+    def default_checkpoint_dir(self) -> str:
+        """Default checkpoint directory for this environment"""
+        return f"baseline_{self.env_name}.checkpoint"
+
+    def open_checkpoint(self, directory: Optional[str] = None, resume: bool = False):
+        """Journal the capture to a checkpoint directory (see checkpoint.py)
+
+        With resume, the run recorded there is continued and its timestamp is
+        kept, so default_filename names the same baseline file.
+        """
+        self.checkpoint = CheckpointJournal(directory or self.default_checkpoint_dir())
+        header = self.checkpoint.start({
+            'timestamp': self.timestamp,
+            'server': self.db_info['server'],
+            'database': self.db_info['database']
+        }, resume)
+        self.timestamp = header['timestamp']
+        self.baseline_data['timestamp'] = self.timestamp
+        if resume:
+            logger.info(f"Resuming baseline {self.timestamp} from checkpoint {self.checkpoint.directory}")
+
+    def default_filename(self, file_format: str = 'json') -> str:
+        """Default baseline filename for this environment and timestamp"""
+        return f"baseline_{self.env_name}_{self.timestamp}{FORMAT_EXTENSIONS[file_format]}"
+
+    def save_baseline(self, filename: Optional[str] = None, file_format: str = 'json') -> str:
+        """Save baseline to a JSON or compact file"""
+        if filename is None:
+            filename = self.default_filename(file_format)
+
+        if file_format == 'compact':
+            writer = CompactBaselineWriter(filename)
+            writer.open({key: self.baseline_data[key] for key in HEADER_KEYS})
+            for table_name, rows in self.baseline_data['tables'].items():
+                writer.begin_table(table_name)
+                writer.write_rows(rows)
+                writer.end_table()
+            writer.close(self._trailer())
+        else:
+            with open(filename, 'w') as f:
+                json.dump(self.baseline_data, f, indent=2, default=str)
+
+        if self.checkpoint:
+            self.checkpoint.discard()
+
+        logger.info(f"\n Baseline saved to: {filename}")
+        return filename
+
+    def print_summary(self):
+        """Print summary of baseline"""
+        logger.info("\n" + "="*70)
+        logger.info("BASELINE SUMMARY")
+        logger.info("="*70)
+
+        # Database information
+        logger.info("\nDatabase Information:")
+        logger.info(f"  Server:         {self.db_info['server']}")
+        logger.info(f"  Database:       {self.db_info['database']}")
+        logger.info(f"  Driver:         {self.db_info['driver']}")
+        logger.info(f"  Authentication: {self.db_info['auth_type']}")
+
+        total_rows = sum(self.baseline_data['row_counts'].values())
+        total_tables = len(self.baseline_data['row_counts'])
+
+        logger.info(f"\nTotal Tables: {total_tables}")
+        logger.info(f"Total Rows:   {total_rows}")
+        logger.info("")
+
+        logger.info("Table Details:")
+        logger.info("-" * 70)
+        for table, count in sorted(self.baseline_data['row_counts'].items()):
+            logger.info(f"  {table:40} {count:>10} rows")
+
+        logger.info("="*70)
+
+
+def load_config(config_path="../../db_config.json", env_name="target"):
+    """Load database configuration from JSON file"""
+    with open(config_path, 'r') as f:
+        config = json.load(f)
+    return config['environments'][env_name]
+
+
+def baseline_main(make_baseline: Callable[[Dict, str], BaselineEngine]):
+    """Command line entry point of create_baseline.py
+
+    make_baseline builds the application's engine from an environment
+    config and the environment name.
+    """
+    parser = argparse.ArgumentParser(description='Create database baseline snapshot')
+    parser.add_argument('--env', type=str, default='source',
+                        choices=['source', 'target', 'local'],
+                        help='Environment to use (default: source)')
+    parser.add_argument('--config', type=str, default='../../db_config.json',
+                        help='Path to config file (default: ../../db_config.json)')
+    parser.add_argument('--output', type=str, default=None,
+                        help='Output filename for baseline (default: baseline_<env>_<timestamp>.json)')
+    parser.add_argument('--format', type=str, default='json', choices=['json', 'compact'],
+                        help='Baseline file format: indented JSON or compressed columnar container (default: json)')
+    parser.add_argument('--stream', action='store_true',
+                        help='Stream table rows straight to the output file instead of holding them in memory')
+    parser.add_argument('--batch-size', type=int, default=5000,
+                        help='Rows fetched per round trip while reading table data (default: 5000)')
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE,
+                        help='Read tables with a primary key in keyset pages of this many rows, '
+                             f'0 for a single SELECT per table (default: {DEFAULT_PAGE_SIZE})')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Capture tables concurrently using this many connections (default: 1)')
+    parser.add_argument('--split-rows', type=int, default=DEFAULT_SPLIT_ROWS,
+                        help=f'With --workers, read tables above this many rows as several primary-key ranges '
+                             f'(default: {DEFAULT_SPLIT_ROWS})')
+    parser.add_argument('--pushdown', action='store_true',
+                        help='Also store server-side key-range hashes for verify_migration.py --pushdown')
+    parser.add_argument('--range-size', type=int, default=1000,
+                        help='Primary-key values per hashed range with --pushdown (default: 1000)')
+
+    parser.add_argument('--checkpoint', action='store_true',
+                        help='Journal finished tables and key ranges so an interrupted run can be resumed')
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue the run recorded in the checkpoint directory (implies --checkpoint)')
+    parser.add_argument('--checkpoint-dir', type=str, default=None,
+                        help='Checkpoint directory (default: baseline_<env>.checkpoint)')
+
+    args = parser.parse_args()
+
+    print("""
+══════════════════════════════════════════════════════════════════════
+          Database Baseline Creator - Part 1
+          Create a baseline snapshot BEFORE migration
+══════════════════════════════════════════════════════════════════════
+    """)
+
+    # Load configuration
+    try:
+        env_config = load_config(args.config, args.env)
+        baseline = make_baseline(env_config, args.env)
+    except Exception as e:
+        print(f"\n✗ Error loading configuration: {e}")
+        sys.exit(1)
+
+    # Print environment info
+    print("="*70)
+    print(f"Environment: {args.env.upper()}")
+    print(f"Database: {env_config['database']}")
+    print(f"Server: {baseline.db_info['server']}")
+    print("="*70)
+
+    # Test connection
+    if not baseline.test_connection():
+        print("\n✗ Cannot connect to database. Please check configuration.")
+        sys.exit(1)
+
+    # Info message
+    print("\n" + "="*70)
+    print("Creating baseline snapshot of current database state...")
+    print("="*70)
+
+    range_size = args.range_size if args.pushdown else None
+
+    try:
+        if args.checkpoint or args.resume:
+            baseline.open_checkpoint(args.checkpoint_dir, args.resume)
+
+        if args.stream:
+            # Create baseline, writing table data to disk as it is read
+            filename = args.output or baseline.default_filename(args.format)
+            baseline.create_baseline(stream_to=filename, batch_size=args.batch_size,
+                                     file_format=args.format, range_size=range_size, workers=args.workers,
+                                     split_rows=args.split_rows,
+                                     page_size=args.page_size)
+
+            # Print summary
+            baseline.print_summary()
+        else:
+            # Create baseline
+            baseline.create_baseline(batch_size=args.batch_size, range_size=range_size,
+                                     workers=args.workers, split_rows=args.split_rows,
+                                     page_size=args.page_size)
+
+            # Print summary
+            baseline.print_summary()
+
+            # Save baseline
+            filename = baseline.save_baseline(args.output, args.format)
+
+        print("\n" + "="*70)
+        print("✓ BASELINE CREATED SUCCESSFULLY")
+        print("="*70)
+        print(f"\n✓ Baseline file: {filename}")
+        print(f"✓ Environment: {args.env.upper()}")
+        print("\n  Next Steps:")
+        if args.env == 'source':
+            print("    1. Run your database migration")
+            print(f"    2. Verify: python verify_migration.py --env target --baseline {filename}")
+        else:
+            print(f"    1. Use this baseline for verification")
+            print(f"    2. Run: python verify_migration.py")
+        print("="*70)
+
+        sys.exit(0)
+
+    except Exception as e:
+        logger.error(f"\n✗ Error creating baseline: {e}")
+        sys.exit(1)
@@ -0,0 +1,480 @@
+"""
+Baseline File Storage
+
+Streams a baseline snapshot to disk table by table instead of building the
+whole document in memory. Two formats are supported:
+
+- json: the same layout as DatabaseBaseline.save_baseline, readable by any
+  JSON tool.
+- compact: a binary container of zlib-compressed column chunks followed by a
+  manifest (metadata plus a table of contents). Column names are stored once
+  per chunk rather than once per row.
+
+Compact files are memory-mapped when read, and open_baseline() returns a
+BaselineView: metadata is available immediately and table rows are only
+decoded when a table is actually read.
+
+Compact layout: MAGIC, chunk payloads, compressed JSON manifest, then a
+footer of (manifest offset, manifest length, MAGIC).
+
+Baseline format versions (the 'format_version' key):
+
+- 1 (no key): create_baseline.py baselines written before the version was
+  recorded, or pet_clinic/test_data/create_snapshot.py documents with 'metadata' and
+  per-table 'data' / 'row_count' / 'columns', keyed by bare table name
+- 2: one layout for both applications, written by baseline_engine.py:
+  'schema.table' keys, rows in 'tables', and row counts, checksums,
+  catalog metadata and range hashes computed at capture time
+
+open_baseline() upgrades snapshot documents to the current layout, so
+verifiers only ever see one format.
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+import zlib
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Union
+
+from row_hashing import CHECKSUM_ALGORITHM, calculate_checksum
+from value_normalizer import VALUE_FORMAT, RowNormalizer
+
+BASELINE_FORMAT_VERSION = 2
+
+# Keys written before the table rows by the streaming writers
+HEADER_KEYS = ('format_version', 'timestamp', 'database_info', 'checksum_algorithm')
+
+logger = logging.getLogger(__name__)
+
+
+class BaselineWriter:
+    """Writes a baseline JSON document incrementally"""
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.partial_filename = f"{filename}.partial"
+        self._file = None
+        self._first_key = True
+        self._first_table = True
+        self._first_row = True
+
+    def open(self, header: Dict):
+        """Open the output file and write the leading header keys"""
+        self._file = open(self.partial_filename, 'w', encoding='utf-8')
+        self._file.write('{')
+        for key, value in header.items():
+            self._write_key(key, value)
+        self._file.write(',\n  "tables": {')
+        self._first_key = False
+
+    def begin_table(self, table_name: str):
+        """Start the row array for a table"""
+        if not self._first_table:
+            self._file.write(',')
+        self._file.write(f'\n    {json.dumps(table_name)}: [')
+        self._first_table = False
+        self._first_row = True
+
+    def write_rows(self, rows: Iterable[Dict]):
+        """Append a batch of rows to the current table"""
+        for row in rows:
+            if not self._first_row:
+                self._file.write(',')
+            self._file.write('\n      ')
+            self._file.write(json.dumps(row, default=str))
+            self._first_row = False
+
+    def end_table(self):
+        """Close the row array for the current table"""
+        self._file.write('\n    ]' if not self._first_row else ']')
+
+    def close(self, trailer: Dict):
+        """Write the trailing metadata keys and move the file into place"""
+        self._file.write('\n  }')
+        for key, value in trailer.items():
+            self._write_key(key, value)
+        self._file.write('\n}\n')
+        self._file.close()
+        self._file = None
+        os.replace(self.partial_filename, self.filename)
+
+    def abort(self):
+        """Discard a partially written file"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if os.path.exists(self.partial_filename):
+            os.remove(self.partial_filename)
+
+    def _write_key(self, key: str, value):
+        """Write a single top-level key/value pair"""
+        if not self._first_key:
+            self._file.write(',')
+        self._file.write(f'\n  {json.dumps(key)}: {json.dumps(value, default=str)}')
+        self._first_key = False
+
+
+MAGIC = b'MIGBASE1'
+COMPACT_FORMAT_VERSION = 1
+_FOOTER = struct.Struct('>QQ8s')
+
+# File extension used for each --format choice
+FORMAT_EXTENSIONS = {'json': '.json', 'compact': '.baseline'}
+
+
+class CompactBaselineWriter:
+    """Writes a baseline as compressed column chunks plus a manifest"""
+
+    def __init__(self, filename: str, chunk_rows: int = 50000, level: int = 6):
+        self.filename = filename
+        self.partial_filename = f"{filename}.partial"
+        self.chunk_rows = chunk_rows
+        self.level = level
+        self._file = None
+        self._header = {}
+        self._toc = {}
+        self._table = None
+        self._pending = []
+
+    def open(self, header: Dict):
+        """Open the output file and remember the header keys for the manifest"""
+        self._file = open(self.partial_filename, 'wb')
+        self._file.write(MAGIC)
+        self._header = dict(header)
+
+    def begin_table(self, table_name: str):
+        """Start collecting chunks for a table"""
+        self._table = table_name
+        self._toc[table_name] = []
+        self._pending = []
+
+    def write_rows(self, rows: Iterable[Dict]):
+        """Buffer rows of the current table, writing a chunk every chunk_rows rows"""
+        self._pending.extend(rows)
+        while len(self._pending) >= self.chunk_rows:
+            self._write_chunk(self._pending[:self.chunk_rows])
+            self._pending = self._pending[self.chunk_rows:]
+
+    def end_table(self):
+        """Write the remaining rows of the current table"""
+        if self._pending:
+            self._write_chunk(self._pending)
+        self._pending = []
+        self._table = None
+
+    def close(self, trailer: Dict):
+        """Write the manifest and footer and move the file into place"""
+        manifest = {
+            'format': 'compact-baseline',
+            'version': COMPACT_FORMAT_VERSION,
+            'metadata': {**self._header, **trailer},
+            'tables': self._toc
+        }
+        payload = zlib.compress(_dumps(manifest), self.level)
+        offset = self._file.tell()
+        self._file.write(payload)
+        self._file.write(_FOOTER.pack(offset, len(payload), MAGIC))
+        self._file.close()
+        self._file = None
+        os.replace(self.partial_filename, self.filename)
+
+    def abort(self):
+        """Discard a partially written file"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if os.path.exists(self.partial_filename):
+            os.remove(self.partial_filename)
+
+    def _write_chunk(self, rows: List[Dict]):
+        """Compress a batch of rows as column arrays and record it in the table of contents"""
+        columns = list(dict.fromkeys(column for row in rows for column in row))
+        chunk = {'columns': columns, 'values': [[row.get(column) for row in rows] for column in columns]}
+        payload = zlib.compress(_dumps(chunk), self.level)
+        offset = self._file.tell()
+        self._file.write(payload)
+        self._toc[self._table].append([offset, len(payload), len(rows)])
+
+
+class CompactBaselineReader:
+    """Reads a compact baseline through a memory map; table rows are decoded only when asked for"""
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        with open(filename, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(self._map) < len(MAGIC) + _FOOTER.size or self._map[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"Not a compact baseline file: {filename}")
+            offset, length, magic = _FOOTER.unpack_from(self._map, len(self._map) - _FOOTER.size)
+            if magic != MAGIC:
+                raise ValueError(f"Truncated compact baseline file: {filename}")
+            manifest = json.loads(zlib.decompress(self._map[offset:offset + length]))
+        except Exception:
+            self._map.close()
+            raise
+        self.version = manifest['version']
+        self.metadata = manifest['metadata']
+        self._toc = manifest['tables']
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Release the memory map"""
+        self._map.close()
+
+    def table_names(self) -> List[str]:
+        """Tables in capture order"""
+        return list(self._toc)
+
+    def row_count(self, table_name: str) -> int:
+        """Rows stored for a table, without decoding them"""
+        return sum(rows for _, _, rows in self._toc[table_name])
+
+    def iter_rows(self, table_name: str) -> Iterator[List[Dict]]:
+        """Yield the rows of a table chunk by chunk"""
+        for offset, length, _ in self._toc[table_name]:
+            chunk = json.loads(zlib.decompress(self._map[offset:offset + length]))
+            columns = chunk['columns']
+            yield [dict(zip(columns, values)) for values in zip(*chunk['values'])]
+
+    def table_rows(self, table_name: str) -> List[Dict]:
+        """All rows of a table"""
+        rows = []
+        for chunk in self.iter_rows(table_name):
+            rows.extend(chunk)
+        return rows
+
+    def load(self) -> Dict:
+        """Decode the whole file into the same dict json.load gives for a JSON baseline"""
+        baseline = dict(self.metadata)
+        baseline['tables'] = {name: self.table_rows(name) for name in self._toc}
+        return baseline
+
+
+class LazyTables(Mapping):
+    """Table name -> rows mapping that decodes a table on first access
+
+    Only the most recently used tables are kept decoded, so walking every
+    table does not hold the whole baseline in memory at once.
+    """
+
+    def __init__(self, reader: CompactBaselineReader, cache_size: int = 4):
+        self._reader = reader
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+
+    def __getitem__(self, table_name: str) -> List[Dict]:
+        if table_name in self._cache:
+            self._cache.move_to_end(table_name)
+            return self._cache[table_name]
+        if table_name not in self._reader.table_names():
+            raise KeyError(table_name)
+        rows = self._reader.table_rows(table_name)
+        self._cache[table_name] = rows
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return rows
+
+    def __iter__(self):
+        return iter(self._reader.table_names())
+
+    def __len__(self):
+        return len(self._reader.table_names())
+
+    def row_count(self, table_name: str) -> int:
+        """Rows stored for a table, without decoding them"""
+        return self._reader.row_count(table_name)
+
+    def iter_rows(self, table_name: str) -> Iterator[List[Dict]]:
+        """Yield the rows of a table chunk by chunk, without keeping the table decoded"""
+        if table_name in self._cache:
+            yield self._cache[table_name]
+        elif table_name in self._reader.table_names():
+            yield from self._reader.iter_rows(table_name)
+
+
+class BaselineView(Mapping):
+    """Read-only baseline dict backed by a memory-mapped compact file
+
+    Behaves like the dict json.load returns for a JSON baseline: metadata
+    keys come from the manifest and 'tables' is a LazyTables mapping.
+    """
+
+    def __init__(self, reader: CompactBaselineReader):
+        self.reader = reader
+        self.tables = LazyTables(reader)
+
+    def __getitem__(self, key: str):
+        if key == 'tables':
+            return self.tables
+        return self.reader.metadata[key]
+
+    def __iter__(self):
+        yield from self.reader.metadata
+        yield 'tables'
+
+    def __len__(self):
+        return len(self.reader.metadata) + 1
+
+    def __setitem__(self, key: str, value):
+        """Replace a metadata key, e.g. recomputed checksums; table rows stay read-only"""
+        if key == 'tables':
+            raise TypeError("Table rows of a compact baseline are read-only")
+        self.reader.metadata[key] = value
+
+    def close(self):
+        """Release the memory map"""
+        self.reader.close()
+
+
+def _dumps(value) -> bytes:
+    """Compact JSON encoding used inside compact baselines"""
+    return json.dumps(value, separators=(',', ':'), default=str).encode('utf-8')
+
+
+def is_compact_baseline(filename: str) -> bool:
+    """Check whether a file is a compact baseline (rather than JSON)"""
+    with open(filename, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def open_baseline_writer(filename: str, file_format: str = 'json'):
+    """Create a streaming writer for the given --format choice"""
+    if file_format == 'compact':
+        return CompactBaselineWriter(filename)
+    return BaselineWriter(filename)
+
+
+def is_snapshot_document(document: Dict) -> bool:
+    """Check whether a loaded JSON document is a create_snapshot.py snapshot"""
+    return 'metadata' in document and 'format_version' not in document
+
+
+def upgrade_snapshot(snapshot: Dict, schema: str) -> Dict:
+    """Convert a create_snapshot.py document into the current baseline layout
+
+    Snapshot tables are keyed by bare name; schema is the schema they were
+    read from. Snapshots only list column names, so the column types of
+    'schema_info' are None. Checksums are computed here, once per load.
+    """
+    metadata = snapshot['metadata']
+    baseline = {
+        'format_version': BASELINE_FORMAT_VERSION,
+        'timestamp': metadata.get('snapshot_date'),
+        'database_info': {
+            'server': metadata.get('host', 'Unknown'),
+            'database': metadata.get('database', 'Unknown'),
+            'environment': metadata.get('environment')
+        },
+        'checksum_algorithm': CHECKSUM_ALGORITHM,
+        'tables': {},
+        'row_counts': {},
+        'row_count_estimates': {},
+        'checksums': {},
+        'foreign_keys': {},
+        'indexes': {},
+        'schema_info': {},
+        'range_hashes': {}
+    }
+    if metadata.get('value_format'):
+        baseline['value_format'] = metadata['value_format']
+
+    for table_name, table in snapshot['tables'].items():
+        full_table = f"{schema}.{table_name}"
+        rows = table.get('data', [])
+        baseline['tables'][full_table] = rows
+        baseline['row_counts'][full_table] = table.get('row_count', len(rows))
+        baseline['checksums'][full_table] = calculate_checksum(rows)
+        baseline['schema_info'][full_table] = [{'name': column, 'type': None}
+                                               for column in table.get('columns', [])]
+        if table.get('row_count_estimate') is not None:
+            baseline['row_count_estimates'][full_table] = table['row_count_estimate']
+        if table.get('range_hashes'):
+            baseline['range_hashes'][full_table] = table['range_hashes']
+    return baseline
+
+
+def _check_version(baseline, filename: str):
+    """Refuse baselines written by a newer version of the tools"""
+    version = baseline.get('format_version', 1)
+    if version > BASELINE_FORMAT_VERSION:
+        raise ValueError(f"{filename} has baseline format {version}; "
+                         f"this version reads up to format {BASELINE_FORMAT_VERSION}")
+
+
+def open_baseline(filename: str, snapshot_schema: str = 'public') -> Union[Dict, BaselineView]:
+    """Open a baseline for reading
+
+    Compact files are memory-mapped and returned as a lazy BaselineView;
+    JSON files are parsed into a dict. create_snapshot.py documents are
+    upgraded to the current layout with their tables in snapshot_schema.
+    """
+    if is_compact_baseline(filename):
+        baseline = BaselineView(CompactBaselineReader(filename))
+    else:
+        with open(filename, 'r') as f:
+            baseline = json.load(f)
+        if is_snapshot_document(baseline):
+            baseline = upgrade_snapshot(baseline, snapshot_schema)
+    _check_version(baseline, filename)
+    return baseline
+
+
+def load_baseline_file(filename: str, snapshot_schema: str = 'public') -> Dict:
+    """Load a JSON or compact baseline into a dict"""
+    if is_compact_baseline(filename):
+        with CompactBaselineReader(filename) as reader:
+            baseline = reader.load()
+    else:
+        with open(filename, 'r') as f:
+            baseline = json.load(f)
+        if is_snapshot_document(baseline):
+            baseline = upgrade_snapshot(baseline, snapshot_schema)
+    _check_version(baseline, filename)
+    return baseline
+
+
+def refresh_legacy_checksums(baseline, label: str = "baseline"):
+    """Recompute checksums of a baseline written with an older checksum algorithm or value format
+
+    Rows stored before type-aware value normalization (see
+    value_normalizer.py) are normalized again using the baseline's own
+    column types. Compact baselines are read-only, so for those only a
+    warning is logged.
+    """
+    renormalized = False
+    if baseline.get('value_format') != VALUE_FORMAT:
+        if isinstance(baseline, dict):
+            logger.info(f"  Normalizing {label} values ({VALUE_FORMAT}) by column type")
+            schema_info = baseline.get('schema_info', {})
+            baseline['tables'] = {
+                table: RowNormalizer(schema_info.get(table)).normalize_rows(rows)
+                for table, rows in baseline['tables'].items()
+            }
+            baseline['value_format'] = VALUE_FORMAT
+            renormalized = True
+        else:
+            logger.warning(f"  {label} predates type-aware value normalization; decimal, date/time, "
+                           f"binary and uuid columns may report false checksum differences. "
+                           f"Recreate it with create_baseline.py")
+
+    if baseline.get('checksum_algorithm') == CHECKSUM_ALGORITHM and not renormalized:
+        return
+
+    logger.info(f"  Recomputing {label} checksums ({CHECKSUM_ALGORITHM}) from stored table data")
+    baseline['checksums'] = {
+        table: calculate_checksum(rows) for table, rows in baseline['tables'].items()
+    }
+    baseline['checksum_algorithm'] = CHECKSUM_ALGORITHM
+    # Key-range checksums were taken over the old values; verifiers fall back to hashing rows
+    for range_spec in (baseline.get('range_hashes') or {}).values():
+        range_spec.pop('row_checksums', None)
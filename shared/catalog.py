@@ -0,0 +1,81 @@
+"""
+Database Catalog Snapshot
+
+Holds the columns, primary keys, foreign keys and indexes of every table in
+a database. The snapshot is filled by db_dialect's load_catalog with one
+bulk query per kind of object, instead of a round trip per table, and then
+answers per-table lookups from memory.
+"""
+
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+FOREIGN_KEY_FIELDS = ('name', 'parent_table', 'parent_column', 'referenced_table', 'referenced_column')
+
+
+class CatalogSnapshot:
+    """Catalog metadata of all tables, grouped by (schema, table)"""
+
+    def __init__(self):
+        self._columns = defaultdict(list)
+        self._primary_keys = defaultdict(list)
+        self._foreign_keys = defaultdict(list)
+        self._indexes = defaultdict(dict)
+
+    def add_column(self, schema: str, table_name: str, column: Dict):
+        """Record a column (in ordinal order)"""
+        self._columns[(schema, table_name)].append(column)
+
+    def add_primary_key_column(self, schema: str, table_name: str, column: str, data_type: str):
+        """Record a primary key column (in key order)"""
+        self._primary_keys[(schema, table_name)].append((column, data_type))
+
+    def add_foreign_key(self, schema: str, table_name: str, foreign_key: Dict):
+        """Record one column pair of a foreign key"""
+        self._foreign_keys[(schema, table_name)].append(foreign_key)
+
+    def add_index_column(self, schema: str, table_name: str, index: Dict, column: Optional[str] = None):
+        """Record an index, appending column to its column list when given"""
+        indexes = self._indexes[(schema, table_name)]
+        if index['name'] not in indexes:
+            indexes[index['name']] = index
+        if column is not None:
+            indexes[index['name']].setdefault('columns', []).append(column)
+
+    def tables(self) -> List[Tuple[str, str]]:
+        """All (schema, table) pairs that have columns, sorted"""
+        return sorted(self._columns)
+
+    def find_table(self, table_name: str) -> Optional[Tuple[str, str]]:
+        """First (schema, table) pair with the given table name, if any"""
+        for schema, name in self.tables():
+            if name == table_name:
+                return schema, name
+        return None
+
+    def columns(self, schema: str, table_name: str) -> List[Dict]:
+        """Columns of a table: name, type, max_length, nullable, default"""
+        return [dict(column) for column in self._columns.get((schema, table_name), [])]
+
+    def primary_key(self, schema: str, table_name: str) -> List[Tuple[str, str]]:
+        """(column, data type) pairs of the primary key in key order"""
+        return list(self._primary_keys.get((schema, table_name), []))
+
+    def foreign_keys(self, schema: str, table_name: str, include_schema: bool = False) -> List[Dict]:
+        """Foreign key column pairs of a table
+
+        The baseline format has no referenced_schema; pass include_schema to
+        keep it.
+        """
+        fields = FOREIGN_KEY_FIELDS + (('referenced_schema',) if include_schema else ())
+        return [
+            {field: foreign_key.get(field) for field in fields}
+            for foreign_key in self._foreign_keys.get((schema, table_name), [])
+        ]
+
+    def indexes(self, schema: str, table_name: str) -> List[Dict]:
+        """Indexes of a table"""
+        return [
+            {key: list(value) if isinstance(value, list) else value for key, value in index.items()}
+            for index in self._indexes.get((schema, table_name), {}).values()
+        ]
@@ -0,0 +1,184 @@
+"""
+Baseline Checkpoint Journal
+
+Lets an interrupted create_baseline.py run be resumed instead of started
+over. The journal is a directory next to the baseline output holding:
+
+- journal.jsonl: an append-only manifest, one JSON record per line, flushed
+  and fsynced as each record is written
+- <schema>.<table>.<part>.jsonl: the rows of each key range of a table as
+  JSON lines
+
+Records:
+
+- header: timestamp and database of the run being checkpointed
+- plan: the key ranges (where, params) a table is read in
+- page: a keyset page of a key range is on disk; the key of its last row
+  and the size of the spill file at that point
+- part: a key range is complete
+- table: a table is complete, with its baseline results (row count,
+  checksum, ...)
+
+When resuming, finished tables and key ranges are skipped, spill files are
+cut back to the last committed page and reading continues after its key.
+"""
+
+import json
+import os
+import shutil
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+JOURNAL_FILENAME = 'journal.jsonl'
+
+
+class CheckpointJournal:
+    """Sidecar manifest of the finished work of a baseline capture"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.path = os.path.join(directory, JOURNAL_FILENAME)
+        self.header = None
+        self._plans = {}
+        self._pages = {}
+        self._parts = set()
+        self._tables = {}
+        self._file = None
+        self._lock = threading.Lock()
+
+    def start(self, header: Dict, resume: bool = False) -> Dict:
+        """Open the journal, replaying an existing one when resume is set
+
+        Without resume any earlier checkpoint in the directory is discarded.
+        Returns the header of the run, which for a resumed run is the one
+        originally written (so its timestamp is kept).
+        """
+        if resume:
+            if not os.path.exists(self.path):
+                raise FileNotFoundError(f"No checkpoint to resume in {self.directory}")
+            self._replay()
+            for key in ('server', 'database'):
+                if self.header.get(key) != header.get(key):
+                    raise ValueError(f"Checkpoint in {self.directory} was written for {key} "
+                                     f"{self.header.get(key)!r}, not {header.get(key)!r}")
+        elif os.path.exists(self.directory):
+            shutil.rmtree(self.directory)
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._file = open(self.path, 'a', encoding='utf-8')
+        if self.header is None:
+            self.header = dict(header)
+            self._record('header', **self.header)
+        return self.header
+
+    def _replay(self):
+        """Load the state of an existing journal"""
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A record cut short by the interruption
+                    break
+                kind = record.pop('type')
+                if kind == 'header':
+                    self.header = record
+                elif kind == 'plan':
+                    self._plans[record['table']] = [(where, tuple(params)) for where, params in record['parts']]
+                elif kind == 'page':
+                    self._pages[(record['table'], record['part'])] = (tuple(record['after']), record['offset'])
+                elif kind == 'part':
+                    self._parts.add((record['table'], record['part']))
+                elif kind == 'table':
+                    self._tables[record['table']] = record['results']
+
+    def _record(self, kind: str, **fields):
+        """Append one record and force it to disk"""
+        with self._lock:
+            self._file.write(json.dumps({'type': kind, **fields}, default=str) + '\n')
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def plan(self, table: str) -> Optional[List[Tuple[Optional[str], tuple]]]:
+        """Key ranges recorded for a table, if any"""
+        return self._plans.get(table)
+
+    def record_plan(self, table: str, parts: List[Tuple[Optional[str], tuple]]):
+        """Record the key ranges a table is read in"""
+        self._plans[table] = parts
+        self._record('plan', table=table, parts=[[where, list(params)] for where, params in parts])
+
+    def finished_table(self, table: str) -> Optional[Dict]:
+        """Baseline results of a finished table, or None"""
+        return self._tables.get(table)
+
+    def commit_table(self, table: str, results: Dict):
+        """Mark a table finished with its baseline results"""
+        self._tables[table] = results
+        self._record('table', table=table, results=results)
+
+    def part_finished(self, table: str, part: int) -> bool:
+        """Whether a key range of a table is complete"""
+        return (table, part) in self._parts
+
+    def resume_key(self, table: str, part: int) -> Optional[tuple]:
+        """Key of the last committed row of an unfinished key range"""
+        page = self._pages.get((table, part))
+        return page[0] if page else None
+
+    def part_path(self, table: str, part: int) -> str:
+        """Spill file holding the rows of one key range"""
+        return os.path.join(self.directory, f"{table}.{part}.jsonl")
+
+    def open_part(self, table: str, part: int):
+        """Open a key range's spill file for appending
+
+        Rows written after the last committed page are dropped first, so the
+        file matches resume_key.
+        """
+        path = self.part_path(table, part)
+        if os.path.exists(path):
+            page = self._pages.get((table, part))
+            os.truncate(path, page[1] if page else 0)
+        return open(path, 'a', encoding='utf-8')
+
+    def commit_page(self, table: str, part: int, spill, after: tuple):
+        """Record that the rows up to key after are safely in the spill file"""
+        spill.flush()
+        os.fsync(spill.fileno())
+        offset = spill.tell()
+        self._pages[(table, part)] = (tuple(after), offset)
+        self._record('page', table=table, part=part, after=list(after), offset=offset)
+
+    def commit_part(self, table: str, part: int, spill):
+        """Mark a key range complete once its spill file is on disk"""
+        spill.flush()
+        os.fsync(spill.fileno())
+        self._parts.add((table, part))
+        self._record('part', table=table, part=part)
+
+    def read_part(self, table: str, part: int, batch_size: int = 5000) -> Iterator[List[Dict]]:
+        """Yield the spilled rows of a key range in batches"""
+        path = self.part_path(table, part)
+        if not os.path.exists(path):
+            return
+        with open(path, 'r', encoding='utf-8') as f:
+            batch = []
+            for line in f:
+                batch.append(json.loads(line))
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+
+    def close(self):
+        """Close the journal file, keeping the checkpoint on disk"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def discard(self):
+        """Remove the checkpoint once the baseline has been written"""
+        self.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
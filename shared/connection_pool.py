@@ -0,0 +1,74 @@
+"""
+Database Connection Pool
+
+A small fixed-size pool for running table captures on worker threads. Each
+worker borrows one connection at a time, so no connection is ever used by
+two threads at once; at most `size` connections are opened.
+"""
+
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Callable
+
+
+class ConnectionPool:
+    """Bounded pool of database connections shared by worker threads"""
+
+    def __init__(self, connect: Callable, size: int):
+        self._connect = connect
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._opened = []
+        self._reserved = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for the duration of a with block"""
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def run(self, func: Callable, *args):
+        """Call func(conn, *args) on a pooled connection"""
+        with self.connection() as conn:
+            return func(conn, *args)
+
+    def _acquire(self):
+        """Take an idle connection, opening a new one while below size"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_open = self._reserved < self.size
+            if can_open:
+                self._reserved += 1
+
+        if not can_open:
+            return self._idle.get()
+
+        try:
+            conn = self._connect()
+        except Exception:
+            with self._lock:
+                self._reserved -= 1
+            raise
+        with self._lock:
+            self._opened.append(conn)
+        return conn
+
+    def close_all(self):
+        """Close every connection the pool has opened"""
+        with self._lock:
+            opened, self._opened = self._opened, []
+            self._reserved = 0
+        for conn in opened:
+            try:
+                conn.close()
+            except Exception:
+                pass
@@ -0,0 +1,73 @@
+"""
+Keyset-Paginated Table Reader
+
+Reads a table in primary-key order, one page of at most page_size rows per
+statement, continuing each page after the key of the last row read
+(WHERE key > last ORDER BY key). Compared with a single SELECT ... ORDER BY 1:
+
+- on a clustered / indexed key the server walks the index instead of sorting
+- each statement is short, so locks and snapshots are not held for the
+  whole table
+- the last key read is a resume point (see iter_keyset_pages' after)
+
+The SQL for a page comes from the dialect's keyset_page_query.
+"""
+
+from typing import Callable, Iterator, List, Optional, Tuple
+
+# Rows per keyset page; each page is one statement
+DEFAULT_PAGE_SIZE = 50000
+
+
+def iter_query_batches(cursor, sql: str, params: tuple = (),
+                       batch_size: int = 5000) -> Iterator[Tuple[List[str], list]]:
+    """Run one query and yield (columns, rows) batches of raw cursor rows
+
+    The cursor is closed even if the consumer stops early or raises, so a
+    named (server-side) cursor can be declared again on the connection.
+    """
+    try:
+        cursor.execute(sql, params)
+        columns = None
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                break
+            # Column descriptions of a named (server-side) cursor are only available after the first fetch
+            if columns is None:
+                columns = [column[0] for column in cursor.description]
+            yield columns, batch
+    finally:
+        cursor.close()
+
+
+def iter_keyset_pages(conn, dialect, schema: str, table_name: str, key_columns: List[str],
+                      page_size: int = DEFAULT_PAGE_SIZE, batch_size: int = 5000,
+                      where: Optional[str] = None, params: tuple = (),
+                      after: Optional[tuple] = None,
+                      on_page: Optional[Callable[[tuple], None]] = None) -> Iterator[Tuple[List[str], list]]:
+    """Yield (columns, rows) batches of raw cursor rows in primary-key order
+
+    where and params further restrict the rows (e.g. a key window). Reading
+    starts after the key tuple after when given. on_page is called with the
+    key of the last row of each page once all its batches have been
+    consumed, e.g. to checkpoint progress.
+    """
+    while True:
+        sql, page_params = dialect.keyset_page_query(schema, table_name, key_columns, page_size,
+                                                     after, where, params)
+        fetched = 0
+        last_row, key_positions = None, None
+        for columns, batch in iter_query_batches(conn.cursor(), sql, page_params, batch_size):
+            if key_positions is None:
+                key_positions = [columns.index(column) for column in key_columns]
+            fetched += len(batch)
+            last_row = batch[-1]
+            yield columns, batch
+
+        if last_row is not None:
+            after = tuple(last_row[position] for position in key_positions)
+            if on_page:
+                on_page(after)
+        if fetched < page_size:
+            return
@@ -0,0 +1,163 @@
+"""
+Live Merge Join Row Diff
+
+Compares two copies of a table while reading both live databases at the
+same time. Each side is read in primary-key order, a page at a time (see
+keyset_reader.py); page fetches run on worker threads through
+asyncio.to_thread, and the next page of each side is requested before the
+current pages are compared. Source and target are therefore read
+concurrently, so a table takes about as long as its slower side rather
+than the sum of both, and rows are matched with a merge join as they
+arrive: nothing is written to disk and at most two pages per side are
+held in memory.
+
+The drivers (pyodbc, psycopg2) stay blocking; each side's connection is
+only ever used by one thread at a time. Keys are compared in Python, so
+both sides must return rows in the same key order: use integer keys. Text
+keys sort by collation, which can differ between servers.
+"""
+
+import asyncio
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+class MergeJoinDiff:
+    """Counts and sample keys of the rows that differ between two table copies"""
+
+    def __init__(self, key_columns: List[str]):
+        self.key_columns = key_columns
+        self.key_column = ', '.join(key_columns)
+        self.counts = {'added': 0, 'removed': 0, 'changed': 0}
+        self.samples = {'added': [], 'removed': [], 'changed': []}
+        self.rows_read = 0
+        self.seconds = {'source': 0.0, 'target': 0.0, 'elapsed': 0.0}
+
+    @property
+    def is_empty(self) -> bool:
+        """True when both copies hold the same rows"""
+        return not any(self.counts.values())
+
+    def record(self, change: str, key: tuple, max_keys: int = 20):
+        """Count a differing row, keeping its key if it is among the first max_keys"""
+        self.counts[change] += 1
+        if len(self.samples[change]) < max_keys:
+            self.samples[change].append(key[0] if len(key) == 1 else key)
+
+    def summary(self) -> Dict:
+        """JSON-friendly summary with the first keys of each kind"""
+        summary = {'key_column': self.key_column}
+        summary.update(self.counts)
+        for change, keys in self.samples.items():
+            summary[f'{change}_keys'] = keys
+        summary['rows_read'] = self.rows_read
+        summary['seconds'] = {side: round(seconds, 3) for side, seconds in self.seconds.items()}
+        return summary
+
+
+class _PrefetchingReader:
+    """Rows of a batch iterator, with the next batch always being fetched on a worker thread"""
+
+    def __init__(self, batches: Iterable[List[Dict]], timings: Dict[str, float], side: str):
+        self._batches = iter(batches)
+        self._timings = timings
+        self._side = side
+        self._batch = []
+        self._index = 0
+        self._pending = None
+        self._done = False
+
+    def _fetch(self) -> Optional[List[Dict]]:
+        """Next batch, or None when the iterator is exhausted (runs on a worker thread)"""
+        started = time.perf_counter()
+        try:
+            return next(self._batches, None)
+        finally:
+            self._timings[self._side] += time.perf_counter() - started
+
+    def start(self):
+        """Request the first batch"""
+        self._pending = asyncio.ensure_future(asyncio.to_thread(self._fetch))
+
+    async def next_row(self) -> Optional[Dict]:
+        """Next row, or None after the last one"""
+        while self._index >= len(self._batch):
+            if self._done:
+                return None
+            batch = await self._pending
+            if batch is None:
+                self._done = True
+                self._batch, self._index = [], 0
+                return None
+            self._batch, self._index = batch, 0
+            self._pending = asyncio.ensure_future(asyncio.to_thread(self._fetch))
+        row = self._batch[self._index]
+        self._index += 1
+        return row
+
+    async def close(self):
+        """Wait for an outstanding fetch, so the connection is free again"""
+        if self._pending is not None and not self._pending.done():
+            await asyncio.gather(self._pending, return_exceptions=True)
+
+
+async def merge_join_diff(before: Iterable[List[Dict]], after: Iterable[List[Dict]], key_columns: List[str],
+                          writer=None, table: str = '') -> MergeJoinDiff:
+    """Diff two row batch streams ordered by key_columns, writing each difference to writer
+
+    writer takes write(table, change, key, before, after), as
+    row_diff.DiffFileWriter does.
+    """
+    diff = MergeJoinDiff(key_columns)
+    started = time.perf_counter()
+    source = _PrefetchingReader(before, diff.seconds, 'source')
+    target = _PrefetchingReader(after, diff.seconds, 'target')
+    source.start()
+    target.start()
+
+    def key_of(row: Dict) -> tuple:
+        return tuple(row[column] for column in key_columns)
+
+    def emit(change: str, key: tuple, before_row: Optional[Dict], after_row: Optional[Dict]):
+        diff.record(change, key)
+        if writer:
+            writer.write(table, change, dict(zip(key_columns, key)), before_row, after_row)
+
+    try:
+        before_row = await source.next_row()
+        after_row = await target.next_row()
+        while before_row is not None or after_row is not None:
+            before_key = key_of(before_row) if before_row is not None else None
+            after_key = key_of(after_row) if after_row is not None else None
+            if after_row is None or (before_row is not None and before_key < after_key):
+                emit('removed', before_key, before_row, None)
+                diff.rows_read += 1
+                before_row = await source.next_row()
+            elif before_row is None or after_key < before_key:
+                emit('added', after_key, None, after_row)
+                diff.rows_read += 1
+                after_row = await target.next_row()
+            else:
+                if before_row != after_row:
+                    emit('changed', before_key, before_row, after_row)
+                diff.rows_read += 2
+                before_row = await source.next_row()
+                after_row = await target.next_row()
+    finally:
+        await source.close()
+        await target.close()
+        diff.seconds['elapsed'] = time.perf_counter() - started
+    return diff
+
+
+def run_merge_join(before: Iterable[List[Dict]], after: Iterable[List[Dict]], key_columns: List[str],
+                   writer=None, table: str = '') -> MergeJoinDiff:
+    """Blocking wrapper around merge_join_diff"""
+    return asyncio.run(merge_join_diff(before, after, key_columns, writer, table))
+
+
+def read_concurrently(*readers: Callable[[], object]) -> list:
+    """Call blocking readers (e.g. one per database) at the same time and return their results in order"""
+    async def gather():
+        return await asyncio.gather(*(asyncio.to_thread(reader) for reader in readers))
+    return list(asyncio.run(gather()))
@@ -0,0 +1,93 @@
+"""
+Parallel Partitioned Loading
+
+Splits the rows of each table into partitions (disjoint ranges of row
+positions) and loads them on N worker processes, each with its own
+database connection. Generating rows is CPU-bound Python, so processes
+are used instead of threads, and several connections keep the server
+busy while each worker formats its next batch.
+
+Partitions of child tables are aligned with those of their parent table:
+partition i of a child table only references rows of partition i of its
+parent. A partition may depend on one parent partition, and the scheduler
+submits it as soon as that parent has finished, i.e. as soon as its rows
+are committed, instead of waiting for the whole parent table. Tables
+without a parent start at once.
+
+A worker runs one partition at a time in its own transaction; partitions
+committed before a failure stay in the database, as with the sequential
+load.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+
+def partitions(count: int, parts: int) -> List[Tuple[int, int]]:
+    """(first row, row count) of parts nearly equal partitions of count rows
+
+    Always returns parts partitions (some empty if count < parts), so the
+    partitions of a child table line up with those of its parent.
+    """
+    size, remainder = divmod(count, parts)
+    result = []
+    first_row = 0
+    for index in range(parts):
+        rows = size + (1 if index < remainder else 0)
+        result.append((first_row, rows))
+        first_row += rows
+    return result
+
+
+class PartitionScheduler:
+    """Runs partition loads on worker processes in dependency order"""
+
+    def __init__(self, workers: int, initializer: Optional[Callable] = None, initargs: tuple = ()):
+        self.workers = max(1, workers)
+        self.initializer = initializer
+        self.initargs = initargs
+        self.tasks = {}
+
+    def add(self, key: Hashable, function: Callable, *args, parent: Hashable = None):
+        """Run function(*args) in a worker, or function(*args, parent result) once parent has finished
+
+        function must be a module-level function, so that it can be sent
+        to the worker processes.
+        """
+        if key in self.tasks:
+            raise ValueError(f"Duplicate partition: {key}")
+        if parent is not None and parent not in self.tasks:
+            raise ValueError(f"Parent of {key} not scheduled: {parent}")
+        self.tasks[key] = (function, args, parent)
+
+    def run(self, on_done: Optional[Callable[[Hashable, object], None]] = None) -> Dict[Hashable, object]:
+        """Run every partition, returning the result of each by key
+
+        on_done(key, result) is called in this process as partitions
+        finish. The first failure cancels the partitions not yet started and
+        is raised once the running ones have finished.
+        """
+        results = {}
+        pending = dict(self.tasks)
+        running = {}
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=self.initializer,
+                                 initargs=self.initargs) as executor:
+            while pending or running:
+                # Submit every partition whose parent has finished, in the order added
+                for key in [key for key, (_, _, parent) in pending.items() if parent is None or parent in results]:
+                    function, args, parent = pending.pop(key)
+                    if parent is not None:
+                        args = args + (results[parent],)
+                    running[executor.submit(function, *args)] = key
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = running.pop(future)
+                    try:
+                        results[key] = future.result()
+                    except Exception:
+                        for other in running:
+                            other.cancel()
+                        raise
+                    if on_done:
+                        on_done(key, results[key])
+        return results
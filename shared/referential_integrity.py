@@ -0,0 +1,216 @@
+"""
+Set-Based Referential Integrity Checks
+
+Generates one orphan check per foreign key from the catalog snapshot (see
+catalog.py), composite keys included, instead of a hand-written LEFT JOIN
+per relationship. Each check is an anti-join: child rows whose key columns
+are all set but have no matching parent row (MATCH SIMPLE semantics).
+
+Checks run concurrently on a bounded pool of connections (see
+connection_pool.py), or as a single UNION ALL statement per database:
+
+  parallel  one statement per check, spread over the pool's connections
+  batch     all checks in one UNION ALL round trip
+
+Child tables above large_table_rows rows (by catalog statistics, see
+row_counts.py) can be checked more cheaply:
+
+  full      count every orphan
+  sample    count orphans in a TABLESAMPLE of the child and scale the count
+            up; an estimate that can miss rare orphans
+  probe     stop at the first orphan (EXISTS); the parent side is a seek on
+            its key index, and the result is only "none" or "some"
+
+Each check is timed; in batch mode the checks share one statement, so only
+the time of the whole batch is known.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from connection_pool import ConnectionPool
+
+INTEGRITY_MODES = ('parallel', 'batch')
+LARGE_TABLE_MODES = ('full', 'sample', 'probe')
+
+DEFAULT_INTEGRITY_WORKERS = 4
+# Child tables above this many rows use the large table mode
+DEFAULT_LARGE_TABLE_ROWS = 10000000
+DEFAULT_SAMPLE_PERCENT = 1.0
+
+
+class OrphanCheck:
+    """One foreign key: child columns that must match a parent key"""
+
+    def __init__(self, schema: str, table_name: str, name: str, columns: List[str],
+                 referenced_schema: str, referenced_table: str, referenced_columns: List[str]):
+        self.schema = schema
+        self.table_name = table_name
+        self.name = name
+        self.columns = columns
+        self.referenced_schema = referenced_schema
+        self.referenced_table = referenced_table
+        self.referenced_columns = referenced_columns
+
+    @property
+    def label(self) -> str:
+        """schema.table.column(s) of the child side"""
+        return f"{self.schema}.{self.table_name}.{', '.join(self.columns)}"
+
+    @property
+    def referenced_label(self) -> str:
+        """schema.table(column(s)) of the parent side"""
+        return f"{self.referenced_schema}.{self.referenced_table}({', '.join(self.referenced_columns)})"
+
+
+class OrphanResult:
+    """Outcome of one orphan check
+
+    orphans is exact for 'full', an estimate for 'sample' and 0 or 1 for
+    'probe'. seconds is None for checks run as part of a batch.
+    """
+
+    def __init__(self, check: OrphanCheck, method: str, orphans: int, seconds: Optional[float] = None):
+        self.check = check
+        self.method = method
+        self.orphans = orphans
+        self.seconds = seconds
+
+    @property
+    def is_clean(self) -> bool:
+        """True when no orphaned row was found"""
+        return self.orphans == 0
+
+    def describe(self) -> str:
+        """Human-readable outcome, e.g. for a test log"""
+        if self.is_clean:
+            found = "No orphaned records"
+        elif self.method == 'probe':
+            found = "Orphaned records found"
+        elif self.method == 'sample':
+            found = f"~{self.orphans} orphaned records (estimated)"
+        else:
+            found = f"{self.orphans} orphaned records"
+        details = [self.method] + ([f"{self.seconds:.2f}s"] if self.seconds is not None else [])
+        return f"{found} ({', '.join(details)})"
+
+
+def foreign_key_checks(catalog) -> List[OrphanCheck]:
+    """Orphan checks for every foreign key in a catalog snapshot
+
+    The catalog holds one entry per column pair; the pairs of a composite
+    key are joined into a single check.
+    """
+    checks = []
+    for schema, table_name in catalog.tables():
+        grouped = {}
+        for foreign_key in catalog.foreign_keys(schema, table_name, include_schema=True):
+            check = grouped.get(foreign_key['name'])
+            if check is None:
+                check = OrphanCheck(schema, table_name, foreign_key['name'], [],
+                                    foreign_key.get('referenced_schema') or schema,
+                                    foreign_key['referenced_table'], [])
+                grouped[foreign_key['name']] = check
+                checks.append(check)
+            check.columns.append(foreign_key['parent_column'])
+            check.referenced_columns.append(foreign_key['referenced_column'])
+    return checks
+
+
+class ReferentialIntegrityChecker:
+    """Runs orphan checks of one database following an integrity mode"""
+
+    def __init__(self, dialect, connect: Callable, workers: int = DEFAULT_INTEGRITY_WORKERS,
+                 mode: str = 'parallel', estimates: Optional[Dict[Tuple[str, str], int]] = None,
+                 large_table_mode: str = 'full', large_table_rows: int = DEFAULT_LARGE_TABLE_ROWS,
+                 sample_percent: float = DEFAULT_SAMPLE_PERCENT):
+        if mode not in INTEGRITY_MODES:
+            raise ValueError(f"Unknown integrity mode: {mode}")
+        if large_table_mode not in LARGE_TABLE_MODES:
+            raise ValueError(f"Unknown large table mode: {large_table_mode}")
+        self.dialect = dialect
+        self.connect = connect
+        self.workers = max(1, workers)
+        self.mode = mode
+        self.estimates = estimates or {}
+        self.large_table_mode = large_table_mode
+        self.large_table_rows = large_table_rows
+        self.sample_percent = sample_percent
+        self.seconds = None
+
+    def method(self, check: OrphanCheck) -> str:
+        """'full', 'sample' or 'probe' for a check, by the size of its child table"""
+        rows = self.estimates.get((check.schema, check.table_name))
+        if rows is not None and rows > self.large_table_rows:
+            return self.large_table_mode
+        return 'full'
+
+    def query(self, check: OrphanCheck, method: str) -> str:
+        """SELECT returning the orphan count of a check (0 / 1 for a probe)"""
+        child = self.dialect.quote_table(check.schema, check.table_name)
+        parent = self.dialect.quote_table(check.referenced_schema, check.referenced_table)
+        sample = f" {self.dialect.table_sample_clause(self.sample_percent)}" if method == 'sample' else ""
+        not_null = " AND ".join(f"c.{self.dialect.quote_column(column)} IS NOT NULL" for column in check.columns)
+        matches = " AND ".join(
+            f"p.{self.dialect.quote_column(referenced)} = c.{self.dialect.quote_column(column)}"
+            for column, referenced in zip(check.columns, check.referenced_columns))
+        orphans = (f"FROM {child} AS c{sample} WHERE {not_null} "
+                   f"AND NOT EXISTS (SELECT 1 FROM {parent} AS p WHERE {matches})")
+        if method == 'probe':
+            return f"SELECT CASE WHEN EXISTS (SELECT 1 {orphans}) THEN 1 ELSE 0 END"
+        return f"SELECT COUNT(*) {orphans}"
+
+    def _result(self, check: OrphanCheck, method: str, found: int, seconds: Optional[float]) -> OrphanResult:
+        """Result of a check, scaling sampled counts up to the whole table"""
+        found = int(found or 0)
+        if method == 'sample' and found:
+            found = max(1, int(round(found * 100.0 / self.sample_percent)))
+        return OrphanResult(check, method, found, seconds)
+
+    def _run_one(self, conn, check: OrphanCheck) -> OrphanResult:
+        """Run a single check on a connection"""
+        method = self.method(check)
+        started = time.perf_counter()
+        cursor = conn.cursor()
+        cursor.execute(self.query(check, method))
+        found = cursor.fetchone()[0]
+        return self._result(check, method, found, time.perf_counter() - started)
+
+    def _run_batch(self, conn, checks: List[OrphanCheck]) -> List[OrphanResult]:
+        """Run all checks as one UNION ALL statement"""
+        methods = [self.method(check) for check in checks]
+        sql = "\nUNION ALL\n".join(
+            f"SELECT {index} AS check_index, ({self.query(check, method)}) AS orphans"
+            for index, (check, method) in enumerate(zip(checks, methods)))
+        cursor = conn.cursor()
+        cursor.execute(sql)
+        found = {int(index): orphans for index, orphans in cursor.fetchall()}
+        return [self._result(check, method, found.get(index), None)
+                for index, (check, method) in enumerate(zip(checks, methods))]
+
+    def run(self, checks: List[OrphanCheck], conn=None) -> List[OrphanResult]:
+        """Run checks and return their results in the order given
+
+        With conn, the checks run on that connection (which is left open)
+        instead of on a pool of new connections.
+        """
+        started = time.perf_counter()
+        try:
+            if not checks:
+                return []
+            if conn is not None and self.mode == 'batch':
+                return self._run_batch(conn, checks)
+            if conn is not None:
+                return [self._run_one(conn, check) for check in checks]
+
+            pool = ConnectionPool(self.connect, 1 if self.mode == 'batch' else min(self.workers, len(checks)))
+            try:
+                if self.mode == 'batch':
+                    return pool.run(self._run_batch, checks)
+                with ThreadPoolExecutor(max_workers=pool.size) as executor:
+                    return list(executor.map(lambda check: pool.run(self._run_one, check), checks))
+            finally:
+                pool.close_all()
+        finally:
+            self.seconds = time.perf_counter() - started
@@ -0,0 +1,70 @@
+"""
+Row Count Strategies
+
+COUNT(*) scans the whole table (or its smallest index), which is slow on
+large heaps. The catalog keeps a row count per table that can be read for
+every table in one query instead:
+
+  exact   SELECT COUNT(*) per table
+  stats   catalog statistics only (sys.partitions on SQL Server,
+          pg_class.reltuples / pg_stat_user_tables on PostgreSQL); fast but
+          may lag behind recent writes, especially on PostgreSQL
+  hybrid  statistics first; COUNT(*) only when the statistics differ from
+          the statistics recorded on the other side (e.g. in the baseline)
+"""
+
+from typing import Dict, Optional
+
+ROW_COUNT_MODES = ('exact', 'stats', 'hybrid')
+
+
+class RowCounter:
+    """Row counts of one database following a row count strategy"""
+
+    def __init__(self, dialect, conn, mode: str = 'exact'):
+        if mode not in ROW_COUNT_MODES:
+            raise ValueError(f"Unknown row count mode: {mode}")
+        self.dialect = dialect
+        self.mode = mode
+        self.estimates = dialect.estimated_row_counts(conn)
+        self.sources = {}
+
+    def estimate(self, schema: str, table_name: str) -> Optional[int]:
+        """Row count from catalog statistics, if known"""
+        return self.estimates.get((schema, table_name))
+
+    def count(self, conn, schema: str, table_name: str, other_estimate: Optional[int] = None,
+              other_count: Optional[int] = None) -> int:
+        """Row count of a table
+
+        In hybrid mode, other_estimate and other_count are the statistics
+        and exact count of the same table on the other side. When both
+        statistics agree the other count is reused; otherwise, and when the
+        other side has no statistics, the table is counted exactly.
+        """
+        estimate = self.estimate(schema, table_name)
+        if self.mode == 'stats' and estimate is not None:
+            self.sources[(schema, table_name)] = 'stats'
+            return estimate
+        if (self.mode == 'hybrid' and estimate is not None and other_count is not None
+                and estimate == other_estimate):
+            self.sources[(schema, table_name)] = 'stats'
+            return other_count
+
+        self.sources[(schema, table_name)] = 'exact'
+        return self.dialect.exact_row_count(conn, schema, table_name)
+
+    def summary(self) -> Dict[str, int]:
+        """Number of tables counted from statistics and exactly"""
+        counts = {'stats': 0, 'exact': 0}
+        for source in self.sources.values():
+            counts[source] += 1
+        return counts
+
+    def estimates_by_name(self, tables) -> Dict[str, int]:
+        """Statistics of the given (schema, table) pairs keyed by 'schema.table'"""
+        return {
+            f"{schema}.{table_name}": self.estimates[(schema, table_name)]
+            for schema, table_name in tables
+            if (schema, table_name) in self.estimates
+        }
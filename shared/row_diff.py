@@ -0,0 +1,232 @@
+"""
+Hash Join Row Diff
+
+Matches the rows of two copies of a table on their primary key in O(n):
+the before side is loaded into a hash index of key -> row digest and the
+after side is streamed past it. After rows whose key is not in the index
+were added, index entries never matched were removed, and keys whose
+digests differ were changed; changed rows are reported with their
+per-column differences.
+
+Tables with more rows than fit comfortably in memory are first split by
+key hash into partition files on disk (a Grace hash join), so only the
+keys and digests of one partition are held at a time. Row payloads stay in
+the partition files and are read back only for rows that differ.
+
+Unlike range_diff.bisect_diff this needs no integer key: any primary key,
+composite keys included, can be joined on. Differences are reported in
+partition order, not key order.
+"""
+
+import csv
+import json
+import os
+import tempfile
+import zlib
+from typing import Dict, Iterable, List, Optional
+
+from row_hashing import row_digest
+
+# Rows per hash partition; larger tables are partitioned on disk
+DEFAULT_MEMORY_ROWS = 200000
+
+
+def partition_count(row_count: int, memory_rows: int = DEFAULT_MEMORY_ROWS) -> int:
+    """Number of hash partitions needed to keep each under memory_rows rows"""
+    return max(1, -(-row_count // memory_rows))
+
+
+class DiffFileWriter:
+    """Writes row differences as JSON lines, or as CSV for a .csv filename
+
+    JSON lines hold one record per row: table, change, key and either the
+    added / removed row or the changed columns as {column: [before, after]}.
+    CSV has one line per changed column (table, change, key, column, before,
+    after); added and removed rows are a single line with the row as JSON.
+    """
+
+    CSV_FIELDS = ['table', 'change', 'key', 'column', 'before', 'after']
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.is_csv = filename.lower().endswith('.csv')
+        self.rows_written = 0
+        self._file = open(filename, 'w', encoding='utf-8', newline='' if self.is_csv else None)
+        self._csv = None
+        if self.is_csv:
+            self._csv = csv.writer(self._file)
+            self._csv.writerow(self.CSV_FIELDS)
+
+    def write(self, table: str, change: str, key: Dict, before: Optional[Dict] = None,
+              after: Optional[Dict] = None):
+        """Record one added, removed or changed row"""
+        self.rows_written += 1
+        if change == 'changed':
+            columns = changed_columns(before, after)
+            if self._csv:
+                for column, (old, new) in columns.items():
+                    self._csv.writerow([table, change, _to_json(key), column, _to_json(old), _to_json(new)])
+            else:
+                self._write_line({'table': table, 'change': change, 'key': key, 'columns': columns})
+            return
+
+        row = after if change == 'added' else before
+        if self._csv:
+            self._csv.writerow([table, change, _to_json(key), '',
+                                _to_json(before) if before is not None else '',
+                                _to_json(after) if after is not None else ''])
+        else:
+            self._write_line({'table': table, 'change': change, 'key': key, 'row': row})
+
+    def _write_line(self, record: Dict):
+        """Append one JSON line"""
+        self._file.write(json.dumps(record, default=str, separators=(',', ':')) + '\n')
+
+    def close(self):
+        """Close the diff file"""
+        self._file.close()
+
+
+def _to_json(value) -> str:
+    """Compact JSON text of a CSV cell value"""
+    return json.dumps(value, default=str, separators=(',', ':'))
+
+
+def changed_columns(before: Dict, after: Dict) -> Dict[str, list]:
+    """{column: [before, after]} for the columns whose values differ"""
+    return {
+        column: [before.get(column), after.get(column)]
+        for column in sorted(set(before) | set(after))
+        if before.get(column) != after.get(column)
+    }
+
+
+class HashJoinDiff:
+    """Counts and sample keys of the rows that differ between two table copies"""
+
+    def __init__(self, key_columns: List[str], partitions: int = 1):
+        self.key_columns = key_columns
+        self.key_column = ', '.join(key_columns)
+        self.partitions = partitions
+        self.counts = {'added': 0, 'removed': 0, 'changed': 0}
+        self.samples = {'added': [], 'removed': [], 'changed': []}
+        self.rows_read = 0
+
+    @property
+    def is_empty(self) -> bool:
+        """True when both copies hold the same rows"""
+        return not any(self.counts.values())
+
+    def record(self, change: str, key: list, max_keys: int = 20):
+        """Count a differing row, keeping its key if it is among the first max_keys"""
+        self.counts[change] += 1
+        if len(self.samples[change]) < max_keys:
+            self.samples[change].append(key[0] if len(key) == 1 else tuple(key))
+
+    def summary(self) -> Dict:
+        """JSON-friendly summary with the first keys of each kind"""
+        summary = {'key_column': self.key_column}
+        summary.update(self.counts)
+        for change, keys in self.samples.items():
+            summary[f'{change}_keys'] = keys
+        summary['partitions'] = self.partitions
+        summary['rows_read'] = self.rows_read
+        return summary
+
+
+def hash_join_diff(before: Iterable[Dict], after: Iterable[Dict], key_columns: List[str],
+                   writer: Optional[DiffFileWriter] = None, table: str = '', partitions: int = 1,
+                   spill_dir: Optional[str] = None) -> HashJoinDiff:
+    """Diff two row streams on key_columns, writing each difference to writer
+
+    With partitions > 1 both sides are first spilled to that many partition
+    files in a temporary directory (under spill_dir when given).
+    """
+    diff = HashJoinDiff(key_columns, partitions)
+    if partitions <= 1:
+        index = {}
+        for row in before:
+            index[_key_text(row, key_columns)] = (row_digest(row), row)
+        diff.rows_read += len(index)
+        for row in after:
+            diff.rows_read += 1
+            key = _key_text(row, key_columns)
+            entry = index.pop(key, None)
+            if entry is None:
+                _emit(diff, writer, table, 'added', key, None, row)
+            elif entry[0] != row_digest(row):
+                _emit(diff, writer, table, 'changed', key, entry[1], row)
+        for key, (_, row) in index.items():
+            _emit(diff, writer, table, 'removed', key, row, None)
+        return diff
+
+    with tempfile.TemporaryDirectory(dir=spill_dir) as directory:
+        before_paths = _partition(before, key_columns, partitions, directory, 'before')
+        after_paths = _partition(after, key_columns, partitions, directory, 'after')
+        for before_path, after_path in zip(before_paths, after_paths):
+            _join_partition(before_path, after_path, diff, writer, table)
+    return diff
+
+
+def _key_text(row: Dict, key_columns: List[str]) -> str:
+    """JSON text of a row's key, used as the hash index key"""
+    return json.dumps([row.get(column) for column in key_columns], default=str)
+
+
+def _emit(diff: HashJoinDiff, writer: Optional[DiffFileWriter], table: str, change: str, key_text: str,
+          before: Optional[Dict], after: Optional[Dict]):
+    """Count a difference and write it out"""
+    key = json.loads(key_text)
+    diff.record(change, key)
+    if writer:
+        writer.write(table, change, dict(zip(diff.key_columns, key)), before, after)
+
+
+def _partition(rows: Iterable[Dict], key_columns: List[str], partitions: int, directory: str,
+               side: str) -> List[str]:
+    """Spill rows into partition files of 'digest<TAB>key<TAB>row' lines by key hash"""
+    paths = [os.path.join(directory, f"{side}.{index}.tsv") for index in range(partitions)]
+    files = [open(path, 'w', encoding='utf-8') for path in paths]
+    try:
+        for row in rows:
+            key = _key_text(row, key_columns)
+            # JSON escapes tabs inside strings, so tabs only ever separate fields
+            files[zlib.crc32(key.encode('utf-8')) % partitions].write(
+                f"{row_digest(row):064x}\t{key}\t{json.dumps(row, default=str)}\n")
+    finally:
+        for f in files:
+            f.close()
+    return paths
+
+
+def _join_partition(before_path: str, after_path: str, diff: HashJoinDiff,
+                    writer: Optional[DiffFileWriter], table: str):
+    """Hash join one pair of partition files"""
+    with open(before_path, 'rb') as before_file:
+        # key -> (digest, offset of the row's line); rows are read back only when they differ
+        index = {}
+        while True:
+            offset = before_file.tell()
+            line = before_file.readline()
+            if not line:
+                break
+            digest, key, _ = line.decode('utf-8').split('\t', 2)
+            index[key] = (digest, offset)
+        diff.rows_read += len(index)
+
+        def before_row(offset: int) -> Dict:
+            before_file.seek(offset)
+            return json.loads(before_file.readline().decode('utf-8').split('\t', 2)[2])
+
+        with open(after_path, 'r', encoding='utf-8') as after_file:
+            for line in after_file:
+                diff.rows_read += 1
+                digest, key, row = line.split('\t', 2)
+                entry = index.pop(key, None)
+                if entry is None:
+                    _emit(diff, writer, table, 'added', key, None, json.loads(row))
+                elif entry[0] != digest:
+                    _emit(diff, writer, table, 'changed', key, before_row(entry[1]), json.loads(row))
+
+        for key, (_, offset) in index.items():
+            _emit(diff, writer, table, 'removed', key, before_row(offset), None)
@@ -0,0 +1,172 @@
+"""
+Table Checksum Helpers
+
+Accumulates a table checksum batch by batch while rows are streamed from the
+database, so the caller never has to keep the table rows around.
+
+The checksum is order independent: every row (primary key columns included)
+is hashed on its own and the row digests are summed modulo 2**256. Rows can
+therefore arrive in any order and in any batch split, and the same table gives
+the same checksum in the SQL Server and PostgreSQL tooling as long as rows are
+converted to the same JSON-serializable values.
+
+Because checksums are sums, the checksums of key ranges add up to the table
+checksum. With a key column, TableChecksum also keeps the checksum of every
+key range (the same buckets as the server-side range hashes), so a verifier
+can check part of a table against a baseline without hashing its rows again.
+"""
+
+import hashlib
+import json
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Stored in baselines so that checksums from older files can be recognised
+CHECKSUM_ALGORITHM = 'sha256-rowsum'
+
+_MODULUS = 1 << 256
+
+
+def row_digest(row: Dict) -> int:
+    """Hash a single row dict into a 256-bit integer"""
+    encoded = json.dumps(row, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')
+    return int.from_bytes(hashlib.sha256(encoded).digest(), 'big')
+
+
+class TableChecksum:
+    """Incremental, order-independent table checksum
+
+    With key_column and range_size, a checksum per key range
+    (key_bucket of the key) is kept as well.
+    """
+
+    def __init__(self, key_column: Optional[str] = None, range_size: Optional[int] = None):
+        self.row_count = 0
+        self._total = 0
+        self.key_column = key_column
+        self.range_size = range_size
+        # bucket -> [row count, digest sum]
+        self._ranges = {}
+
+    def update(self, rows: Iterable[Dict]):
+        """Add a batch of rows to the checksum"""
+        total = self._total
+        count = 0
+        if self.key_column:
+            ranges = self._ranges
+            for row in rows:
+                digest = row_digest(row)
+                total += digest
+                count += 1
+                entry = ranges.setdefault(key_bucket(int(row[self.key_column]), self.range_size), [0, 0])
+                entry[0] += 1
+                entry[1] = (entry[1] + digest) % _MODULUS
+        else:
+            for row in rows:
+                total += row_digest(row)
+                count += 1
+        self._total = total % _MODULUS
+        self.row_count += count
+
+    def merge(self, other: 'TableChecksum'):
+        """Add the rows of another checksum, e.g. one covering a different key range"""
+        self._total = (self._total + other._total) % _MODULUS
+        self.row_count += other.row_count
+        for bucket, (count, total) in other._ranges.items():
+            entry = self._ranges.setdefault(bucket, [0, 0])
+            entry[0] += count
+            entry[1] = (entry[1] + total) % _MODULUS
+
+    def hexdigest(self) -> str:
+        """Return the checksum of all rows seen so far"""
+        return f"{self._total:064x}"
+
+    def range_checksums(self) -> List[list]:
+        """JSON-friendly [[bucket, count, checksum], ...] of the key ranges seen so far"""
+        return [[bucket, count, f"{total:064x}"] for bucket, (count, total) in sorted(self._ranges.items())]
+
+
+class TableScan:
+    """Row count, checksum and optionally the rows of one pass over a table
+
+    Feed it the row batches of a table once; each batch is counted, hashed,
+    handed to sink (e.g. a baseline writer) and kept in rows when keep_rows
+    is set, so no second query is needed for the count or the payload.
+    """
+
+    def __init__(self, keep_rows: bool = False, sink: Optional[Callable[[List[Dict]], None]] = None,
+                 key_column: Optional[str] = None, range_size: Optional[int] = None):
+        self.checksum = TableChecksum(key_column, range_size)
+        self.rows = [] if keep_rows else None
+        self.sink = sink
+
+    @property
+    def row_count(self) -> int:
+        """Rows seen so far"""
+        return self.checksum.row_count
+
+    def consume(self, batches: Iterable[List[Dict]]) -> 'TableScan':
+        """Run the scan over an iterable of row batches"""
+        for batch in batches:
+            self.checksum.update(batch)
+            if self.sink:
+                self.sink(batch)
+            if self.rows is not None:
+                self.rows.extend(batch)
+        return self
+
+
+def calculate_checksum(data: Iterable[Dict]) -> str:
+    """Calculate the checksum of a complete list of rows"""
+    checksum = TableChecksum()
+    checksum.update(data)
+    return checksum.hexdigest()
+
+
+def combine_checksums(checksums: Iterable[str]) -> str:
+    """Checksum of the union of disjoint row sets, e.g. of several key ranges"""
+    total = 0
+    for checksum in checksums:
+        total += int(checksum, 16)
+    return f"{total % _MODULUS:064x}"
+
+
+def key_bucket(key: int, range_size: int) -> int:
+    """Key range a key falls into (key / range_size, truncated toward zero like SQL)"""
+    bucket = abs(key) // range_size
+    return bucket if key >= 0 else -bucket
+
+
+def bucket_bounds(bucket: int, range_size: int) -> Tuple[int, int]:
+    """Half-open [low, high) key bounds of a key range"""
+    if bucket > 0:
+        return bucket * range_size, (bucket + 1) * range_size
+    if bucket < 0:
+        return (bucket - 1) * range_size + 1, bucket * range_size + 1
+    return -range_size + 1, range_size
+
+
+def combine_range_hashes(ranges: Dict[int, Tuple[int, str]]) -> str:
+    """Combine per-range (count, hash) pairs into a single table hash"""
+    digest = hashlib.sha256()
+    for bucket in sorted(ranges):
+        count, range_hash = ranges[bucket]
+        digest.update(f"{bucket}:{count}:{range_hash};".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def differing_ranges(before: Dict[int, Tuple[int, str]], after: Dict[int, Tuple[int, str]]) -> List[int]:
+    """Buckets whose count or hash differs, including ranges present on one side only"""
+    return sorted(
+        bucket for bucket in set(before) | set(after)
+        if before.get(bucket) != after.get(bucket)
+    )
+
+
+def ranges_to_list(ranges: Dict[int, Tuple[int, str]]) -> List[list]:
+    """JSON-friendly [[bucket, count, hash], ...] form of range hashes"""
+    return [[bucket, count, range_hash] for bucket, (count, range_hash) in sorted(ranges.items())]
+
+
+def ranges_from_list(items: List[list]) -> Dict[int, Tuple[int, str]]:
+    """Inverse of ranges_to_list"""
+    return {int(bucket): (int(count), range_hash) for bucket, count, range_hash in items}
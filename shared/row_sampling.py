@@ -0,0 +1,72 @@
+"""
+Deterministic Row Sampling
+
+Picks the same rows of a table on every side of a comparison: a row is in
+the sample when a hash of its integer primary key is 0 modulo the sampling
+modulus. The hash, a multiplicative hash modulo the prime 2^31 - 1, is
+computed the same way in SQL (key_sample_clause) and in Python
+(in_key_sample), so a baseline file and a live database select the same
+keys without exchanging them. Neighbouring keys are spread over the sample
+rather than taken in runs, and the server only returns the sampled rows.
+
+Tables without an integer key can only be sampled with TABLESAMPLE, which
+reads random pages and so picks different rows on each side; those rows
+are looked up in the other side's rows instead, which finds changed and
+added rows but not removed ones.
+
+A sample of n rows contains at least one corrupted row with probability
+1 - (1 - rate)^n when a fraction rate of all rows is corrupted
+(detection_confidence); the number of rows does not depend on table size.
+"""
+
+import math
+
+SAMPLE_PRIME = 2147483647
+SAMPLE_MULTIPLIER = 1103515245
+
+# Corruption rate the detection confidence is reported for (0.1% of rows)
+DEFAULT_CORRUPTION_RATE = 0.001
+
+
+def sample_modulus(percent: float) -> int:
+    """Modulus selecting about percent of the keys"""
+    if not 0 < percent <= 100:
+        raise ValueError(f"Sample percentage must be in (0, 100]: {percent}")
+    return max(1, int(round(100.0 / percent)))
+
+
+def key_hash(key: int) -> int:
+    """Hash of an integer key, as computed by key_sample_clause"""
+    return abs(int(key)) % SAMPLE_PRIME * SAMPLE_MULTIPLIER % SAMPLE_PRIME
+
+
+def in_key_sample(key: int, modulus: int) -> bool:
+    """True when a key belongs to the sample"""
+    return key_hash(key) % modulus == 0
+
+
+def key_sample_clause(dialect, key_column: str, modulus: int) -> str:
+    """WHERE clause selecting the sampled keys on the server
+
+    Evaluated left to right in 64-bit integers, like key_hash; the values
+    are literals, so the clause needs no parameters.
+    """
+    column = dialect.quote_column(key_column)
+    return (f"ABS(CAST({column} AS BIGINT)) % {SAMPLE_PRIME} * {SAMPLE_MULTIPLIER} "
+            f"% {SAMPLE_PRIME} % {int(modulus)} = 0")
+
+
+def detection_confidence(sample_rows: int, rate: float) -> float:
+    """Probability that sample_rows random rows include a corrupted one"""
+    if rate <= 0 or sample_rows <= 0:
+        return 0.0
+    if rate >= 1:
+        return 1.0
+    return 1.0 - (1.0 - rate) ** sample_rows
+
+
+def rows_for_confidence(confidence: float, rate: float) -> int:
+    """Sample rows needed to detect a corruption rate with the given confidence"""
+    if rate >= 1:
+        return 1
+    return int(math.ceil(math.log(1.0 - confidence) / math.log(1.0 - rate)))
@@ -0,0 +1,78 @@
+"""
+Scale-Factor Data Sizing and Skew
+
+Sizes a generated dataset TPC-style: every table has a row count at scale
+factor 1 (SCALE_FACTOR_ROWS in each application's test_data/scale_factor.py)
+and is scaled linearly, so --scale-factor 10 yields ten times as many rows
+in every table with the same ratios between them.
+
+Foreign keys are drawn with a Zipf skew instead of uniformly: the parent of
+popularity rank k is chosen with weight 1 / k^skew, so a few parents have
+many children and most have one or two, as in production data. Ranks are
+shuffled over the parent keys, so popular parents are spread over the key
+range. A skew of 0 is uniform; 1 is the classic Zipf distribution.
+"""
+
+import random
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# Zipf exponent of the foreign key fan-out in scale factor mode
+DEFAULT_SKEW = 1.0
+
+
+def scaled_rows(base_rows: Dict[str, int], scale_factor: float) -> Dict[str, int]:
+    """Row count of every table of base_rows (counts at scale factor 1) at a scale factor, at least one each"""
+    if scale_factor <= 0:
+        raise ValueError(f"Scale factor must be positive: {scale_factor}")
+    return {table: max(1, int(round(rows * scale_factor))) for table, rows in base_rows.items()}
+
+
+class ZipfChooser:
+    """Picks keys with Zipf-distributed popularity"""
+
+    def __init__(self, keys: Sequence, skew: float = DEFAULT_SKEW, rng: random.Random = None):
+        if not keys:
+            raise ValueError("No keys to choose from")
+        self.rng = rng or random
+        self.keys = list(keys)
+        self.skew = skew
+        if skew:
+            # Popularity rank k of a shuffled key has weight 1 / k^skew
+            self.rng.shuffle(self.keys)
+            self.cum_weights = list(accumulate(1.0 / rank ** skew for rank in range(1, len(self.keys) + 1)))
+
+    def choose(self):
+        """One key"""
+        if not self.skew:
+            return self.rng.choice(self.keys)
+        point = self.rng.random() * self.cum_weights[-1]
+        return self.keys[min(bisect_right(self.cum_weights, point), len(self.keys) - 1)]
+
+    def choose_many(self, count: int) -> List:
+        """count keys, drawn independently"""
+        if not self.skew:
+            return [self.rng.choice(self.keys) for _ in range(count)]
+        return self.rng.choices(self.keys, cum_weights=self.cum_weights, k=count)
+
+
+def zipf_fanout(parent_keys: Sequence, total: int, skew: float = DEFAULT_SKEW, minimum: int = 0,
+                rng: random.Random = None) -> Iterable[Tuple[object, int]]:
+    """(parent key, child count) pairs giving total children, in parent key order
+
+    Every parent gets minimum children if total allows it; the rest are
+    spread over the parents with a Zipf skew.
+    """
+    counts = {key: 0 for key in parent_keys}
+    if not counts:
+        return
+    if minimum and total >= minimum * len(counts):
+        for key in counts:
+            counts[key] = minimum
+        total -= minimum * len(counts)
+    for key in ZipfChooser(parent_keys, skew, rng).choose_many(total):
+        counts[key] += 1
+    for key in parent_keys:
+        if counts[key]:
+            yield key, counts[key]
@@ -0,0 +1,157 @@
+"""
+Checks of verifier_engine.py that need no database
+
+Two baseline files are compared the way verify_migration.py
+--source-baseline/--target-baseline does, with a verifier whose connect()
+fails: neither the checks nor the row diff may open a connection. Row
+counts read from catalog statistics are checked against a baseline with
+and without recorded statistics.
+
+    python -m unittest discover shared/tests
+"""
+
+import json
+import logging
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from baseline_store import BASELINE_FORMAT_VERSION, CompactBaselineWriter
+from row_hashing import CHECKSUM_ALGORITHM, calculate_checksum
+from value_normalizer import VALUE_FORMAT
+from verifier_engine import VerifierEngine
+
+TABLE = 'dbo.Books'
+
+
+class OfflineVerifier(VerifierEngine):
+    """Verifier without a database"""
+
+    def __init__(self, baseline_file: str):
+        super().__init__(None, {'server': 'none', 'database': 'none', 'driver': 'none', 'auth_type': 'none'},
+                         baseline_file=baseline_file)
+
+    def connect(self):
+        raise AssertionError("baseline-vs-baseline verification opened a connection")
+
+
+def make_baseline(rows):
+    """Baseline document of one table with a primary key on id"""
+    return {
+        'format_version': BASELINE_FORMAT_VERSION,
+        'timestamp': '20261018_120000',
+        'database_info': {'server': 'none', 'database': 'none'},
+        'checksum_algorithm': CHECKSUM_ALGORITHM,
+        'value_format': VALUE_FORMAT,
+        'tables': {TABLE: rows},
+        'row_counts': {TABLE: len(rows)},
+        'row_count_estimates': {},
+        'checksums': {TABLE: calculate_checksum(rows)},
+        'foreign_keys': {TABLE: []},
+        'indexes': {TABLE: [{'name': 'PK_Books', 'type': 'CLUSTERED', 'is_unique': True,
+                             'is_primary_key': True, 'columns': ['id']}]},
+        'schema_info': {TABLE: [{'name': 'id', 'type': 'int'}, {'name': 'title', 'type': 'nvarchar'}]},
+        'range_hashes': {}
+    }
+
+
+class BaselineVsBaselineTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.rows = [{'id': i, 'title': f"Book {i}"} for i in range(1, 101)]
+        logging.disable(logging.CRITICAL)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+        self.directory.cleanup()
+
+    def write_json(self, name: str, baseline) -> str:
+        filename = os.path.join(self.directory.name, f"{name}.json")
+        with open(filename, 'w') as f:
+            json.dump(baseline, f)
+        return filename
+
+    def write_compact(self, name: str, baseline) -> str:
+        filename = os.path.join(self.directory.name, f"{name}.baseline")
+        writer = CompactBaselineWriter(filename, chunk_rows=30)
+        writer.open({key: value for key, value in baseline.items() if key != 'tables'})
+        for table, rows in baseline['tables'].items():
+            writer.begin_table(table)
+            writer.write_rows(rows)
+            writer.end_table()
+        writer.close({})
+        return filename
+
+    def verify(self, source_file: str, target_file: str) -> OfflineVerifier:
+        verifier = OfflineVerifier(source_file)
+        self.assertTrue(verifier.load_baseline())
+        verifier.load_current_baseline(target_file)
+        verifier.compare_and_verify()
+        return verifier
+
+    def test_identical_json_baselines_diff_clean(self):
+        source = self.write_json('source', make_baseline(self.rows))
+        target = self.write_json('target', make_baseline(self.rows))
+        results = self.verify(source, target).test_results
+        self.assertEqual((results['failed'], results['warnings']), (0, 0), results['errors'])
+
+    def test_identical_compact_baselines_diff_clean(self):
+        source = self.write_compact('source', make_baseline(self.rows))
+        target = self.write_compact('target', make_baseline(self.rows))
+        results = self.verify(source, target).test_results
+        self.assertEqual((results['failed'], results['warnings']), (0, 0), results['errors'])
+
+    def test_row_diff_reads_the_target_file(self):
+        changed = [dict(row, title="Changed") if row['id'] == 7 else row for row in self.rows[:-1]]
+        source = self.write_compact('source', make_baseline(self.rows))
+        target = self.write_json('target', make_baseline(changed))
+        verifier = self.verify(source, target)
+        diff = verifier.row_diffs[TABLE]
+        self.assertEqual((diff['added'], diff['removed'], diff['changed']), (0, 1, 1))
+        self.assertEqual(diff['changed_keys'], [7])
+
+
+class StatsRowCounter:
+    """Stands in for a RowCounter that read every table from statistics"""
+
+    sources = {('dbo', 'Books'): 'stats'}
+
+
+class StatsRowCountTest(unittest.TestCase):
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def verify_row_counts(self, current_count: int, baseline_estimate=None):
+        verifier = OfflineVerifier(None)
+        verifier.row_count_mode = 'stats'
+        verifier.row_counter = StatsRowCounter()
+        verifier.baseline = make_baseline([{'id': i} for i in range(100)])
+        if baseline_estimate is not None:
+            verifier.baseline['row_count_estimates'][TABLE] = baseline_estimate
+        verifier.current = {'row_counts': {TABLE: current_count}}
+        verifier._verify_row_counts()
+        return verifier.test_results
+
+    def test_statistics_are_compared_with_baseline_statistics(self):
+        results = self.verify_row_counts(95, baseline_estimate=95)
+        self.assertEqual((results['passed'], results['failed'], results['warnings']), (1, 0, 0))
+
+    def test_lower_statistics_than_baseline_statistics_fail(self):
+        results = self.verify_row_counts(80, baseline_estimate=95)
+        self.assertEqual(results['failed'], 1)
+
+    def test_statistics_against_exact_count_only_warn(self):
+        results = self.verify_row_counts(95)
+        self.assertEqual((results['failed'], results['warnings']), (0, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,282 @@
+"""
+Column-Type-Aware Value Normalization
+
+Converts the raw values a driver returns into canonical JSON values before
+rows are hashed or stored, so the same data gives the same checksum on SQL
+Server (pyodbc) and PostgreSQL (psycopg2). The converter of each column is
+chosen once per table from its catalog type (see catalog.py) and applied
+to a whole fetch batch column by column.
+
+Canonical forms:
+
+- exact numerics (decimal, numeric, money): plain decimal string without
+  exponent or trailing zeros ('1.50' -> '1.5'); integer columns stay ints
+- approximate numerics: floats; real / float4 rounded to 7 significant
+  digits, the precision the column actually holds
+- date / time / datetime: ISO 8601 with a 'T' separator and the fractional
+  seconds cut to TEMPORAL_DIGITS, trailing zeros dropped; values with a time
+  zone are converted to UTC and marked 'Z'
+- fixed-length text (char, nchar, character): trailing pad spaces removed;
+  all text is Unicode NFC normalized
+- binary (binary, varbinary, image, bytea, rowversion): lowercase hex
+- uniqueidentifier / uuid: lowercase hyphenated string
+
+Columns of other types, or tables without catalog information, fall back to
+dispatching on the Python type of each value. Converters also accept the
+string forms written by older baselines, so stored rows can be normalized
+again.
+"""
+
+import ast
+import re
+import unicodedata
+import uuid
+from datetime import date, datetime, time, timezone
+from decimal import Decimal, InvalidOperation
+from typing import Any, Callable, Dict, List, Optional
+
+# Stored in baselines so that files written before normalization can be recognised
+VALUE_FORMAT = 'typed-v1'
+
+# Fractional second digits kept for temporal values (6 = microseconds, Python's limit)
+TEMPORAL_DIGITS = 6
+
+INTEGER_TYPES = {'tinyint', 'smallint', 'int', 'integer', 'bigint'}
+EXACT_NUMERIC_TYPES = {'decimal', 'numeric', 'money', 'smallmoney'}
+SINGLE_PRECISION_TYPES = {'real', 'float4'}
+DOUBLE_PRECISION_TYPES = {'float', 'double precision', 'float8'}
+BOOLEAN_TYPES = {'bit', 'boolean'}
+DATE_TYPES = {'date'}
+TIME_TYPES = {'time', 'time without time zone', 'time with time zone'}
+DATETIME_TYPES = {'datetime', 'datetime2', 'smalldatetime', 'datetimeoffset',
+                  'timestamp without time zone', 'timestamp with time zone'}
+FIXED_TEXT_TYPES = {'char', 'nchar', 'character', 'bpchar'}
+TEXT_TYPES = {'varchar', 'nvarchar', 'text', 'ntext', 'character varying', 'citext', 'xml'}
+# SQL Server reports rowversion columns as 'timestamp'
+BINARY_TYPES = {'binary', 'varbinary', 'image', 'bytea', 'timestamp', 'rowversion'}
+UUID_TYPES = {'uniqueidentifier', 'uuid'}
+
+_TEMPORAL_PATTERN = re.compile(
+    r'^(?P<date>\d{4}-\d{2}-\d{2})?[ T]?'
+    r'(?P<time>\d{2}:\d{2}(?::\d{2})?)?(?:\.(?P<fraction>\d+))?'
+    r'\s*(?P<zone>Z|[+-]\d{2}:?\d{2})?$'
+)
+
+
+def _exact_numeric(value):
+    """Plain decimal string, e.g. Decimal('1.50') -> '1.5'"""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return str(value)
+    try:
+        number = value if isinstance(value, Decimal) else Decimal(str(value).strip())
+    except InvalidOperation:
+        return str(value)
+    if not number.is_finite():
+        return str(number)
+    if number == 0:
+        return '0'
+    return format(number.normalize(), 'f')
+
+
+def _integer(value):
+    """Python int"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def _single_precision(value):
+    """Float rounded to the 7 significant digits of a real column"""
+    number = float(value)
+    if number != number or number in (float('inf'), float('-inf')):
+        return str(number)
+    return float(f"{number:.7g}")
+
+
+def _double_precision(value):
+    """Python float"""
+    number = float(value)
+    if number != number or number in (float('inf'), float('-inf')):
+        return str(number)
+    return number
+
+
+def _boolean(value):
+    """Python bool"""
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 't', 'true', 'y', 'yes')
+    return bool(value)
+
+
+def _fraction(microseconds: int) -> str:
+    """Fractional seconds cut to TEMPORAL_DIGITS, trailing zeros dropped"""
+    digits = f"{microseconds:06d}"[:TEMPORAL_DIGITS].rstrip('0')
+    return f".{digits}" if digits else ''
+
+
+def _temporal_text(text: str):
+    """Canonical form of a date / time / datetime written as text, or the text itself"""
+    match = _TEMPORAL_PATTERN.match(text.strip())
+    if not match or not (match.group('date') or match.group('time')):
+        return text
+    parts = match.groupdict()
+    clock = parts['time']
+    if clock and clock.count(':') == 1:
+        clock += ':00'
+    fraction = (parts['fraction'] or '')[:6].ljust(6, '0')
+    if parts['date'] and clock:
+        zone = parts['zone'] or ''
+        if zone == 'Z':
+            zone = '+00:00'
+        elif zone and ':' not in zone:
+            zone = f"{zone[:3]}:{zone[3:]}"
+        return _datetime(datetime.fromisoformat(f"{parts['date']}T{clock}.{fraction}{zone}"))
+    if parts['date']:
+        return parts['date']
+    return clock + _fraction(int(fraction))
+
+
+def _datetime(value):
+    """ISO 8601 datetime; aware values in UTC with a 'Z' suffix"""
+    if isinstance(value, str):
+        return _temporal_text(value)
+    if isinstance(value, datetime):
+        suffix = ''
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+            suffix = 'Z'
+        return value.strftime('%Y-%m-%dT%H:%M:%S') + _fraction(value.microsecond) + suffix
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+def _date(value):
+    """ISO 8601 date"""
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return _temporal_text(str(value))
+
+
+def _time(value):
+    """ISO 8601 time of day"""
+    if isinstance(value, time):
+        return value.strftime('%H:%M:%S') + _fraction(value.microsecond)
+    return _temporal_text(str(value))
+
+
+def _text(value):
+    """NFC normalized text"""
+    return unicodedata.normalize('NFC', value if isinstance(value, str) else str(value))
+
+
+def _fixed_text(value):
+    """NFC normalized text without the pad spaces of fixed-length columns"""
+    return _text(value).rstrip(' ')
+
+
+def _binary(value):
+    """Lowercase hex of a binary value"""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).hex()
+    text = str(value)
+    # str(bytes) as written by older baselines
+    if text[:2] in ("b'", 'b"'):
+        try:
+            return ast.literal_eval(text).hex()
+        except (ValueError, SyntaxError):
+            return text
+    return text[2:].lower() if text[:2].lower() == '0x' else text.lower()
+
+
+def _uuid(value):
+    """Lowercase hyphenated UUID"""
+    try:
+        return str(value if isinstance(value, uuid.UUID) else uuid.UUID(str(value)))
+    except ValueError:
+        return str(value).lower()
+
+
+def _by_value(value):
+    """Converter for columns of unknown type, chosen by the Python type of the value"""
+    if isinstance(value, (bool, int, str)):
+        return value
+    if isinstance(value, float):
+        return _double_precision(value)
+    if isinstance(value, Decimal):
+        return _exact_numeric(value)
+    if isinstance(value, (datetime, date)):
+        return _datetime(value)
+    if isinstance(value, time):
+        return _time(value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return _binary(value)
+    if isinstance(value, uuid.UUID):
+        return _uuid(value)
+    if isinstance(value, (list, tuple)):
+        return [None if item is None else _by_value(item) for item in value]
+    if isinstance(value, dict):
+        return value
+    return str(value)
+
+
+_TYPE_CONVERTERS = {}
+for _types, _converter in (
+        (INTEGER_TYPES, _integer),
+        (EXACT_NUMERIC_TYPES, _exact_numeric),
+        (SINGLE_PRECISION_TYPES, _single_precision),
+        (DOUBLE_PRECISION_TYPES, _double_precision),
+        (BOOLEAN_TYPES, _boolean),
+        (DATE_TYPES, _date),
+        (TIME_TYPES, _time),
+        (DATETIME_TYPES, _datetime),
+        (FIXED_TEXT_TYPES, _fixed_text),
+        (TEXT_TYPES, _text),
+        (BINARY_TYPES, _binary),
+        (UUID_TYPES, _uuid)):
+    for _type in _types:
+        _TYPE_CONVERTERS[_type] = _converter
+
+
+def converter_for_type(data_type: Optional[str]) -> Callable[[Any], Any]:
+    """Converter for a catalog data type, None values passed through"""
+    convert = _TYPE_CONVERTERS.get(str(data_type or '').lower(), _by_value)
+    return lambda value: None if value is None else convert(value)
+
+
+class RowNormalizer:
+    """Normalizes the rows of one table using its catalog column types"""
+
+    def __init__(self, schema_info: Optional[List[Dict]] = None):
+        self.column_types = {column['name']: column['type'] for column in schema_info or []}
+        self._converters = {}
+
+    def _converter(self, column: str) -> Callable[[Any], Any]:
+        """Cached converter of a column"""
+        if column not in self._converters:
+            self._converters[column] = converter_for_type(self.column_types.get(column))
+        return self._converters[column]
+
+    def normalize_batch(self, columns: List[str], batch: list) -> List[Dict]:
+        """Turn a batch of raw cursor rows into normalized row dicts
+
+        Values are converted column by column: each column's converter is
+        mapped over all the values of that column in the batch.
+        """
+        if not batch:
+            return []
+        converted = [
+            list(map(self._converter(column), values))
+            for column, values in zip(columns, zip(*batch))
+        ]
+        return [dict(zip(columns, values)) for values in zip(*converted)]
+
+    def normalize_rows(self, rows: List[Dict]) -> List[Dict]:
+        """Normalize row dicts, e.g. rows stored by an older baseline"""
+        if not rows:
+            return []
+        columns = list(rows[0])
+        return self.normalize_batch(columns, [[row.get(column) for column in columns] for row in rows])
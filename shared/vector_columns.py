@@ -0,0 +1,136 @@
+"""
+Vectorized Column Generation
+
+Generates test data a column at a time with NumPy instead of a value at a
+time with the random module: the random choices, integers, prices, dates,
+Zipf-skewed foreign keys and timestamp-based unique suffixes of a whole
+batch each come from a few array operations. Columns are converted to
+Python values (tolist) before they reach the database drivers, which do
+not accept NumPy scalars.
+
+The values follow the same distributions as the row-at-a-time generators
+in populate_test_data.py and scaling.py. NumPy is optional; without
+it (NUMPY_AVAILABLE is False) the populators generate rows one at a time.
+"""
+
+from datetime import date, datetime
+from functools import reduce
+from typing import List, Sequence
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+# Positions of the digits in 'YYYY-mm-ddTHH:MM:SS'
+_TIMESTAMP_DIGITS = [0, 1, 2, 3, 5, 6, 8, 9, 11, 12, 14, 15, 17, 18]
+
+
+def _characters(column: 'np.ndarray', width: int) -> 'np.ndarray':
+    """Fixed-width strings as a matrix of single characters"""
+    return np.ascontiguousarray(column, dtype=f'U{width}').view('U1').reshape(len(column), width)
+
+
+def _strings(characters: 'np.ndarray') -> 'np.ndarray':
+    """Rows of a character matrix as strings"""
+    return np.ascontiguousarray(characters).view(f'U{characters.shape[1]}').ravel()
+
+
+def join(*parts) -> 'np.ndarray':
+    """Element-wise concatenation of string columns and constant strings"""
+    return reduce(np.char.add, parts)
+
+
+def to_rows(*columns) -> List[tuple]:
+    """Rows of Python values from columns of equal length"""
+    return list(zip(*(column.tolist() if hasattr(column, 'tolist') else column for column in columns)))
+
+
+class ColumnGenerator:
+    """Random columns of a given size"""
+
+    def __init__(self, seed: int = None):
+        self.rng = np.random.default_rng(seed)
+
+    def choice(self, values: Sequence, size: int) -> 'np.ndarray':
+        """Values picked uniformly, like random.choice"""
+        return np.asarray(values)[self.rng.integers(0, len(values), size)]
+
+    def choices(self, size: int, *value_lists: Sequence) -> tuple:
+        """Values picked uniformly by the same index from several lists (e.g. a name and its lower case)"""
+        indexes = self.rng.integers(0, len(value_lists[0]), size)
+        return tuple(np.asarray(values)[indexes] for values in value_lists)
+
+    def integers(self, low: int, high: int, size: int) -> 'np.ndarray':
+        """Integers from low to high inclusive, like random.randint"""
+        return self.rng.integers(low, high + 1, size)
+
+    def prices(self, low: float, high: float, size: int) -> 'np.ndarray':
+        """Uniform amounts rounded to cents"""
+        return np.round(self.rng.uniform(low, high, size), 2)
+
+    def days_before(self, day: date, min_days: int, max_days: int, size: int) -> 'np.ndarray':
+        """Dates min_days to max_days before day"""
+        return np.datetime64(day, 'D') - self.integers(min_days, max_days, size)
+
+    def timestamp_suffixes(self, start: datetime, offset: int, size: int) -> 'np.ndarray':
+        """'YYYYmmddHHMMSS.ffffff' suffixes of rows offset to offset + size - 1
+
+        Row i gets the seconds of start + i seconds and the microseconds of
+        start + i milliseconds, the unique identifier the populators use.
+        """
+        positions = np.arange(offset, offset + size)
+        seconds = np.datetime64(start.replace(microsecond=0), 's') + positions
+        # 'YYYY-mm-ddTHH:MM:SS' as a character matrix, keeping only the digits
+        text = _characters(np.datetime_as_string(seconds, unit='s'), 19)[:, _TIMESTAMP_DIGITS]
+        # Leading 1 keeps the zeros of 6-digit microseconds, then dropped
+        microseconds = _characters(((start.microsecond + positions * 1000) % 1000000 + 1000000).astype('U7'), 7)
+        dots = np.full((size, 1), '.', dtype='U1')
+        return _strings(np.concatenate([text, dots, microseconds[:, 1:]], axis=1))
+
+    def fanout(self, keys: Sequence, low: int, high: int) -> 'np.ndarray':
+        """Each key repeated low to high times (a uniform number of children per parent)"""
+        return np.repeat(np.asarray(keys), self.integers(low, high, len(keys)))
+
+    def numbers(self, offset: int, size: int) -> 'np.ndarray':
+        """Row numbers offset to offset + size - 1 as strings"""
+        return np.arange(offset, offset + size).astype(str)
+
+
+class VectorZipf:
+    """Zipf-skewed picks from keys, a batch at a time (see scale_factor.ZipfChooser)
+
+    Popularity ranks are shuffled over the keys, and rank k has weight
+    1 / k^skew; a skew of 0 is uniform.
+    """
+
+    def __init__(self, columns: ColumnGenerator, keys: Sequence, skew: float):
+        if not len(keys):
+            raise ValueError("No keys to choose from")
+        self.rng = columns.rng
+        self.keys = np.asarray(keys)
+        self.skew = skew
+        if skew:
+            ranks = self.rng.permutation(len(self.keys)) + 1
+            self.cum_weights = np.cumsum(1.0 / ranks.astype(float) ** skew)
+
+    def _indexes(self, size: int) -> 'np.ndarray':
+        if not self.skew:
+            return self.rng.integers(0, len(self.keys), size)
+        points = self.rng.random(size) * self.cum_weights[-1]
+        return np.minimum(np.searchsorted(self.cum_weights, points, side='right'), len(self.keys) - 1)
+
+    def choose(self, size: int) -> 'np.ndarray':
+        """size keys, drawn independently"""
+        return self.keys[self._indexes(size)]
+
+    def fanout(self, total: int, minimum: int = 0) -> 'np.ndarray':
+        """Parent key of each of total children, in key order (see scale_factor.zipf_fanout)"""
+        counts = np.zeros(len(self.keys), dtype=np.int64)
+        if minimum and total >= minimum * len(self.keys):
+            counts += minimum
+            total -= minimum * len(self.keys)
+        counts += np.bincount(self._indexes(total), minlength=len(self.keys))
+        return np.repeat(self.keys, counts)
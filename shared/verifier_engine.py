@@ -0,0 +1,1306 @@
+"""
+Migration Verifier Engine
+
+The database independent part of verify_migration.py, shared by the
+BookService (SQL Server) and PetClinic (PostgreSQL) tools. Everything that
+differs between the two servers goes through the dialect adapter of
+db_dialect.py (catalog, table list, keyset pages, range hashes, samples); an
+application only supplies its dialect, its connection and a description of
+the database (see VerifierEngine).
+
+A verification loads a baseline (see baseline_store.py), captures the
+current database state the same way baseline_engine.py captured the
+baseline, and compares the two: table existence, row counts, checksums with
+a row diff of modified tables, schemas, foreign keys, indexes and
+referential integrity. diff_live compares two live databases instead.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from datetime import datetime
+from functools import partial
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from baseline_engine import load_config
+from baseline_store import FORMAT_EXTENSIONS, LazyTables, open_baseline, refresh_legacy_checksums
+from keyset_reader import DEFAULT_PAGE_SIZE, iter_keyset_pages, iter_query_batches
+from merge_join import read_concurrently, run_merge_join
+from range_diff import DatabaseRangeSource, bisect_diff
+from referential_integrity import (DEFAULT_INTEGRITY_WORKERS, DEFAULT_LARGE_TABLE_ROWS, INTEGRITY_MODES,
+                                   LARGE_TABLE_MODES, ReferentialIntegrityChecker, foreign_key_checks)
+from row_diff import DiffFileWriter, hash_join_diff, partition_count
+from row_counts import ROW_COUNT_MODES, RowCounter
+from row_hashing import (TableChecksum, TableScan, calculate_checksum, combine_checksums, combine_range_hashes,
+                         differing_ranges, key_bucket, ranges_from_list, ranges_to_list, row_digest)
+from row_sampling import (DEFAULT_CORRUPTION_RATE, detection_confidence, in_key_sample, key_sample_clause,
+                          rows_for_confidence, sample_modulus)
+from value_normalizer import VALUE_FORMAT, RowNormalizer
+
+logger = logging.getLogger(__name__)
+
+
+class VerifierEngine:
+    """Verifies database migration integrity by comparing with baseline
+
+    Subclasses implement connect() for their database driver and pass their
+    dialect adapter and db_info (server, database, driver, auth_type).
+    """
+
+    # Schema the application's tables live in; None covers every user schema
+    schema = None
+
+    def __init__(self, dialect, db_info: Dict, env_name: str = "target", baseline_file: Optional[str] = None,
+                 pushdown: bool = False, row_count_mode: str = 'exact',
+                 page_size: int = DEFAULT_PAGE_SIZE, rehash: bool = False, diff_file: Optional[str] = None,
+                 integrity_mode: str = 'parallel', integrity_workers: int = DEFAULT_INTEGRITY_WORKERS,
+                 large_table_mode: str = 'full', large_table_rows: int = DEFAULT_LARGE_TABLE_ROWS,
+                 sample_percent: Optional[float] = None, corruption_rate: float = DEFAULT_CORRUPTION_RATE):
+        self.dialect = dialect
+        self.db_info = db_info
+        self.env_name = env_name
+        self.baseline_file = baseline_file
+        self.pushdown = pushdown
+        self.row_count_mode = row_count_mode
+        self.row_counter = None
+        self.page_size = page_size
+        self.rehash = rehash
+        self.catalog = None
+        self.baseline = None
+        self.current = None
+        # Set when the current state is a second baseline file (see load_current_baseline)
+        self.current_file = None
+        self.row_diffs = {}
+        self.diff_file = diff_file
+        self.diff_writer = None
+        self.integrity_mode = integrity_mode
+        self.integrity_workers = integrity_workers
+        self.large_table_mode = large_table_mode
+        self.large_table_rows = large_table_rows
+        self.sample_percent = sample_percent
+        self.corruption_rate = corruption_rate
+        self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+        self.test_results = {
+            "passed": 0,
+            "failed": 0,
+            "warnings": 0,
+            "errors": []
+        }
+
+    def connect(self):
+        """Open a new connection to the database"""
+        raise NotImplementedError
+
+    def get_connection(self):
+        """Get database connection"""
+        try:
+            return self.connect()
+        except Exception as e:
+            logger.error(f"Failed to connect to database: {e}")
+            raise
+
+    def log_test(self, test_name: str, status: str, message: str = ""):
+        """Log test result"""
+        if status == 'passed':
+            self.test_results["passed"] += 1
+            logger.info(f" {test_name}: PASSED - {message}")
+        elif status == 'warning':
+            self.test_results["warnings"] += 1
+            logger.warning(f" {test_name}: WARNING - {message}")
+        else:  # failed
+            self.test_results["failed"] += 1
+            error_msg = f"{test_name}: FAILED - {message}"
+            self.test_results["errors"].append(error_msg)
+            logger.error(f" {error_msg}")
+
+    def open_baseline(self, filename: str):
+        """Open a baseline or snapshot file; snapshot tables are taken to be in schema"""
+        if self.schema:
+            return open_baseline(filename, snapshot_schema=self.schema)
+        return open_baseline(filename)
+
+    def load_baseline(self):
+        """Load baseline from a JSON or compact baseline file
+
+        Compact baselines are memory-mapped: metadata checks can start right
+        away and table rows are decoded only when a check reads them.
+        """
+        try:
+            self.baseline = self.open_baseline(self.baseline_file)
+            logger.info(f" Loaded baseline from: {self.baseline_file}")
+            logger.info(f"  Baseline timestamp: {self.baseline['timestamp']}")
+            return True
+        except FileNotFoundError:
+            logger.error(f" Baseline file not found: {self.baseline_file}")
+            return False
+        except (json.JSONDecodeError, ValueError):
+            logger.error(f" Invalid baseline file format: {self.baseline_file}")
+            return False
+
+    def load_current_baseline(self, filename: str):
+        """Take the current state from a second baseline file instead of the database
+
+        Row diffs then stream the rows of both files and no connection is
+        opened; the database is only read after capture_current_state.
+        """
+        self.current = self.open_baseline(filename)
+        self.current_file = filename
+        logger.info(f" Loaded target baseline: {filename}")
+        self.refresh_legacy_checksums(self.current, "target baseline")
+
+    def refresh_legacy_checksums(self, snapshot, label: str):
+        """Bring the checksums of an older baseline up to date (see baseline_store.py)
+
+        Snapshots only record column names; once the catalog is loaded, the
+        column types used to normalize their values again are taken from it.
+        """
+        if self.catalog is not None and snapshot.get('value_format') != VALUE_FORMAT and isinstance(snapshot, dict):
+            schema_info = snapshot.get('schema_info', {})
+            for table, columns in schema_info.items():
+                schema, table_name = table.split('.', 1)
+                types = {column['name']: column['type'] for column in self.catalog.columns(schema, table_name)}
+                schema_info[table] = [{**column, 'type': column.get('type') or types.get(column['name'])}
+                                      for column in columns]
+        refresh_legacy_checksums(snapshot, label)
+
+    def capture_current_state(self):
+        """Capture current database state"""
+        logger.info("\n" + "="*70)
+        logger.info("CAPTURING CURRENT DATABASE STATE")
+        logger.info("="*70)
+
+        self.current = {
+            'timestamp': self.timestamp,
+            'tables': {},
+            'row_counts': {},
+            'checksums': {},
+            'foreign_keys': {},
+            'indexes': {},
+            'schema_info': {},
+            'range_hashes': {},
+            'pushdown': {},
+            'sample': {}
+        }
+
+        conn = self.get_connection()
+
+        try:
+            # Get same tables as baseline
+            baseline_tables = list(self.baseline['tables'].keys())
+
+            # Also get current tables to detect new ones
+            current_tables = self._get_user_tables(conn)
+            current_table_names = [f"{t[0]}.{t[1]}" for t in current_tables]
+
+            # Combine both sets
+            all_tables = set(baseline_tables + current_table_names)
+
+            # Columns, keys and indexes of all tables in one pass over the catalog
+            catalog = self.dialect.load_catalog(conn)
+            self.catalog = catalog
+            self.refresh_legacy_checksums(self.baseline, "baseline")
+
+            # Catalog row count statistics, compared with the baseline's in hybrid mode
+            self.row_counter = RowCounter(self.dialect, conn, self.row_count_mode)
+
+            logger.info(f"Processing {len(all_tables)} tables...\n")
+
+            for full_table in sorted(all_tables):
+                schema, table_name = full_table.split('.', 1)
+                logger.info(f" Processing {full_table}...")
+
+                try:
+                    range_spec = None
+                    if self.pushdown:
+                        range_spec = self.baseline.get('range_hashes', {}).get(full_table)
+
+                    if range_spec:
+                        # Compare server-side range hashes, fetch only differing ranges
+                        self._capture_with_pushdown(conn, schema, table_name, range_spec)
+                    elif self.sample_percent:
+                        # Read only a deterministic sample of the rows
+                        self._capture_sample(conn, schema, table_name)
+                    else:
+                        # Row count and checksum in one pass; the rows are not kept, a row diff
+                        # reads them from the database again (see _locate_row_changes)
+                        scan = TableScan().consume(self._iter_table_data(conn, schema, table_name))
+                        self.current['tables'][full_table] = None
+                        self.current['checksums'][full_table] = scan.checksum.hexdigest()
+
+                        # The scan counts exactly; statistics only in stats/hybrid mode
+                        if self.row_count_mode == 'exact':
+                            self.current['row_counts'][full_table] = scan.row_count
+                        else:
+                            self.current['row_counts'][full_table] = self._get_row_count(conn, schema, table_name)
+
+                    # Get schema
+                    self.current['schema_info'][full_table] = catalog.columns(schema, table_name)
+
+                    # Get foreign keys
+                    self.current['foreign_keys'][full_table] = catalog.foreign_keys(schema, table_name)
+
+                    # Get indexes
+                    self.current['indexes'][full_table] = catalog.indexes(schema, table_name)
+
+                except Exception as e:
+                    logger.warning(f"   Could not process {full_table}: {e}")
+
+            if self.row_count_mode != 'exact':
+                counted = self.row_counter.summary()
+                logger.info(f"\n Row counts ({self.row_count_mode}): {counted['stats']} from statistics, "
+                            f"{counted['exact']} counted exactly")
+            elif self.sample_percent:
+                logger.info(f"\n Row counts (exact): COUNT(*) per sampled table")
+
+            logger.info("\n Current state captured successfully")
+
+        finally:
+            conn.close()
+
+    def _get_user_tables(self, conn) -> List[Tuple[str, str]]:
+        """Get list of user tables, only those of schema when it is set"""
+        tables = self.dialect.user_tables(conn)
+        if self.schema:
+            return [(schema, table_name) for schema, table_name in tables if schema == self.schema]
+        return tables
+
+    def _get_row_count(self, conn, schema: str, table_name: str) -> int:
+        """Get row count for a table following the row count mode (see row_counts.py)
+
+        In hybrid mode a table is counted with COUNT(*) only when its catalog
+        statistics differ from those recorded in the baseline.
+        """
+        full_table = f"{schema}.{table_name}"
+        return self.row_counter.count(
+            conn, schema, table_name,
+            other_estimate=self.baseline.get('row_count_estimates', {}).get(full_table),
+            other_count=self.baseline.get('row_counts', {}).get(full_table)
+        )
+
+    def _capture_sample(self, conn, schema: str, table_name: str):
+        """Capture a sample of about sample_percent of a table's rows (see row_sampling.py)
+
+        Tables with an integer primary key are sampled on a hash of the key,
+        which selects the same rows as in the baseline; other tables are
+        sampled with TABLESAMPLE. Row counts follow the row count mode.
+        """
+        full_table = f"{schema}.{table_name}"
+        key_column = self.dialect.range_key(conn, schema, table_name, self.catalog)
+        modulus = sample_modulus(self.sample_percent)
+        if key_column:
+            rows = self._get_table_data(conn, schema, table_name, key_sample_clause(self.dialect, key_column, modulus))
+        else:
+            rows = self._get_table_sample(conn, schema, table_name)
+
+        self.current['tables'][full_table] = rows
+        self.current['checksums'][full_table] = self._calculate_checksum(rows)
+        self.current['row_counts'][full_table] = self._get_row_count(conn, schema, table_name)
+        self.current['sample'][full_table] = {'key_column': key_column, 'modulus': modulus, 'rows': len(rows)}
+        method = f"1 in {modulus} by {key_column} hash" if key_column else f"TABLESAMPLE {self.sample_percent}%"
+        logger.info(f"   Sample: {len(rows)} row(s) ({method})")
+
+    def _get_table_sample(self, conn, schema: str, table_name: str, batch_size: int = 5000) -> List[Dict]:
+        """Rows of a TABLESAMPLE of about sample_percent of a table's pages"""
+        sql = (f"SELECT * FROM {self.dialect.quote_table(schema, table_name)} "
+               f"{self.dialect.table_sample_clause(self.sample_percent)}")
+        normalizer = RowNormalizer(self.catalog.columns(schema, table_name))
+        rows = []
+        for columns, batch in iter_query_batches(self.dialect.table_cursor(conn, batch_size), sql, (), batch_size):
+            rows.extend(normalizer.normalize_batch(columns, batch))
+        return rows
+
+    def _capture_with_pushdown(self, conn, schema: str, table_name: str, range_spec: Dict):
+        """Capture a table by comparing server-side range hashes with the baseline
+
+        Only rows of key ranges whose count or hash differs from the baseline
+        are pulled from the database.
+        """
+        full_table = f"{schema}.{table_name}"
+        key_column = range_spec['key_column']
+        range_size = range_spec['range_size']
+
+        ranges = self.dialect.range_hashes(conn, schema, table_name, key_column, range_size)
+        baseline_ranges = ranges_from_list(range_spec['ranges'])
+        differing = differing_ranges(baseline_ranges, ranges)
+
+        rows = []
+        if differing and key_column:
+            for bucket in differing:
+                where, params = self.dialect.key_range_clause(key_column, bucket, range_size)
+                rows.extend(self._get_table_data(conn, schema, table_name, where, params))
+        elif differing:
+            rows = self._get_table_data(conn, schema, table_name)
+
+        self.current['row_counts'][full_table] = sum(count for count, _ in ranges.values())
+        self.current['tables'][full_table] = rows
+        self.current['checksums'][full_table] = self._calculate_checksum(rows)
+        self.current['range_hashes'][full_table] = {
+            'key_column': key_column,
+            'range_size': range_size,
+            'table_hash': combine_range_hashes(ranges),
+            'ranges': ranges_to_list(ranges)
+        }
+        self.current['pushdown'][full_table] = {
+            'total_ranges': len(set(baseline_ranges) | set(ranges)),
+            'differing_ranges': differing
+        }
+
+        logger.info(f"   Pushdown: {len(differing)} of {len(set(baseline_ranges) | set(ranges))} "
+                    f"range(s) differ, {len(rows)} row(s) fetched")
+
+    def _baseline_rows_in_ranges(self, table: str, buckets: List[int]) -> List[Dict]:
+        """Baseline rows falling into the given key ranges"""
+        range_spec = self.baseline['range_hashes'][table]
+        key_column = range_spec['key_column']
+        if not key_column:
+            return list(self._iter_baseline_rows(table))
+
+        wanted = set(buckets)
+        return [row for row in self._iter_baseline_rows(table)
+                if key_bucket(int(row[key_column]), range_spec['range_size']) in wanted]
+
+    def _baseline_range_checksum(self, table: str, buckets: List[int]) -> Optional[str]:
+        """Stored baseline checksum of the rows in the given key ranges
+
+        Returns None for baselines captured without key-range checksums.
+        """
+        range_spec = self.baseline['range_hashes'][table]
+        if not range_spec['key_column']:
+            return self.baseline['checksums'].get(table)
+        if 'row_checksums' not in range_spec:
+            return None
+
+        wanted = set(buckets)
+        return combine_checksums(checksum for bucket, _, checksum in range_spec['row_checksums']
+                                 if bucket in wanted)
+
+    def _get_table_data(self, conn, schema: str, table_name: str,
+                        where: Optional[str] = None, params: tuple = (), catalog=None) -> List[Dict]:
+        """Get all data from a table, optionally restricted by a WHERE clause"""
+        rows = []
+        for batch in self._iter_table_data(conn, schema, table_name, where=where, params=params, catalog=catalog):
+            rows.extend(batch)
+        return rows
+
+    def _iter_table_data(self, conn, schema: str, table_name: str, batch_size: int = 5000,
+                         where: Optional[str] = None, params: tuple = (), catalog=None):
+        """Yield table rows in batches of at most batch_size rows
+
+        Once the catalog is loaded, tables with a primary key are read in
+        keyset pages of page_size rows (see keyset_reader.py) and values are
+        normalized by their column types (see value_normalizer.py). catalog
+        overrides the verifier's own, e.g. for the source of a live diff.
+        """
+        catalog = catalog or self.catalog
+        primary_key = catalog.primary_key(schema, table_name) if catalog else []
+        key_columns = [column for column, _ in primary_key]
+        if key_columns and self.page_size:
+            batches = iter_keyset_pages(conn, self.dialect, schema, table_name, key_columns,
+                                        self.page_size, batch_size, where, params)
+        else:
+            where_sql = f" WHERE {where}" if where else ""
+            sql = f"SELECT * FROM {self.dialect.quote_table(schema, table_name)}{where_sql} ORDER BY 1"
+            batches = iter_query_batches(self.dialect.table_cursor(conn, batch_size), sql, params, batch_size)
+
+        normalizer = RowNormalizer(catalog.columns(schema, table_name) if catalog else None)
+        for columns, batch in batches:
+            yield normalizer.normalize_batch(columns, batch)
+
+    def _calculate_checksum(self, data: List[Dict]) -> str:
+        """Calculate checksum for table data"""
+        return calculate_checksum(data)
+
+    def compare_and_verify(self):
+        """Compare baseline with current state and verify migration"""
+        logger.info("\n" + "="*70)
+        logger.info("MIGRATION VERIFICATION - COMPARING BASELINE VS CURRENT")
+        logger.info("="*70)
+        logger.info(f"Baseline:  {self.baseline['timestamp']}")
+        logger.info(f"Current:   {self.current['timestamp']}")
+        logger.info("="*70 + "\n")
+
+        # Run all comparison tests
+        if self.rehash:
+            self._verify_baseline_integrity()
+        self._open_diff_file()
+        try:
+            self._verify_table_existence()
+            self._verify_row_counts()
+            self._verify_data_checksums()
+            self._verify_schemas()
+            self._verify_foreign_keys()
+            self._verify_indexes()
+            self._verify_referential_integrity()
+        finally:
+            self._close_diff_file()
+
+    def _open_diff_file(self):
+        """Start the row diff file, when one was requested"""
+        if self.diff_file:
+            self.diff_writer = DiffFileWriter(self.diff_file)
+
+    def _close_diff_file(self):
+        """Finish the row diff file"""
+        if self.diff_writer:
+            self.diff_writer.close()
+            logger.info(f"\n Row differences: {self.diff_writer.rows_written} row(s) written to {self.diff_file}")
+            self.diff_writer = None
+
+    def _verify_baseline_integrity(self):
+        """Recompute the baseline's stored checksums from its rows (--rehash)
+
+        Checksums, row counts and key-range checksums are otherwise trusted as
+        stored when the baseline was captured; this detects a baseline file
+        that was edited or damaged since.
+        """
+        logger.info("─" * 70)
+        logger.info("BASELINE INTEGRITY (REHASH)")
+        logger.info("─" * 70)
+
+        for table in sorted(self.baseline['tables'].keys()):
+            range_spec = self.baseline.get('range_hashes', {}).get(table) or {}
+            stored_ranges = range_spec.get('row_checksums')
+            if stored_ranges is not None:
+                checksum = TableChecksum(range_spec['key_column'], range_spec['range_size'])
+            else:
+                checksum = TableChecksum()
+            checksum.update(self._iter_baseline_rows(table))
+
+            mismatches = []
+            if checksum.hexdigest() != self.baseline['checksums'].get(table):
+                mismatches.append("checksum")
+            if checksum.row_count != self.baseline['row_counts'].get(table):
+                mismatches.append("row count")
+            if stored_ranges is not None and checksum.range_checksums() != stored_ranges:
+                mismatches.append("key-range checksums")
+
+            if mismatches:
+                self.log_test(f"Baseline Integrity - {table}", 'failed',
+                              f"Stored {', '.join(mismatches)} do not match the baseline rows")
+            else:
+                self.log_test(f"Baseline Integrity - {table}", 'passed',
+                              f"{checksum.row_count} rows rehashed, stored checksums match")
+        logger.info("")
+
+    def _verify_table_existence(self):
+        """Verify table existence"""
+        logger.info("─" * 70)
+        logger.info("TABLE EXISTENCE VERIFICATION")
+        logger.info("─" * 70)
+
+        baseline_tables = set(self.baseline['tables'].keys())
+        current_tables = set(self.current['tables'].keys())
+
+        added = current_tables - baseline_tables
+        removed = baseline_tables - current_tables
+
+        if removed:
+            for table in removed:
+                self.log_test(f"Table Existence - {table}", 'failed', "TABLE REMOVED!")
+
+        if added:
+            for table in added:
+                self.log_test(f"Table Existence - {table}", 'warning', "New table added")
+
+        if not added and not removed:
+            self.log_test("Table Existence", 'passed', "All tables preserved")
+
+    def _verify_row_counts(self):
+        """Verify row counts
+
+        A count taken from catalog statistics (--row-count stats) is compared
+        with the statistics recorded in the baseline. When the baseline only
+        has its exact count, a difference may just be stale statistics and
+        is reported as a warning.
+        """
+        logger.info("\n" + "─" * 70)
+        logger.info("ROW COUNT VERIFICATION")
+        logger.info("─" * 70)
+
+        common_tables = set(self.baseline['row_counts'].keys()) & set(self.current['row_counts'].keys())
+
+        for table in sorted(common_tables):
+            before = self.baseline['row_counts'][table]
+            after = self.current['row_counts'][table]
+            estimated = self._is_estimated_row_count(table)
+            baseline_estimate = self.baseline.get('row_count_estimates', {}).get(table)
+            note = ""
+            if estimated and baseline_estimate is not None:
+                before = baseline_estimate
+                note = " by statistics"
+            diff = after - before
+
+            if diff == 0:
+                self.log_test(f"Row Count - {table}", 'passed', f"{before} rows{note} (unchanged)")
+            elif estimated and baseline_estimate is None:
+                self.log_test(f"Row Count - {table}", 'warning',
+                              f"{before} → {after} ({diff:+} rows; statistics against the baseline's exact "
+                              f"count, confirm with --row-count exact)")
+            elif diff < 0:
+                self.log_test(f"Row Count - {table}", 'failed',
+                              f"{before} → {after} ({diff} rows{note} - DATA LOSS!)")
+            else:
+                self.log_test(f"Row Count - {table}", 'warning',
+                              f"{before} → {after} (+{diff} rows{note})")
+
+    def _is_estimated_row_count(self, table: str) -> bool:
+        """Whether the current row count of a table was read from catalog statistics
+
+        Hybrid mode only uses statistics to reuse the baseline's exact
+        count, so only --row-count stats yields estimated counts.
+        """
+        if self.row_counter is None or self.row_count_mode != 'stats':
+            return False
+        schema, table_name = table.split('.', 1)
+        return self.row_counter.sources.get((schema, table_name)) == 'stats'
+
+    def _verify_data_checksums(self):
+        """Verify data integrity using checksums"""
+        logger.info("\n" + "─" * 70)
+        logger.info("DATA INTEGRITY CHECKSUMS")
+        logger.info("─" * 70)
+
+        common_tables = set(self.baseline['checksums'].keys()) & set(self.current['checksums'].keys())
+
+        for table in sorted(common_tables):
+            if table in self.current.get('pushdown', {}):
+                self._verify_pushdown_checksum(table)
+                continue
+            if table in self.current.get('sample', {}):
+                self._verify_sampled_checksum(table)
+                continue
+
+            # Checksums were taken when the baseline was captured
+            before_checksum = self.baseline['checksums'][table]
+            after_checksum = self.current['checksums'][table]
+
+            if before_checksum == after_checksum:
+                self.log_test(f"Checksum - {table}", 'passed', "Data unchanged")
+            else:
+                before_count = self.baseline['row_counts'][table]
+                after_count = self.current['row_counts'][table]
+
+                if before_count != after_count:
+                    self.log_test(f"Checksum - {table}", 'warning',
+                                  "Data modified (row count changed)")
+                else:
+                    self.log_test(f"Checksum - {table}", 'warning',
+                                  "Data modified (same count, different values)")
+
+                self._locate_row_changes(table, self._iter_baseline_rows(table), self._iter_current_rows(table),
+                                         max(before_count, after_count))
+
+        if self._sample_summary():
+            logger.info(f"\n   Sample: {self._sample_summary()}")
+
+    def _verify_sampled_checksum(self, table: str):
+        """Verify a table captured with --sample against the same rows of the baseline"""
+        sample = self.current['sample'][table]
+        after_rows = self.current['tables'][table]
+        confidence = detection_confidence(sample['rows'], self.corruption_rate)
+        odds = f"{confidence:.1%} confidence at {self.corruption_rate:.2%} corruption"
+
+        if not sample['key_column']:
+            # TABLESAMPLE picks other rows than the baseline holds; look each one up there
+            baseline_digests = {row_digest(row) for row in self._iter_baseline_rows(table)}
+            unmatched = sum(1 for row in after_rows if row_digest(row) not in baseline_digests)
+            if unmatched == 0:
+                self.log_test(f"Checksum - {table}", 'passed',
+                              f"{len(after_rows)} sampled row(s) found in baseline ({odds}; removed rows "
+                              f"are not sampled)")
+            else:
+                self.log_test(f"Checksum - {table}", 'warning',
+                              f"{unmatched} of {len(after_rows)} sampled row(s) changed or added")
+            return
+
+        key_column, modulus = sample['key_column'], sample['modulus']
+        before_rows = [row for row in self._iter_baseline_rows(table)
+                       if in_key_sample(row[key_column], modulus)]
+        if self._calculate_checksum(before_rows) == self.current['checksums'][table]:
+            self.log_test(f"Checksum - {table}", 'passed',
+                          f"{len(after_rows)} sampled row(s) unchanged (1 in {modulus}, {odds})")
+        else:
+            self.log_test(f"Checksum - {table}", 'warning',
+                          f"Sampled rows differ ({len(before_rows)} in baseline, {len(after_rows)} now)")
+            self._locate_row_changes(table, before_rows, after_rows, max(len(before_rows), len(after_rows)))
+
+    def _sample_summary(self) -> Optional[str]:
+        """Sample size and detection confidence of a --sample run, or None"""
+        samples = (self.current or {}).get('sample')
+        if not samples:
+            return None
+        sampled = sum(sample['rows'] for sample in samples.values())
+        total = sum(self.current['row_counts'].get(table, 0) for table in samples)
+        confidence = detection_confidence(sampled, self.corruption_rate)
+        return (f"{sampled} of {total} rows in {len(samples)} table(s); a corruption rate of "
+                f"{self.corruption_rate:.2%} is detected with {confidence:.1%} confidence "
+                f"(95% needs {rows_for_confidence(0.95, self.corruption_rate)} rows)")
+
+    def _verify_pushdown_checksum(self, table: str):
+        """Verify a table captured with server-side range hashes"""
+        pushdown = self.current['pushdown'][table]
+        differing = pushdown['differing_ranges']
+
+        if not differing:
+            self.log_test(f"Checksum - {table}", 'passed',
+                          f"Data unchanged ({pushdown['total_ranges']} range hash(es) matched on server)")
+            return
+
+        # Range hashes disagree; compare the fetched rows with the stored checksums of those ranges
+        baseline_rows = None
+        before_checksum = self._baseline_range_checksum(table, differing)
+        if before_checksum is None:
+            baseline_rows = self._baseline_rows_in_ranges(table, differing)
+            before_checksum = self._calculate_checksum(baseline_rows)
+
+        if before_checksum == self.current['checksums'][table]:
+            self.log_test(f"Checksum - {table}", 'passed',
+                          f"Data unchanged ({len(differing)} range hash(es) differ but row data matches)")
+        else:
+            self.log_test(f"Checksum - {table}", 'warning',
+                          f"Data modified in {len(differing)} of {pushdown['total_ranges']} key range(s)")
+            if baseline_rows is None:
+                baseline_rows = self._baseline_rows_in_ranges(table, differing)
+            after_rows = self.current['tables'][table]
+            self._locate_row_changes(table, baseline_rows, after_rows, max(len(baseline_rows), len(after_rows)))
+
+    def _baseline_key_columns(self, table: str) -> List[str]:
+        """Primary key columns of a baseline table in key order, empty if it has none
+
+        Snapshots record no indexes; their key is taken from the current
+        catalog once it is loaded.
+        """
+        for index in self.baseline.get('indexes', {}).get(table, []):
+            if index['is_primary_key']:
+                return list(index['columns'])
+        if self.catalog is not None and table not in self.baseline.get('indexes', {}):
+            schema, table_name = table.split('.', 1)
+            return [column for column, _ in self.catalog.primary_key(schema, table_name)]
+        return []
+
+    @staticmethod
+    def _iter_stored_rows(snapshot, table: str) -> Iterator[Dict]:
+        """Stream the rows of a table of a baseline file; compact baselines are decoded a chunk at a time"""
+        tables = snapshot['tables']
+        if isinstance(tables, LazyTables):
+            for chunk in tables.iter_rows(table):
+                yield from chunk
+        else:
+            yield from tables.get(table, [])
+
+    def _iter_baseline_rows(self, table: str) -> Iterator[Dict]:
+        """Stream the rows of a baseline table"""
+        return self._iter_stored_rows(self.baseline, table)
+
+    def _iter_current_rows(self, table: str) -> Iterator[Dict]:
+        """Stream the current rows of a table
+
+        They come from the target baseline file when the current state was
+        loaded from one; otherwise from the database again, in keyset pages
+        where the table has a primary key.
+        """
+        if self.current_file:
+            yield from self._iter_stored_rows(self.current, table)
+            return
+        schema, table_name = table.split('.', 1)
+        conn = self.get_connection()
+        try:
+            for batch in self._iter_table_data(conn, schema, table_name):
+                yield from batch
+        finally:
+            conn.close()
+
+    def _locate_row_changes(self, table: str, before_rows: Iterable[Dict], after_rows: Iterable[Dict],
+                            row_count: int):
+        """Pinpoint added, removed and changed rows of a modified table
+
+        Rows are matched on the primary key with a hash join (see
+        row_diff.py). Both sides are consumed as streams: tables of more
+        than DEFAULT_MEMORY_ROWS rows (row_count, the larger side) are
+        partitioned on disk as they are read, so only one partition's keys
+        and digests are held in memory. Each difference is also written to
+        the --diff-file when one is open.
+        """
+        key_columns = self._baseline_key_columns(table)
+        if not key_columns:
+            return
+
+        partitions = partition_count(row_count)
+        diff = hash_join_diff(before_rows, after_rows, key_columns, self.diff_writer, table, partitions)
+        self._log_row_diff(table, diff)
+
+    def _write_row_diff(self, table: str, diff):
+        """Write the rows of a range bisection diff to the --diff-file"""
+        if not self.diff_writer:
+            return
+        key_column = diff.key_column
+        for row in diff.added:
+            self.diff_writer.write(table, 'added', {key_column: row[key_column]}, None, row)
+        for row in diff.removed:
+            self.diff_writer.write(table, 'removed', {key_column: row[key_column]}, row, None)
+        for before, after in diff.changed:
+            self.diff_writer.write(table, 'changed', {key_column: before[key_column]}, before, after)
+
+    def _log_row_diff(self, table: str, diff):
+        """Record and log the outcome of a row diff"""
+        summary = diff.summary()
+        self.row_diffs[table] = summary
+        if 'partitions' in summary:
+            detail = f"hash join in {summary['partitions']} partition(s), {summary['rows_read']} rows read"
+        elif 'seconds' in summary:
+            detail = f"merge join, {summary['rows_read']} rows read"
+        else:
+            detail = f"{summary['ranges_compared']} ranges compared, {summary['rows_fetched']} rows read"
+        logger.info(f"   Rows: {summary['added']} added, {summary['removed']} removed, "
+                    f"{summary['changed']} changed ({detail})")
+        for kind in ('added', 'removed', 'changed'):
+            keys = summary[f'{kind}_keys']
+            if keys:
+                more = f" (+{summary[kind] - len(keys)} more)" if summary[kind] > len(keys) else ""
+                logger.info(f"   {kind.capitalize()} {diff.key_column}: {', '.join(str(k) for k in keys)}{more}")
+
+    def diff_live(self, source: 'VerifierEngine', method: str = 'bisect') -> Dict:
+        """Locate differing rows between a live source database and this one
+
+        source is a verifier of the source environment, used for its
+        connection only. With method 'bisect', both databases compute range
+        hashes on the server and only ranges whose hashes disagree are split
+        further or read, so identical tables cost a handful of aggregate
+        queries regardless of their size. With 'merge', every row is read
+        from both databases at the same time and matched in key order (see
+        _diff_table_merge_join).
+        """
+        logger.info("\n" + "="*70)
+        logger.info(f"LIVE ROW DIFF - {source.env_name.upper()} VS {self.env_name.upper()}")
+        logger.info("="*70)
+
+        source_conn = source.get_connection()
+        target_conn = self.get_connection()
+        self._open_diff_file()
+
+        try:
+            source_tables = set(self._get_user_tables(source_conn))
+            target_tables = set(self._get_user_tables(target_conn))
+            source_catalog = self.dialect.load_catalog(source_conn)
+            target_catalog = self.dialect.load_catalog(target_conn)
+
+            for schema, table_name in sorted(source_tables | target_tables):
+                full_table = f"{schema}.{table_name}"
+                test_name = f"Row Diff - {full_table}"
+                logger.info(f" Processing {full_table}...")
+
+                if (schema, table_name) not in target_tables:
+                    self.log_test(test_name, 'failed', f"Table missing in {self.env_name}")
+                    continue
+                if (schema, table_name) not in source_tables:
+                    self.log_test(test_name, 'warning', f"Table not present in {source.env_name}")
+                    continue
+                if method == 'merge':
+                    self._diff_table_merge_join(source_conn, target_conn, schema, table_name,
+                                                source_catalog, target_catalog)
+                    continue
+
+                key_column = self.dialect.range_key(target_conn, schema, table_name, target_catalog)
+                source_key = self.dialect.range_key(source_conn, schema, table_name, source_catalog)
+                if not key_column or source_key != key_column:
+                    # No common integer key to bisect on; compare the whole table
+                    before = self._get_table_data(source_conn, schema, table_name, catalog=source_catalog)
+                    after = self._get_table_data(target_conn, schema, table_name, catalog=target_catalog)
+                    if self._calculate_checksum(before) == self._calculate_checksum(after):
+                        self.log_test(test_name, 'passed', "Data identical (whole table compared)")
+                    else:
+                        self.log_test(test_name, 'warning', "Data differs (no integer primary key to locate rows)")
+                    continue
+
+                diff = bisect_diff(
+                    DatabaseRangeSource(source_conn, self.dialect, schema, table_name, key_column,
+                                        partial(self._get_table_data, source_conn, schema, table_name,
+                                                catalog=source_catalog)),
+                    DatabaseRangeSource(target_conn, self.dialect, schema, table_name, key_column,
+                                        partial(self._get_table_data, target_conn, schema, table_name,
+                                                catalog=target_catalog))
+                )
+
+                if diff.is_empty:
+                    self.row_diffs[full_table] = diff.summary()
+                    self.log_test(test_name, 'passed',
+                                  f"Data identical ({diff.ranges_compared} range hash(es) compared)")
+                else:
+                    status = 'failed' if diff.removed else 'warning'
+                    self.log_test(test_name, status, f"{len(diff.added)} added, {len(diff.removed)} removed, "
+                                                     f"{len(diff.changed)} changed row(s)")
+                    self._log_row_diff(full_table, diff)
+                    self._write_row_diff(full_table, diff)
+
+        finally:
+            self._close_diff_file()
+            source_conn.close()
+            target_conn.close()
+
+        return self.test_results
+
+    def _merge_key_columns(self, schema: str, table_name: str, source_catalog, target_catalog) -> List[str]:
+        """Primary key columns to merge join a table on, or [] when the keys do not allow it
+
+        Both sides need the same primary key, made of integer columns only, so
+        that both servers return rows in the order Python compares keys in.
+        """
+        primary_key = target_catalog.primary_key(schema, table_name)
+        if not primary_key or source_catalog.primary_key(schema, table_name) != primary_key:
+            return []
+        if any(data_type.lower() not in self.dialect.integer_key_types for _, data_type in primary_key):
+            return []
+        return [column for column, _ in primary_key]
+
+    def _diff_table_merge_join(self, source_conn, target_conn, schema: str, table_name: str,
+                               source_catalog, target_catalog):
+        """Compare a table by reading it from both databases at once (see merge_join.py)
+
+        Keyset pages of both sides are fetched concurrently and matched in key
+        order as they arrive, so the table takes about as long as the slower
+        database and no rows are kept beyond the pages in flight.
+        """
+        full_table = f"{schema}.{table_name}"
+        test_name = f"Row Diff - {full_table}"
+        key_columns = self._merge_key_columns(schema, table_name, source_catalog, target_catalog)
+        if not key_columns:
+            # No common integer key to merge on; read both whole tables at once and compare them
+            before, after = read_concurrently(
+                partial(self._get_table_data, source_conn, schema, table_name, catalog=source_catalog),
+                partial(self._get_table_data, target_conn, schema, table_name, catalog=target_catalog))
+            if self._calculate_checksum(before) == self._calculate_checksum(after):
+                self.log_test(test_name, 'passed', "Data identical (whole table compared)")
+            else:
+                self.log_test(test_name, 'warning', "Data differs (no integer primary key to locate rows)")
+            return
+
+        diff = run_merge_join(
+            self._iter_table_data(source_conn, schema, table_name, catalog=source_catalog),
+            self._iter_table_data(target_conn, schema, table_name, catalog=target_catalog),
+            key_columns, self.diff_writer, full_table)
+
+        if diff.is_empty:
+            self.row_diffs[full_table] = diff.summary()
+            self.log_test(test_name, 'passed', f"Data identical ({diff.rows_read} rows merged)")
+        else:
+            status = 'failed' if diff.counts['removed'] else 'warning'
+            self.log_test(test_name, status, f"{diff.counts['added']} added, {diff.counts['removed']} removed, "
+                                             f"{diff.counts['changed']} changed row(s)")
+            self._log_row_diff(full_table, diff)
+        logger.info(f"   Read {diff.seconds['source']:.2f}s from source and {diff.seconds['target']:.2f}s "
+                    f"from target in {diff.seconds['elapsed']:.2f}s")
+
+    def _verify_schemas(self):
+        """Verify table schemas
+
+        Snapshots record column names only (type None); only the column
+        attributes the baseline recorded are compared.
+        """
+        logger.info("\n" + "─" * 70)
+        logger.info("SCHEMA VERIFICATION")
+        logger.info("─" * 70)
+
+        common_tables = set(self.baseline['schema_info'].keys()) & set(self.current['schema_info'].keys())
+
+        for table in sorted(common_tables):
+            before_schema = self.baseline['schema_info'][table]
+            after_schema = self.current['schema_info'][table]
+            after_columns = {column['name']: column for column in after_schema}
+
+            if len(before_schema) != len(after_schema):
+                self.log_test(f"Schema - {table}", 'warning',
+                              f"Column count: {len(before_schema)} → {len(after_schema)}")
+            elif {column['name'] for column in before_schema} != set(after_columns):
+                self.log_test(f"Schema - {table}", 'warning', "Column names differ")
+            elif any(after_columns[column['name']].get(key) != value
+                     for column in before_schema for key, value in column.items() if value is not None):
+                self.log_test(f"Schema - {table}", 'warning', "Schema modified")
+            else:
+                self.log_test(f"Schema - {table}", 'passed', "Schema unchanged")
+
+    def _verify_foreign_keys(self):
+        """Verify foreign keys"""
+        logger.info("\n" + "─" * 70)
+        logger.info("FOREIGN KEY VERIFICATION")
+        logger.info("─" * 70)
+
+        common_tables = set(self.baseline['foreign_keys'].keys()) & set(self.current['foreign_keys'].keys())
+
+        for table in sorted(common_tables):
+            before_fks = {fk['name']: fk for fk in self.baseline['foreign_keys'][table]}
+            after_fks = {fk['name']: fk for fk in self.current['foreign_keys'][table]}
+
+            added = set(after_fks.keys()) - set(before_fks.keys())
+            removed = set(before_fks.keys()) - set(after_fks.keys())
+
+            if removed:
+                self.log_test(f"Foreign Keys - {table}", 'warning',
+                              f"{len(removed)} FK(s) removed")
+            elif added:
+                self.log_test(f"Foreign Keys - {table}", 'warning',
+                              f"{len(added)} FK(s) added")
+            elif len(before_fks) > 0:
+                self.log_test(f"Foreign Keys - {table}", 'passed',
+                              f"{len(before_fks)} FK(s) unchanged")
+
+    def _verify_indexes(self):
+        """Verify indexes"""
+        logger.info("\n" + "─" * 70)
+        logger.info("INDEX VERIFICATION")
+        logger.info("─" * 70)
+
+        common_tables = set(self.baseline['indexes'].keys()) & set(self.current['indexes'].keys())
+
+        for table in sorted(common_tables):
+            before_idx = {idx['name']: idx for idx in self.baseline['indexes'][table]}
+            after_idx = {idx['name']: idx for idx in self.current['indexes'][table]}
+
+            added = set(after_idx.keys()) - set(before_idx.keys())
+            removed = set(before_idx.keys()) - set(after_idx.keys())
+
+            if removed:
+                self.log_test(f"Indexes - {table}", 'warning', f"{len(removed)} index(es) removed")
+            elif added:
+                self.log_test(f"Indexes - {table}", 'warning', f"{len(added)} index(es) added")
+            elif len(before_idx) > 0:
+                self.log_test(f"Indexes - {table}", 'passed', f"{len(before_idx)} index(es) unchanged")
+
+    def _verify_referential_integrity(self):
+        """Check every foreign key in the catalog for orphaned rows (see referential_integrity.py)"""
+        logger.info("\n" + "─" * 70)
+        logger.info("REFERENTIAL INTEGRITY VERIFICATION")
+        logger.info("─" * 70)
+
+        if self.current_file:
+            # Orphans are counted by the server; a baseline file is not a database
+            logger.info(f"   Skipped: current state read from {self.current_file}")
+            return
+
+        catalog = self.catalog
+        if catalog is None:
+            conn = self.get_connection()
+            try:
+                catalog = self.dialect.load_catalog(conn)
+            finally:
+                conn.close()
+
+        checks = foreign_key_checks(catalog)
+        if not checks:
+            self.log_test("Referential Integrity", 'warning', "No foreign keys declared")
+            return
+
+        checker = ReferentialIntegrityChecker(
+            self.dialect, self.get_connection, workers=self.integrity_workers, mode=self.integrity_mode,
+            estimates=self.row_counter.estimates if self.row_counter else None,
+            large_table_mode=self.large_table_mode, large_table_rows=self.large_table_rows)
+
+        for result in checker.run(checks):
+            test_name = f"Referential Integrity - {result.check.label}"
+            if result.is_clean:
+                self.log_test(test_name, 'passed', result.describe())
+            else:
+                self.log_test(test_name, 'failed',
+                              f"{result.describe()} - no matching {result.check.referenced_label}")
+
+        logger.info(f"   {len(checks)} foreign key(s) checked in {checker.seconds:.2f}s "
+                    f"({checker.mode}, {checker.workers if checker.mode == 'parallel' else 1} connection(s))")
+
+    def generate_report(self):
+        """Generate final verification report"""
+        logger.info("\n" + "="*70)
+        logger.info("MIGRATION VERIFICATION REPORT")
+        logger.info("="*70)
+
+        # Database information
+        logger.info("\nDatabase Information:")
+        logger.info(f"  Server:         {self.db_info['server']}")
+        logger.info(f"  Database:       {self.db_info['database']}")
+        logger.info(f"  Driver:         {self.db_info['driver']}")
+        logger.info(f"  Authentication: {self.db_info['auth_type']}")
+
+        # Check if baseline has database_info (for new baselines)
+        if self.baseline and 'database_info' in self.baseline:
+            logger.info("\nBaseline Database Information:")
+            logger.info(f"  Server:         {self.baseline['database_info']['server']}")
+            logger.info(f"  Database:       {self.baseline['database_info']['database']}")
+
+        total = self.test_results['passed'] + self.test_results['failed'] + self.test_results['warnings']
+
+        if self.baseline:
+            logger.info(f"\nBaseline:     {self.baseline['timestamp']}")
+            logger.info(f"Verified:     {self.current['timestamp']}")
+        if self._sample_summary():
+            logger.info(f"Sample:       {self._sample_summary()}")
+        logger.info(f"\nTotal Tests:  {total}")
+        logger.info(f" Passed:     {self.test_results['passed']}")
+        logger.info(f" Warnings:   {self.test_results['warnings']}")
+        logger.info(f" Failed:     {self.test_results['failed']}")
+
+        if self.test_results['failed'] > 0:
+            logger.info("\n" + "─" * 70)
+            logger.info("CRITICAL FAILURES:")
+            logger.info("─" * 70)
+            for error in self.test_results['errors']:
+                logger.error(f"   {error}")
+
+        logger.info("="*70)
+
+        if total > 0:
+            success_rate = ((self.test_results['passed'] + self.test_results['warnings']) / total) * 100
+            logger.info(f"\n Success Rate: {success_rate:.1f}%")
+
+        return self.test_results
+
+
+def find_baseline(env_name: str) -> Optional[str]:
+    """Most recent baseline file of an environment in the current directory, else of any environment"""
+    for prefix in (f'baseline_{env_name}_', 'baseline_'):
+        baseline_files = [f for f in os.listdir('.')
+                          if f.startswith(prefix) and f.endswith(tuple(FORMAT_EXTENSIONS.values()))]
+        if baseline_files:
+            return sorted(baseline_files)[-1]
+    return None
+
+
+def verify_main(make_verifier: Callable[..., VerifierEngine], description: str = 'Verify database migration integrity',
+                default_baseline: Optional[str] = None, epilog: Optional[str] = None):
+    """Command line entry point of verify_migration.py
+
+    make_verifier builds the application's engine from an environment
+    config, the environment name and VerifierEngine keyword options.
+    Without --baseline, default_baseline is used, or else the most recent
+    baseline file in the current directory.
+    """
+    parser = argparse.ArgumentParser(description=description, epilog=epilog,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--env', type=str, default='target',
+                        choices=['source', 'target', 'local'],
+                        help='Environment to verify (default: target)')
+    parser.add_argument('--config', type=str, default='../../db_config.json',
+                        help='Path to config file (default: ../../db_config.json)')
+    parser.add_argument('--baseline', type=str, default=default_baseline,
+                        help=f'Baseline or snapshot file (default: {default_baseline or "auto-detect most recent"})')
+    parser.add_argument('--source-baseline', type=str, default=None,
+                        help='Source baseline file for comparison')
+    parser.add_argument('--target-baseline', type=str, default=None,
+                        help='Target baseline file for comparison')
+    parser.add_argument('--pushdown', action='store_true',
+                        help='Compare server-side range hashes and fetch only differing ranges '
+                             '(baseline must be created with --pushdown)')
+    parser.add_argument('--row-count', type=str, default=None, choices=list(ROW_COUNT_MODES),
+                        help='Row counts from COUNT(*), from catalog statistics, or hybrid: statistics first and '
+                             'COUNT(*) only where they differ from the baseline statistics '
+                             '(default: exact, or stats with --sample)')
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE,
+                        help='Read tables with a primary key in keyset pages of this many rows, '
+                             f'0 for a single SELECT per table (default: {DEFAULT_PAGE_SIZE})')
+    parser.add_argument('--rehash', action='store_true',
+                        help='Recompute the checksums stored in the baseline from its rows and report any '
+                             'mismatch (stored checksums are trusted otherwise)')
+    parser.add_argument('--fk-mode', type=str, default='parallel', choices=list(INTEGRITY_MODES),
+                        help='Run the foreign key orphan checks concurrently on --fk-workers connections, '
+                             'or as one UNION ALL statement (default: parallel)')
+    parser.add_argument('--fk-workers', type=int, default=DEFAULT_INTEGRITY_WORKERS,
+                        help=f'Connections for the foreign key orphan checks (default: {DEFAULT_INTEGRITY_WORKERS})')
+    parser.add_argument('--fk-large-tables', type=str, default='full', choices=list(LARGE_TABLE_MODES),
+                        help='Orphan check for child tables over --fk-large-rows rows: full count, '
+                             'TABLESAMPLE estimate, or an existence probe that stops at the first orphan '
+                             '(default: full)')
+    parser.add_argument('--fk-large-rows', type=int, default=DEFAULT_LARGE_TABLE_ROWS,
+                        help='Row count (catalog statistics) above which a child table is large '
+                             f'(default: {DEFAULT_LARGE_TABLE_ROWS})')
+    parser.add_argument('--sample', type=float, default=None, metavar='PERCENT',
+                        help='Smoke check: compare only about PERCENT of the rows of each table, picked by a hash of '
+                             'the primary key so the same rows are read from the baseline (TABLESAMPLE for tables '
+                             'without an integer key)')
+    parser.add_argument('--corruption-rate', type=float, default=DEFAULT_CORRUPTION_RATE,
+                        help='Fraction of corrupted rows the --sample detection confidence is reported for '
+                             f'(default: {DEFAULT_CORRUPTION_RATE})')
+    parser.add_argument('--diff-env', type=str, default=None,
+                        choices=['source', 'target', 'local'],
+                        help='Locate differing rows between this live environment and --env '
+                             '(see --diff-method; no baseline needed)')
+    parser.add_argument('--diff-method', type=str, default='bisect', choices=['bisect', 'merge'],
+                        help='With --diff-env: bisect on server-side range hashes, or merge to read both databases '
+                             'at the same time in key order and compare every row as it arrives (default: bisect)')
+    parser.add_argument('--diff-file', type=str, default=None,
+                        help='Write added, removed and changed rows with their per-column differences '
+                             'to this file (.csv for CSV, otherwise JSON lines)')
+
+    args = parser.parse_args()
+    if args.sample is not None and not 0 < args.sample <= 100:
+        parser.error("--sample must be a percentage above 0 and at most 100")
+    if args.row_count is None:
+        # A --sample smoke run should not COUNT(*) every table; --row-count exact still forces it
+        args.row_count = 'stats' if args.sample is not None else 'exact'
+    if args.diff_method == 'merge' and not args.page_size:
+        parser.error("--diff-method merge reads tables in keyset pages; --page-size must be above 0")
+
+    print("""
+══════════════════════════════════════════════════════════════════════
+          Database Migration Verifier
+          Compare baseline with current database state
+══════════════════════════════════════════════════════════════════════
+    """)
+
+    # Live row diff between two databases, no baseline involved
+    if args.diff_env:
+        print("="*70)
+        print(f"MODE: Live Row Diff ({args.diff_env.upper()} vs {args.env.upper()})")
+        print("="*70 + "\n")
+
+        try:
+            verifier = make_verifier(load_config(args.config, args.env), args.env, page_size=args.page_size,
+                                     diff_file=args.diff_file)
+            source = make_verifier(load_config(args.config, args.diff_env), args.diff_env)
+        except Exception as e:
+            print(f"\n✗ Error loading configuration: {e}")
+            sys.exit(1)
+
+        try:
+            results = verifier.diff_live(source, args.diff_method)
+        except Exception as e:
+            logger.error(f"\n✗ Row diff failed: {e}")
+            import traceback
+            traceback.print_exc()
+            sys.exit(1)
+
+        print("\n" + "="*70)
+        print(f"Tables identical: {results['passed']}")
+        print(f"Tables differing: {results['warnings'] + results['failed']}")
+        print("="*70)
+        sys.exit(0 if results['failed'] == 0 else 1)
+
+    options = dict(rehash=args.rehash, diff_file=args.diff_file, integrity_mode=args.fk_mode,
+                   integrity_workers=args.fk_workers, large_table_mode=args.fk_large_tables,
+                   large_table_rows=args.fk_large_rows)
+
+    # If both source and target baselines provided, compare them instead
+    if args.source_baseline and args.target_baseline:
+        print("="*70)
+        print("MODE: Comparing Source and Target Baselines")
+        print("="*70)
+        print(f"Source: {args.source_baseline}")
+        print(f"Target: {args.target_baseline}")
+        print("="*70 + "\n")
+
+        # This is a baseline-to-baseline comparison; no database connection is opened
+        try:
+            verifier = make_verifier(load_config(args.config, args.env), args.env,
+                                     baseline_file=args.source_baseline, **options)
+        except Exception as e:
+            print(f"\n✗ Error loading configuration: {e}")
+            sys.exit(1)
+
+        if not verifier.load_baseline():
+            print(f"\n✗ Failed to load source baseline: {args.source_baseline}")
+            sys.exit(1)
+        verifier.refresh_legacy_checksums(verifier.baseline, "baseline")
+
+        # Load target baseline as "current"
+        try:
+            verifier.load_current_baseline(args.target_baseline)
+        except Exception as e:
+            print(f"\n✗ Failed to load target baseline: {e}")
+            sys.exit(1)
+    else:
+        # Normal mode: compare baseline with current database
+        # Load configuration
+        try:
+            env_config = load_config(args.config, args.env)
+            verifier = make_verifier(env_config, args.env, pushdown=args.pushdown, row_count_mode=args.row_count,
+                                     page_size=args.page_size, sample_percent=args.sample,
+                                     corruption_rate=args.corruption_rate, **options)
+        except Exception as e:
+            print(f"\n✗ Error loading configuration: {e}")
+            sys.exit(1)
+
+        # Print environment info
+        print("="*70)
+        print(f"Environment: {args.env.upper()}")
+        print(f"Database: {env_config['database']}")
+        print(f"Server: {verifier.db_info['server']}")
+        print("="*70)
+
+        # Get baseline file
+        baseline_file = args.baseline
+        if not baseline_file:
+            baseline_file = find_baseline(args.env)
+            if not baseline_file:
+                print(f"\n✗ No baseline files found in current directory")
+                print(f"\n  Please create a baseline first:")
+                print(f"    python create_baseline.py --env {args.env}")
+                sys.exit(1)
+            if baseline_file.startswith(f'baseline_{args.env}_'):
+                print(f"Auto-detected baseline: {baseline_file}")
+            else:
+                print(f"⚠ No {args.env}-specific baseline found, using: {baseline_file}")
+
+        if not os.path.exists(baseline_file):
+            print(f"\n✗ Baseline file not found: {baseline_file}")
+            print(f"\n  Please create a baseline first:")
+            print(f"    python create_baseline.py --env {args.env}")
+            sys.exit(1)
+
+        print(f"Using baseline: {baseline_file}")
+        print("="*70 + "\n")
+        verifier.baseline_file = baseline_file
+
+        # Load baseline
+        if not verifier.load_baseline():
+            print("\n✗ Failed to load baseline file")
+            sys.exit(1)
+
+        # Capture current state
+        print("\n" + "="*70)
+        print("Capturing current database state for comparison...")
+        print("="*70)
+
+        try:
+            verifier.capture_current_state()
+        except Exception as e:
+            logger.error(f"\n✗ Failed to capture current state: {e}")
+            import traceback
+            traceback.print_exc()
+            sys.exit(1)
+
+    # Compare and verify
+    print("\n" + "="*70)
+    print("Comparing baseline with current state...")
+    print("="*70 + "\n")
+
+    try:
+        verifier.compare_and_verify()
+
+        # Generate report
+        results = verifier.generate_report()
+
+        # Final result
+        if results['failed'] == 0:
+            print("\n" + "="*70)
+            print("✓ MIGRATION VERIFICATION PASSED")
+            print("="*70)
+            print(f"Environment: {args.env.upper()}")
+            print("No critical issues found. Migration integrity verified!")
+            if results['warnings'] > 0:
+                print(f"⚠ Note: {results['warnings']} warnings detected (see log for details)")
+            print("="*70)
+            sys.exit(0)
+        else:
+            print("\n" + "="*70)
+            print("✗ MIGRATION VERIFICATION FAILED")
+            print("="*70)
+            print(f"Environment: {args.env.upper()}")
+            print(f"Found {results['failed']} critical issue(s).")
+            print("Check the log file for detailed information.")
+            print("="*70)
+            sys.exit(1)
+
+    except Exception as e:
+        logger.error(f"\n✗ Verification failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)